@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the AutoGen .cs file extractors.
+
+Times the per-file parse of every .cs file in an Eco server tree twice: as shipped
+(precompiled patterns with substring prefilters) and with the extractors as they
+were before, kept in baseline_extractors.py. Those pass pattern strings to the re
+module, which looks each one up in its compile cache, and have no prefilters. The
+shipped extractors also read item tags, which the baseline did not. File reading
+is excluded, only the extractors are timed.
+
+Usage: python benchmarks/bench_extractors.py [MODS_CORE_PATH] [--repeat N]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import baseline_extractors  # noqa: E402
+from eco_data_reader.config import Config  # noqa: E402
+from eco_data_reader.services import EcoServerFileService  # noqa: E402
+
+
+def load_files(eco_server_path):
+    service = EcoServerFileService(eco_server_path)
+    files = []
+    for folder, file_path in service._get_cs_files(service.SCAN_FOLDERS):
+        contents = service._read_cs_file(file_path)
+        if contents is not None:
+            files.append((folder, contents, file_path.name))
+    return files
+
+
+def time_parse(parse, files, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for folder, contents, file_name in files:
+            parse(folder, contents, file_name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AutoGen .cs extractors.")
+    parser.add_argument('path', nargs='?', help="Eco server Mods/__core__ folder (default: ECO_SERVER_PATH)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per variant, the fastest is reported")
+    args = parser.parse_args(argv)
+
+    eco_server_path = args.path or Config().eco_server_path
+    # The extractors warn about every incomplete recipe, which would dominate the timings
+    logging.disable(logging.WARNING)
+
+    files = load_files(eco_server_path)
+    if not files:
+        print(f"No .cs files found under {eco_server_path}")
+        return 1
+
+    before = time_parse(baseline_extractors.parse_cs_file_contents, files, args.repeat)
+    after = time_parse(EcoServerFileService._parse_cs_file_contents, files, args.repeat)
+
+    print(f"Files parsed:  {len(files)}")
+    print(f"Before:        {before * 1000:9.1f} ms  ({before / len(files) * 1e6:8.1f} us/file)")
+    print(f"After:         {after * 1000:9.1f} ms  ({after / len(files) * 1e6:8.1f} us/file)")
+    print(f"Speedup:       {before / after:9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the parsed models.
+
+Scans an Eco server tree and measures, with tracemalloc, how much memory the
+resulting dataset keeps alive. The same dataset is also copied into dict-backed
+dataclasses shaped like the previous models (a per-instance equivalence list on
+every Item, a separate string object for every name ID) to show the difference
+made by the slotted models and interned name IDs. Every measurement runs in a new
+process after a warm-up parse of a small generated tree, and the median of the
+runs is reported.
+
+Usage: python benchmarks/bench_memory.py [MODS_CORE_PATH] [--generate N] [--runs N]
+"""
+
+import argparse
+import gc
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_corpus import CorpusGenerator
+from eco_data_reader.models import EQUIVALENT_ITEM_NAME_IDS
+from eco_data_reader.services import EcoServerFileService
+
+
+@dataclass
+class LegacyItem:
+    name: str
+    item_name_id: str
+    tag: bool = False
+    image_file: str = "UI_Icons_06.png"
+    x_pos: int = 0
+    y_pos: int = 0
+    EQUIVALENT_ITEM_NAME_IDS: List[Tuple[str, str]] = field(
+        default_factory=lambda: list(EQUIVALENT_ITEM_NAME_IDS), repr=False, compare=False, hash=False)
+
+
+@dataclass
+class LegacyIngredient:
+    item_name_id: str
+    quantity: Decimal
+    reducible: bool = False
+    tag: bool = False
+
+
+@dataclass
+class LegacyOutput:
+    item_name_id: str
+    quantity: Decimal
+    reducible: bool = False
+    primary: bool = False
+
+
+@dataclass
+class LegacyRecipe:
+    name: str
+    name_id: str
+    skill_name_id: str
+    level: int
+    labor: int
+    crafting_table_name_id: str
+    ingredients: List[LegacyIngredient] = field(default_factory=list)
+    outputs: List[LegacyOutput] = field(default_factory=list)
+    hidden: bool = False
+
+
+def copy_string(value):
+    # A new string object with the same value, like every regex match used to produce
+    return (value + ".")[:-1] if value else value
+
+
+def to_legacy(dataset):
+    items = [LegacyItem(copy_string(item.name), copy_string(item.item_name_id), item.tag)
+             for item in dataset.items]
+    recipes = [
+        LegacyRecipe(
+            copy_string(recipe.name), copy_string(recipe.name_id), copy_string(recipe.skill_name_id),
+            recipe.level, recipe.labor, copy_string(recipe.crafting_table_name_id),
+            [LegacyIngredient(copy_string(i.item_name_id), Decimal(str(i.quantity)), i.reducible, i.tag)
+             for i in recipe.ingredients],
+            [LegacyOutput(copy_string(o.item_name_id), Decimal(str(o.quantity)), o.reducible, o.primary)
+             for o in recipe.outputs],
+            recipe.hidden)
+        for recipe in dataset.recipes
+    ]
+    return items, recipes
+
+
+SHAPES = ("previous", "shipped")
+# Files of the tree every measuring process parses first, untraced
+WARM_UP_FILES = 50
+
+
+def build(shape, eco_server_path):
+    """Parse the server and return its models in the given shape."""
+    dataset = EcoServerFileService(eco_server_path).scan_all()
+    return to_legacy(dataset) if shape == "previous" else dataset
+
+
+def measure(shape, eco_server_path, warm_up_path):
+    """Return the bytes the models of shape still hold once they are built.
+
+    A warm-up run on a small tree comes first, so one-time allocations (lazy imports,
+    the re and Decimal caches and the like) are not counted as part of the models.
+    """
+    build(shape, warm_up_path)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    models = build(shape, eco_server_path)  # noqa: F841, kept alive until measured
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return retained
+
+
+def measure_in_new_process(shape, eco_server_path, warm_up_path):
+    # A fresh interpreter for every run, so neither shape sees memory freed by the other
+    output = subprocess.run([sys.executable, __file__, eco_server_path, '--measure', shape,
+                             '--warm-up', warm_up_path], check=True, capture_output=True, text=True).stdout
+    return int(output)
+
+
+def run(eco_server_path, warm_up_path, runs):
+    dataset = EcoServerFileService(eco_server_path).scan_all()
+    ingredient_count = sum(len(recipe.ingredients) + len(recipe.outputs) for recipe in dataset.recipes)
+    print(f"{len(dataset.items)} items, {len(dataset.recipes)} recipes, "
+          f"{ingredient_count} ingredients and outputs")
+
+    retained = {shape: statistics.median(measure_in_new_process(shape, eco_server_path, warm_up_path)
+                                         for _ in range(runs))
+                for shape in SHAPES}
+    print(f"{'models':<10} {'retained MB':>12} {'bytes/recipe':>13}   (median of {runs} runs)")
+    for shape in SHAPES:
+        per_recipe = retained[shape] / len(dataset.recipes) if dataset.recipes else 0
+        print(f"{shape:<10} {retained[shape] / (1024 * 1024):>12.2f} {per_recipe:>13.0f}")
+    if retained["previous"]:
+        print(f"Saved {100 * (1 - retained['shipped'] / retained['previous']):.0f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory held by the parsed models.")
+    parser.add_argument('path', nargs='?', help="Eco server Mods/__core__ folder to load")
+    parser.add_argument('--generate', type=int, metavar='N',
+                        help="generate a synthetic corpus of N files instead of using PATH")
+    parser.add_argument('--seed', type=int, default=0, help="seed for --generate")
+    parser.add_argument('--runs', type=int, default=3, help="measuring processes per shape, the median is reported")
+    parser.add_argument('--measure', choices=SHAPES, help=argparse.SUPPRESS)
+    parser.add_argument('--warm-up', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not args.path and not args.generate:
+        parser.error("either PATH or --generate N is required")
+
+    logging.disable(logging.WARNING)
+
+    if args.measure:
+        print(measure(args.measure, args.path, args.warm_up))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="eco-benchmark-") as temp_dir:
+        eco_server_path = args.path
+        if args.generate:
+            eco_server_path = str(Path(temp_dir) / "__core__")
+            start = time.perf_counter()
+            CorpusGenerator(args.seed).generate(Path(eco_server_path), args.generate)
+            print(f"Generated {args.generate} files in {time.perf_counter() - start:.2f}s")
+        warm_up_path = Path(temp_dir) / "warm-up"
+        CorpusGenerator(args.seed + 1).generate(warm_up_path, WARM_UP_FILES)
+
+        run(eco_server_path, str(warm_up_path), args.runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Synthetic Eco server corpus generator.
+
+Writes a fake Mods/__core__ tree (AutoGen/<folder>/*.cs plus Systems/TagDefinitions.cs)
+shaped like the files Strange Loop Games generates, so the parser can be measured
+without a licensed Eco server install: items with [Tag] attributes and recipes,
+tag and item ingredients, primary outputs with tailings/slag/barrel byproducts,
+RequiresSkill, CreateLaborInCaloriesValue, CraftingComponent.AddRecipe, crafting
+table WorldObjects and Tech skill files.
+
+Usage: python benchmarks/generate_corpus.py OUTPUT_PATH [--files N] [--seed S]
+"""
+
+import argparse
+import random
+import re
+import sys
+from pathlib import Path
+
+# Share of the generated files per AutoGen folder, roughly as in a vanilla server
+FOLDER_WEIGHTS = {
+    "Item": 30, "Block": 14, "Food": 10, "WorldObject": 10, "Recipe": 9, "Tool": 5,
+    "Clothing": 5, "Tech": 4, "Seed": 3, "Fertilizer": 2, "Vehicle": 2, "PluginModule": 2,
+}
+
+TAGS = ["Wood", "Hewn Log", "Rock", "Crushed Rock", "Metal", "Fabric", "Fat", "Oil", "Fuel",
+        "Burnable Fuel", "Vegetable", "Fruit", "Raw Meat", "Grain", "Silica", "Clay", "Currency"]
+
+BYPRODUCTS = ["TailingsItem", "SlagItem", "BarrelItem", "WetTailingsItem", "GarbageItem"]
+
+SYLLABLES = ["Ash", "Bar", "Cor", "Dun", "El", "Fen", "Gar", "Hol", "Iro", "Jas", "Kel", "Lum",
+             "Mor", "Nor", "Oak", "Pel", "Quar", "Ros", "Sil", "Tor", "Umb", "Vel", "Wex", "Yar"]
+
+HEADER = """// Copyright (c) Strange Loop Games. All rights reserved.
+// See LICENSE file in the project root for full license information.
+// <auto-generated from {template}.tt />
+
+namespace Eco.Mods.TechTree
+{{
+    using System;
+    using System.Collections.Generic;
+    using System.ComponentModel;
+    using Eco.Core.Items;
+    using Eco.Gameplay.Components;
+    using Eco.Gameplay.Items;
+    using Eco.Gameplay.Skills;
+    using Eco.Shared.Localization;
+    using Eco.Shared.Serialization;
+"""
+
+RECIPE_TEMPLATE = """
+    /// <summary>
+    /// <para>Server side recipe definition for "{name_id}".</para>
+    /// <para>More information about RecipeFamily objects can be found at https://docs.play.eco/api/server/eco.gameplay/Eco.Gameplay.Items.RecipeFamily.html</para>
+    /// </summary>
+    [RequiresSkill(typeof({skill}), {level})]
+    [Ecopedia("Items", "Products", subPageName: "{display_name} Item")]
+    public partial class {name_id}Recipe : RecipeFamily
+    {{
+        public {name_id}Recipe()
+        {{
+            var recipe = new Recipe();
+            recipe.Init(
+                name: "{name_id}",  //noloc
+                displayName: Localizer.DoStr("{display_name}"),
+
+                // Defines the ingredients needed to craft this recipe. An ingredient items takes the following inputs
+                // type of the item, the amount of the item, the skill required, and the talent used.
+                ingredients: new List<IngredientElement>
+                {{
+{ingredients}
+                }},
+
+                // Define our recipe output items.
+                // For every output item there needs to be one CraftingElement entry with the type of the final item and the amount
+                // to create.
+                items: new List<CraftingElement>
+                {{
+{outputs}
+                }});
+            this.Recipes = new List<Recipe> {{ recipe }};
+            this.ExperienceOnCraft = 1;
+
+            // Defines the amount of labor required and the required skill to add labor
+            this.LaborInCalories = CreateLaborInCaloriesValue({labor}, typeof({skill}));
+
+            // Defines our crafting time for the recipe
+            this.CraftMinutes = CreateCraftTimeValue(beneficiary: typeof({name_id}Recipe), start: 1.5f, skillType: typeof({skill}));
+
+            // Perform pre/post initialization for user mods and initialize our recipe instance with the display name "{display_name}"
+            this.ModsPreInitialize();
+            this.Initialize(displayText: Localizer.DoStr("{display_name}"), recipeType: typeof({name_id}Recipe));
+            this.ModsPostInitialize();
+
+            // Register our RecipeFamily instance with the crafting system so it can be crafted.
+            CraftingComponent.AddRecipe(tableType: typeof({table}), recipe: this);
+        }}
+
+        /// <summary>Hook for mods to customize RecipeFamily before initialization. You can change recipes, xp, labor, time here.</summary>
+        partial void ModsPreInitialize();
+
+        /// <summary>Hook for mods to customize RecipeFamily after initialization, but before registration. You can change skill requirements here.</summary>
+        partial void ModsPostInitialize();
+    }}
+"""
+
+ITEM_TEMPLATE = """
+    /// <summary>
+    /// <para>Server side item definition for the "{display_name}" item.</para>
+    /// </summary>
+    [Serialized] // Tells the save/load system this object needs to be serialized.
+    [LocDisplayName("{display_name}")] // Defines the localized name of the item.
+    [Weight({weight})] // Defines how heavy {name_id} is.
+    [Ecopedia("Items", "Products", createAsSubPage: true)]
+{tags}    [LocDescription("A synthetic item generated for benchmarking the Eco Data Reader.")] //The tooltip description for the item.
+    public partial class {name_id}Item : {base_class}
+    {{
+
+    }}
+"""
+
+WORLD_OBJECT_TEMPLATE = """
+    [Serialized]
+    [RequireComponent(typeof(OnOffComponent))]
+    [RequireComponent(typeof(PropertyAuthComponent))]
+{crafting_component}    [RequireComponent(typeof(MinimapComponent))]
+    [Tag("Usable")]
+    [Ecopedia("Work Stations", "Craft Tables", subPageName: "{display_name} Item")]
+{plugin_modules}    public partial class {name_id}Object : WorldObject, IRepresentsItem
+    {{
+        public virtual Type RepresentedItemType => typeof({name_id}Item);
+        public override LocString DisplayName => Localizer.DoStr("{display_name}");
+        public override TableTextureMode TableTexture => TableTextureMode.Wood;
+
+        protected override void Initialize()
+        {{
+            this.ModsPreInitialize();
+            this.GetComponent<MinimapComponent>().SetCategory(Localizer.DoStr("Crafting"));
+            this.ModsPostInitialize();
+        }}
+
+        /// <summary>Hook for mods to customize WorldObject before initialization. You can change housing values here.</summary>
+        partial void ModsPreInitialize();
+        /// <summary>Hook for mods to customize WorldObject after initialization. You can change housing values here.</summary>
+        partial void ModsPostInitialize();
+    }}
+"""
+
+SKILL_TEMPLATE = """
+    /// <summary>
+    /// <para>Server side skill definition for "{display_name}".</para>
+    /// </summary>
+    [Serialized] // Tells the save/load system this object needs to be serialized.
+    [LocDisplayName("{display_name}")] // Defines the localized name of the skill.
+    [Ecopedia("Professions", "{profession}", createAsSubPage: true)]
+    [RequiresSkill(typeof({profession}Skill), 0), Tag("{skill_tag}")]
+    public partial class {name_id}Skill : Skill
+    {{
+        public override void OnLevelUp(User user)
+        {{
+            user.Skillset.AddExperience(typeof(SelfImprovementSkill), 5, Localizer.DoStr("for leveling up another specialization."));
+        }}
+
+        public override int MaxLevel {{ get {{ return 7; }} }}
+        public override int Tier {{ get {{ return 2; }} }}
+    }}
+"""
+
+FOOTER = "}\n"
+
+
+class CorpusGenerator:
+    def __init__(self, seed: int = 0):
+        self.random = random.Random(seed)
+        self.item_ids = []
+        self.skill_ids = ["SelfImprovementSkill"]
+        self.table_ids = ["WorkbenchObject"]
+
+    def unique_name(self, index: int) -> str:
+        first = SYLLABLES[index % len(SYLLABLES)]
+        second = SYLLABLES[(index // len(SYLLABLES)) % len(SYLLABLES)].lower()
+        return f"{first}{second}{index}"
+
+    def generate(self, root: Path, file_count: int):
+        folders = list(FOLDER_WEIGHTS)
+        weights = list(FOLDER_WEIGHTS.values())
+        assignments = sorted(self.random.choices(folders, weights, k=file_count),
+                             key=lambda folder: folder != "Tech")
+
+        # Skills first so recipes can require them
+        for index, folder in enumerate(assignments):
+            folder_path = root / "AutoGen" / folder
+            folder_path.mkdir(parents=True, exist_ok=True)
+            name_id = self.unique_name(index)
+            if folder == "Tech":
+                contents = self.skill_file(name_id)
+            elif folder == "WorldObject":
+                contents = self.world_object_file(name_id)
+            elif folder == "Recipe":
+                # Alternative recipes for items defined elsewhere
+                product_id = self.random.choice(self.item_ids) if self.item_ids else None
+                contents = HEADER.format(template="RecipeTemplate") + self.recipe(name_id, product_id) + FOOTER
+            else:
+                contents = self.item_file(name_id, folder)
+            (folder_path / f"{name_id}.cs").write_text(contents, encoding="utf-8")
+
+        self.write_tag_definitions(root)
+
+    @staticmethod
+    def display_name(name_id: str) -> str:
+        # Ashbar12 -> Ashbar 12
+        return re.sub(r'(\d+)$', r' \1', name_id)
+
+    def recipe(self, name_id: str, product_id: str = None) -> str:
+        rand = self.random
+        skill = rand.choice(self.skill_ids)
+        ingredients = []
+        for _ in range(rand.randint(1, 4)):
+            if self.item_ids and rand.random() < 0.75:
+                ingredient = rand.choice(self.item_ids)
+                quantity = rand.choice(["1", "2", "4", "10", "0.5f"])
+                if rand.random() < 0.7:
+                    ingredients.append(f"new IngredientElement(typeof({ingredient}), {quantity}, "
+                                       f"typeof({skill}), typeof({skill[:-5]}LavishResourcesTalent)),")
+                else:
+                    ingredients.append(f"new IngredientElement(typeof({ingredient}), {quantity}, true),")
+            else:
+                tag = rand.choice(TAGS)
+                ingredients.append(f"new IngredientElement(\"{tag}\", {rand.randint(1, 20)}, typeof({skill}), "
+                                   f"typeof({skill[:-5]}LavishResourcesTalent)),")
+
+        outputs = [f"new CraftingElement<{product_id or name_id + 'Item'}>({rand.choice(['', '1', '2', '4'])}),"]
+        if rand.random() < 0.25:
+            byproduct = rand.choice(BYPRODUCTS)
+            talent = f", typeof({skill[:-5]}LavishResourcesTalent)" if rand.random() < 0.5 else ""
+            outputs.append(f"new CraftingElement<{byproduct}>(typeof({skill}), {rand.randint(1, 5)}{talent}),")
+
+        return RECIPE_TEMPLATE.format(
+            name_id=name_id,
+            display_name=self.display_name(name_id),
+            skill=skill,
+            level=rand.randint(0, 7),
+            labor=rand.choice([15, 25, 30, 60, 90, 120, 180, 240, 360, 600]),
+            table=rand.choice(self.table_ids),
+            ingredients="\n".join(" " * 20 + line for line in ingredients),
+            outputs="\n".join(" " * 20 + line for line in outputs),
+        )
+
+    def item(self, name_id: str, base_class: str = "Item") -> str:
+        tags = "".join(f"    [Tag(\"{tag}\")]\n" for tag in self.random.sample(TAGS, self.random.randint(0, 2)))
+        return ITEM_TEMPLATE.format(
+            name_id=name_id,
+            display_name=self.display_name(name_id),
+            weight=self.random.randint(1, 50) * 100,
+            tags=tags,
+            base_class=base_class,
+        )
+
+    def item_file(self, name_id: str, folder: str) -> str:
+        contents = HEADER.format(template="ItemTemplate")
+        # Most items can be crafted, the rest are gathered resources
+        if self.random.random() < 0.65:
+            contents += self.recipe(name_id)
+        base_class = "BlockItem<{0}Block>".format(name_id) if folder == "Block" else "Item"
+        contents += self.item(name_id, base_class) + FOOTER
+        self.item_ids.append(f"{name_id}Item")
+        return contents
+
+    def world_object_file(self, name_id: str) -> str:
+        is_table = self.random.random() < 0.35
+        crafting_component = "    [RequireComponent(typeof(CraftingComponent))]\n" if is_table else ""
+        plugin_modules = ""
+        if is_table and self.random.random() < 0.6:
+            module = self.random.choice(["BasicUpgrade", "AdvancedUpgrade", "ModernUpgrade"])
+            plugin_modules = f"    [AllowPluginModules(Tags = new[] {{ \"{module}\" }}, ItemTypes = new[] {{ typeof({module}LvlItem) }})]\n"
+
+        contents = HEADER.format(template="WorldObjectTemplate")
+        contents += WORLD_OBJECT_TEMPLATE.format(
+            name_id=name_id,
+            display_name=self.display_name(name_id),
+            crafting_component=crafting_component,
+            plugin_modules=plugin_modules,
+        )
+        contents += self.item(name_id, f"WorldObjectItem<{name_id}Object>")
+        contents += self.recipe(name_id)
+        contents += FOOTER
+        self.item_ids.append(f"{name_id}Item")
+        if is_table:
+            self.table_ids.append(f"{name_id}Object")
+        return contents
+
+    def skill_file(self, name_id: str) -> str:
+        is_specialty = self.random.random() < 0.6
+        if is_specialty:
+            self.skill_ids.append(f"{name_id}Skill")
+        return HEADER.format(template="SkillTemplate") + SKILL_TEMPLATE.format(
+            name_id=name_id,
+            display_name=self.display_name(name_id),
+            profession=self.random.choice(["Carpenter", "Smith", "Chef", "Engineer", "Farmer"]),
+            skill_tag="Specialty" if is_specialty else "Profession",
+        ) + FOOTER
+
+    @staticmethod
+    def write_tag_definitions(root: Path):
+        systems_path = root / "Systems"
+        systems_path.mkdir(parents=True, exist_ok=True)
+        lines = [f"            new TagDefinition(\"{tag}\")," for tag in TAGS]
+        lines.append("            // Hidden tags")
+        lines.append("            new TagDefinition(\"Usable\"),")
+        contents = "namespace Eco.Mods.TechTree\n{\n    public static class TagDefinitions\n    {\n" + \
+                   "\n".join(lines) + "\n    }\n}\n"
+        (systems_path / "TagDefinitions.cs").write_text(contents, encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Eco Mods/__core__ tree.")
+    parser.add_argument('output', help="folder to create the fake Mods/__core__ tree in")
+    parser.add_argument('--files', type=int, default=5000, help="number of .cs files to generate (default: 5000)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed, the same seed gives the same corpus")
+    args = parser.parse_args(argv)
+
+    root = Path(args.output)
+    CorpusGenerator(args.seed).generate(root, args.files)
+    print(f"Wrote {args.files} .cs files to {root / 'AutoGen'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for the Eco Data Reader pipeline.
+
+Times the phases of a full run against a server tree (a real Mods/__core__ folder or
+one written by generate_corpus.py) and reports files per second and peak RSS:
+
+  scan    - enumerate the AutoGen .cs files
+  parse   - EcoServerFileService.scan_all (read and parse every file)
+  filter  - load reference names and keep only new items and recipes
+  emit    - write the .txt and .ts output files (main.write_output_files)
+
+Usage: python benchmarks/run_benchmark.py [MODS_CORE_PATH] [--generate N] [--workers N] [--read-mode MODE]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from generate_corpus import CorpusGenerator
+from eco_data_reader.services import EcoServerFileService, ParseCache, ReferenceNames
+from eco_data_reader.services.eco_server_file_service import READ_MODES
+import main as eco_data_reader_main
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return max(usage, children) / divisor
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.phases = []
+
+    def run(self, name, function, file_count=None):
+        """Time function as phase name; file_count is only given for the phases that read the files."""
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        self.phases.append({
+            'phase': name,
+            'seconds': elapsed,
+            'filesPerSecond': file_count / elapsed if file_count and elapsed else None,
+            'peakRssMb': peak_rss_mb(),
+        })
+        return result
+
+    def print_report(self):
+        print(f"\n{'Phase':<10}{'Time (s)':>12}{'Files/s':>14}{'Peak RSS (MB)':>16}")
+        for phase in self.phases:
+            files_per_second = f"{phase['filesPerSecond']:,.0f}" if phase['filesPerSecond'] else "-"
+            rss = f"{phase['peakRssMb']:.1f}" if phase['peakRssMb'] is not None else "n/a"
+            print(f"{phase['phase']:<10}{phase['seconds']:>12.3f}{files_per_second:>14}{rss:>16}")
+        total = sum(phase['seconds'] for phase in self.phases)
+        print(f"{'total':<10}{total:>12.3f}{'-':>14}")
+
+
+def run(eco_server_path, workers, work_dir, use_cache, read_mode=READ_MODES[0]):
+    service = EcoServerFileService(eco_server_path, read_mode=read_mode)
+    timer = PhaseTimer()
+
+    cs_files = timer.run("scan", lambda: list(service._get_cs_files(service.SCAN_FOLDERS)))
+    file_count = len(cs_files)
+
+    cache = ParseCache(eco_server_path, str(work_dir / "cache")) if use_cache else None
+    dataset = timer.run("parse", lambda: service.scan_all(workers=workers, cache=cache), file_count)
+    if use_cache:
+        cache = ParseCache(eco_server_path, str(work_dir / "cache"))
+        dataset = timer.run("parse-warm", lambda: service.scan_all(workers=workers, cache=cache), file_count)
+
+    # Pretend every other item and recipe is already known
+    reference_file = work_dir / "reference-names.txt"
+    reference_file.write_text("\n".join(item.name for item in dataset.items[::2]) + "\n"
+                              + "\n".join(recipe.name for recipe in dataset.recipes[::2]), encoding="utf-8")
+
+    def filter_new():
+        reference_names = ReferenceNames.load([reference_file], "reference")
+        new_items = [item for item in dataset.items
+                     if eco_data_reader_main.matches_new_items(item, reference_names)]
+        new_recipes = [recipe for recipe in dataset.recipes
+                       if eco_data_reader_main.matches_new_recipes(recipe, reference_names)]
+        return new_items, new_recipes
+
+    # These go over the parsed items and recipes, so a files/s rate would say nothing about them
+    timer.run("filter", filter_new)
+    timer.run("emit", lambda: eco_data_reader_main.write_output_files(dataset, True, work_dir / "output"))
+
+    print(f"\nFiles: {file_count}  Items: {len(dataset.items)}  Recipes: {len(dataset.recipes)}  "
+          f"Tables: {len(dataset.crafting_tables)}  Skills: {len(dataset.skills)}  Workers: {workers}  "
+          f"Read mode: {read_mode}")
+    timer.print_report()
+    return {'files': file_count, 'workers': workers, 'readMode': read_mode, 'items': len(dataset.items),
+            'recipes': len(dataset.recipes), 'phases': timer.phases}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Eco Data Reader pipeline.")
+    parser.add_argument('path', nargs='?', help="Eco server Mods/__core__ folder to benchmark")
+    parser.add_argument('--generate', type=int, metavar='N',
+                        help="generate a synthetic corpus of N files instead of using PATH")
+    parser.add_argument('--seed', type=int, default=0, help="seed for --generate")
+    parser.add_argument('--workers', type=int, default=1, help="parser processes (0 = one per CPU)")
+    parser.add_argument('--read-mode', choices=READ_MODES, default=READ_MODES[0],
+                        help="how the .cs files are read (default: text)")
+    parser.add_argument('--cache', action='store_true', help="also time a cold and a warm parse cache run")
+    parser.add_argument('--json', metavar='FILE', help="write the results as JSON to FILE")
+    args = parser.parse_args(argv)
+
+    if not args.path and not args.generate:
+        parser.error("either PATH or --generate N is required")
+
+    # Parser warnings would be part of the measured time
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory(prefix="eco-benchmark-") as temp_dir:
+        work_dir = Path(temp_dir)
+        eco_server_path = args.path
+        if args.generate:
+            eco_server_path = str(work_dir / "__core__")
+            start = time.perf_counter()
+            CorpusGenerator(args.seed).generate(Path(eco_server_path), args.generate)
+            print(f"Generated {args.generate} files in {time.perf_counter() - start:.2f}s")
+
+        results = run(eco_server_path, args.workers, work_dir, args.cache, args.read_mode)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+from .recipe_graph import RecipeGraph
+from .rollup import Rollup, RollupCalculator
+from .tag_index import TagIndex
+from .recipe_matrix import RecipeMatrix
+from .dataset_diff import DatasetDiff, SectionDiff, EntryChange, FieldChange, diff_datasets
+
+__all__ = ['RecipeGraph', 'Rollup', 'RollupCalculator', 'TagIndex', 'RecipeMatrix',
+           'DatasetDiff', 'SectionDiff', 'EntryChange', 'FieldChange', 'diff_datasets']
@@ -0,0 +1,197 @@
+import json
+import logging
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from ..models import EcoDataset
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FieldChange:
+    field: str
+    old: Any
+    new: Any
+
+    def to_dict(self):
+        return {'field': self.field, 'old': _to_json(self.old), 'new': _to_json(self.new)}
+
+
+@dataclass
+class EntryChange:
+    name_id: str
+    changes: List[FieldChange] = field(default_factory=list)
+    # Only set for renamed entries
+    old_name_id: Optional[str] = None
+
+    def to_dict(self):
+        data = {'nameID': self.name_id}
+        if self.old_name_id is not None:
+            data['oldNameID'] = self.old_name_id
+        data['changes'] = [change.to_dict() for change in self.changes]
+        return data
+
+
+@dataclass
+class SectionDiff:
+    """Differences between the items, recipes, crafting tables or skills of two datasets."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # Same content under a new name ID
+    renamed: List[EntryChange] = field(default_factory=list)
+    changed: List[EntryChange] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.renamed or self.changed)
+
+    def counts(self) -> Dict[str, int]:
+        return {'added': len(self.added), 'removed': len(self.removed),
+                'renamed': len(self.renamed), 'changed': len(self.changed)}
+
+    def to_dict(self):
+        return {
+            'added': self.added,
+            'removed': self.removed,
+            'renamed': [entry.to_dict() for entry in self.renamed],
+            'changed': [entry.to_dict() for entry in self.changed]
+        }
+
+
+@dataclass
+class DatasetDiff:
+    items: SectionDiff = field(default_factory=SectionDiff)
+    recipes: SectionDiff = field(default_factory=SectionDiff)
+    crafting_tables: SectionDiff = field(default_factory=SectionDiff)
+    skills: SectionDiff = field(default_factory=SectionDiff)
+
+    def __bool__(self):
+        return any(self._sections().values())
+
+    def summary(self) -> str:
+        return "; ".join(
+            f"{name}: " + ", ".join(f"{count} {status}" for status, count in section.counts().items())
+            for name, section in self._sections().items())
+
+    def to_dict(self):
+        sections = self._sections()
+        data = {'summary': {name: section.counts() for name, section in sections.items()}}
+        data.update((name, section.to_dict()) for name, section in sections.items())
+        return data
+
+    def write_json(self, file_path: Path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logger.info(f"Wrote dataset diff to: {file_path}")
+
+    def _sections(self) -> Dict[str, SectionDiff]:
+        return {'items': self.items, 'recipes': self.recipes,
+                'craftingTables': self.crafting_tables, 'skills': self.skills}
+
+
+def _item_fields(item):
+    return {'name': item.name, 'tag': item.tag, 'tags': tuple(sorted(item.tags)), 'imageFile': item.image_file,
+            'xPos': item.x_pos, 'yPos': item.y_pos}
+
+
+def _recipe_fields(recipe):
+    return {
+        'name': recipe.name,
+        'skill': recipe.skill_name_id,
+        'level': recipe.level,
+        'labor': recipe.labor,
+        'craftingTable': recipe.crafting_table_name_id,
+        'hidden': recipe.hidden,
+        'ingredients': recipe.ingredients,
+        'outputs': recipe.outputs
+    }
+
+
+def _crafting_table_fields(table):
+    return {'name': table.crafting_table_name, 'upgradeModuleType': table.upgrade_module_tag, 'hidden': table.hidden}
+
+
+def _skill_fields(skill):
+    return {'name': skill.name}
+
+
+def _comparable(value):
+    # Ingredient and output lists compare as multisets, with equivalent item name IDs matching.
+    # Ingredient equality leaves out the tag flag, so it is compared next to each entry.
+    if isinstance(value, list):
+        return frozenset(Counter((entry, getattr(entry, 'tag', False)) for entry in value).items())
+    return value
+
+
+def _entry_to_json(entry):
+    data = entry.to_dict()
+    if getattr(entry, 'tag', False):
+        data['tag'] = True
+    return data
+
+
+def _to_json(value):
+    if isinstance(value, list):
+        return [_entry_to_json(entry) for entry in sorted(value, key=lambda entry: entry.item_name_id)]
+    return value
+
+
+def diff_section(old_models: Iterable, new_models: Iterable, key: Callable[[Any], str],
+                 fields: Callable[[Any], Dict[str, Any]]) -> SectionDiff:
+    """Hash-join two model lists on key and classify every entry.
+
+    Entries whose key disappeared but whose fields reappear unchanged under a new
+    key are reported as renamed. Runs in time linear in the number of models.
+    """
+    old_by_key: Dict[str, Any] = {}
+    for model in old_models:
+        old_by_key.setdefault(key(model), model)
+    new_by_key: Dict[str, Any] = {}
+    for model in new_models:
+        new_by_key.setdefault(key(model), model)
+
+    diff = SectionDiff()
+    added_keys = []
+    for name_id, new_model in new_by_key.items():
+        old_model = old_by_key.get(name_id)
+        if old_model is None:
+            added_keys.append(name_id)
+            continue
+
+        old_fields, new_fields = fields(old_model), fields(new_model)
+        changes = [FieldChange(name, old_fields[name], value) for name, value in new_fields.items()
+                   if _comparable(old_fields[name]) != _comparable(value)]
+        if changes:
+            diff.changed.append(EntryChange(name_id, changes))
+
+    # Removed entries by content, to pair them up with added ones
+    removed_by_signature: Dict[tuple, deque] = {}
+    for name_id, old_model in old_by_key.items():
+        if name_id not in new_by_key:
+            signature = tuple(_comparable(value) for value in fields(old_model).values())
+            removed_by_signature.setdefault(signature, deque()).append(name_id)
+
+    for name_id in added_keys:
+        signature = tuple(_comparable(value) for value in fields(new_by_key[name_id]).values())
+        candidates = removed_by_signature.get(signature)
+        if candidates:
+            diff.renamed.append(EntryChange(name_id, old_name_id=candidates.popleft()))
+        else:
+            diff.added.append(name_id)
+
+    renamed_from = {entry.old_name_id for entry in diff.renamed}
+    diff.removed = [name_id for name_id in old_by_key
+                    if name_id not in new_by_key and name_id not in renamed_from]
+    return diff
+
+
+def diff_datasets(old: EcoDataset, new: EcoDataset) -> DatasetDiff:
+    """Compare two datasets, e.g. the data of the previous and the current server build."""
+    return DatasetDiff(
+        items=diff_section(old.items, new.items, lambda item: item.item_name_id, _item_fields),
+        recipes=diff_section(old.recipes, new.recipes, lambda recipe: recipe.name_id, _recipe_fields),
+        crafting_tables=diff_section(old.crafting_tables, new.crafting_tables,
+                                     lambda table: table.crafting_table_name_id, _crafting_table_fields),
+        skills=diff_section(old.skills, new.skills, lambda skill: skill.name_id, _skill_fields)
+    )
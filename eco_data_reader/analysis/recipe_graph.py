@@ -0,0 +1,127 @@
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+from ..models import Item, Recipe
+
+
+def _build_adjacency(keys_per_recipe: Sequence[Sequence[int]], key_count: int) -> Tuple[array, array]:
+    """Build compressed sparse row arrays mapping each key to the recipes that have it.
+
+    The recipe indices of key k are values[offsets[k]:offsets[k + 1]], in recipe order.
+    """
+    offsets = array('i', [0]) * (key_count + 1)
+    for keys in keys_per_recipe:
+        for key in keys:
+            offsets[key + 1] += 1
+    for key in range(key_count):
+        offsets[key + 1] += offsets[key]
+
+    values = array('i', [0]) * offsets[key_count]
+    positions = offsets[:-1]
+    for recipe_index, keys in enumerate(keys_per_recipe):
+        for key in keys:
+            values[positions[key]] = recipe_index
+            positions[key] += 1
+    return offsets, values
+
+
+class _IdMap:
+    """Assigns consecutive integer IDs to names."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def add(self, name: str) -> int:
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+
+class RecipeGraph:
+    """Index of which recipes produce and consume each item, and which recipes each
+    crafting table and skill has.
+
+    Items, tables and skills get integer IDs and every lookup is a slice of a flat
+    integer array, so queries do not scan the recipe list. Items are keyed by their
+    own name ID and tag ingredients by the tag name. Equivalent name IDs (see
+    Item.EQUIVALENT_ITEM_NAME_IDS) only come in when matching an item to the recipes
+    that make it and nothing outputs the item itself: WoodBoard is made by the
+    BoardItem recipes, but AshlarGraniteItem only by its own.
+    """
+
+    def __init__(self, recipes: Iterable[Recipe]):
+        self.recipes: List[Recipe] = list(recipes)
+
+        self._items = _IdMap()
+        self._crafting_tables = _IdMap()
+        self._skills = _IdMap()
+        outputs, ingredients, crafting_tables, skills = [], [], [], []
+
+        for recipe in self.recipes:
+            # dict.fromkeys drops repeats while keeping the order
+            outputs.append(tuple(dict.fromkeys(self._items.add(output.item_name_id) for output in recipe.outputs)))
+            ingredients.append(tuple(dict.fromkeys(
+                self._items.add(ingredient.item_name_id) for ingredient in recipe.ingredients)))
+            crafting_tables.append((self._crafting_tables.add(recipe.crafting_table_name_id),))
+            skills.append((self._skills.add(recipe.skill_name_id),))
+
+        item_count = len(self._items.names)
+        self._producers = _build_adjacency(outputs, item_count)
+        self._consumers = _build_adjacency(ingredients, item_count)
+        self._crafting_table_recipes = _build_adjacency(crafting_tables, len(self._crafting_tables.names))
+        self._skill_recipes = _build_adjacency(skills, len(self._skills.names))
+
+        # Canonical name ID -> IDs of the items in the graph with that canonical name ID
+        self._equivalent_items: Dict[str, List[int]] = {}
+        for item_id, item_name_id in enumerate(self._items.names):
+            self._equivalent_items.setdefault(Item.canonical_name_id(item_name_id), []).append(item_id)
+
+    @property
+    def item_name_ids(self) -> List[str]:
+        """Name IDs of every item used or produced by a recipe, indexed by item ID."""
+        return self._items.names
+
+    def item_id(self, item_name_id: str) -> int:
+        """Integer ID of an item, or -1 when no recipe uses or produces it."""
+        return self._items.ids.get(item_name_id, -1)
+
+    def producer_ids(self, item_id: int) -> Sequence[int]:
+        """Indices into recipes of the recipes that output the item."""
+        return self._slice(self._producers, item_id)
+
+    def consumer_ids(self, item_id: int) -> Sequence[int]:
+        """Indices into recipes of the recipes that take the item as an ingredient."""
+        return self._slice(self._consumers, item_id)
+
+    def matching_producer_ids(self, item_name_id: str) -> Sequence[int]:
+        """Indices into recipes of the recipes that output the item, or when there are none,
+        of those that output an equivalent item, in recipe order."""
+        producer_ids = self.producer_ids(self.item_id(item_name_id))
+        if producer_ids:
+            return producer_ids
+        equivalent_items = self._equivalent_items.get(Item.canonical_name_id(item_name_id), ())
+        return sorted({index for item_id in equivalent_items for index in self.producer_ids(item_id)})
+
+    def producers(self, item_name_id: str) -> List[Recipe]:
+        """The recipes that make the item, see matching_producer_ids()."""
+        return [self.recipes[index] for index in self.matching_producer_ids(item_name_id)]
+
+    def consumers(self, item_name_id: str) -> List[Recipe]:
+        return [self.recipes[index] for index in self.consumer_ids(self.item_id(item_name_id))]
+
+    def recipes_for_crafting_table(self, crafting_table_name_id: str) -> List[Recipe]:
+        table_id = self._crafting_tables.ids.get(crafting_table_name_id, -1)
+        return [self.recipes[index] for index in self._slice(self._crafting_table_recipes, table_id)]
+
+    def recipes_for_skill(self, skill_name_id: str) -> List[Recipe]:
+        skill_id = self._skills.ids.get(skill_name_id, -1)
+        return [self.recipes[index] for index in self._slice(self._skill_recipes, skill_id)]
+
+    @staticmethod
+    def _slice(adjacency: Tuple[array, array], key: int) -> Sequence[int]:
+        if key < 0:
+            return ()
+        offsets, values = adjacency
+        return values[offsets[key]:offsets[key + 1]]
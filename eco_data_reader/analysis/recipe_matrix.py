@@ -0,0 +1,167 @@
+from array import array
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+from ..models import Recipe
+
+try:
+    import numpy
+except ImportError:  # Optional, the aggregations fall back to plain Python
+    numpy = None
+
+
+class RecipeMatrix:
+    """Sparse item x recipe matrix of the quantities every recipe consumes and produces.
+
+    Entry (item, recipe) is the output quantity of the item (positive) plus its
+    ingredient quantity (negative), so the matrix times a vector of recipe runs is
+    the net production of every item. Rows are keyed by item name ID,
+    like RecipeGraph, and tag ingredients by the tag name. Quantities are the base
+    quantities, without upgrade module or talent reductions.
+
+    The matrix is stored column by column (compressed sparse column arrays) and
+    every aggregation is a grouped sum over its entries or its recipes, computed
+    with numpy.bincount when NumPy is installed and in a Python loop otherwise.
+    Results are floats either way. Aggregations take optional runs (recipe name
+    ID -> how many times it is crafted, 1 for recipes not listed) to weight the
+    recipes.
+    """
+
+    def __init__(self, recipes: Iterable[Recipe], use_numpy: Optional[bool] = None):
+        if use_numpy and numpy is None:
+            raise ImportError("use_numpy=True needs NumPy, which is not installed")
+        self._numpy = numpy if use_numpy or use_numpy is None else None
+
+        self.recipes: List[Recipe] = list(recipes)
+        self._item_ids: Dict[str, int] = {}
+        self.item_name_ids: List[str] = []
+
+        # The entries of recipe j are rows/values[offsets[j]:offsets[j + 1]]; outputs come first
+        self._offsets = array('i', [0])
+        self._rows = array('i')
+        self._values = array('d')
+        for recipe in self.recipes:
+            for output in recipe.outputs:
+                self._rows.append(self._item_id(output.item_name_id))
+                self._values.append(float(output.quantity))
+            for ingredient in recipe.ingredients:
+                self._rows.append(self._item_id(ingredient.item_name_id))
+                self._values.append(-float(ingredient.quantity))
+            self._offsets.append(len(self._rows))
+
+        # Recipe index of every entry, for the sums that group entries by recipe
+        self._columns = array('i')
+        for column in range(len(self.recipes)):
+            self._columns.extend([column] * (self._offsets[column + 1] - self._offsets[column]))
+
+        if self._numpy is not None:
+            # Views of the same buffers, nothing is copied
+            self._numpy_values = self._numpy.frombuffer(self._values, dtype=float)
+            self._numpy_columns = self._numpy.frombuffer(self._columns, dtype=self._numpy.intc)
+
+    @property
+    def shape(self):
+        return len(self.item_name_ids), len(self.recipes)
+
+    @property
+    def uses_numpy(self) -> bool:
+        return self._numpy is not None
+
+    def column(self, recipe_index: int) -> Dict[str, float]:
+        """Canonical item name ID -> coefficient for one recipe (an index into recipes)."""
+        coefficients: Dict[str, float] = {}
+        for entry in range(self._offsets[recipe_index], self._offsets[recipe_index + 1]):
+            name_id = self.item_name_ids[self._rows[entry]]
+            coefficients[name_id] = coefficients.get(name_id, 0.0) + self._values[entry]
+        return coefficients
+
+    def net_production(self, runs: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """Outputs minus ingredients of every item over all recipes (the matrix times the runs)."""
+        return self._by_item(self._item_sums(self._entry_weights(runs)))
+
+    def ingredient_demand(self, runs: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """How much of every item all recipes take as an ingredient together."""
+        return self._by_item(self._item_sums(self._entry_weights(runs, sign=-1)))
+
+    def output_supply(self, runs: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """How much of every item all recipes produce together."""
+        return self._by_item(self._item_sums(self._entry_weights(runs, sign=1)))
+
+    def labor_by_skill(self, runs: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        return self._labor_by(lambda recipe: recipe.skill_name_id, runs)
+
+    def labor_by_crafting_table(self, runs: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        return self._labor_by(lambda recipe: recipe.crafting_table_name_id, runs)
+
+    def output_input_ratios(self) -> Dict[str, Optional[float]]:
+        """Recipe name ID -> total output quantity divided by total ingredient quantity.
+
+        None for recipes without ingredients. Quantities of different items are simply
+        added up, so this compares recipes by volume, not by value.
+        """
+        outputs = self._recipe_sums(self._entry_weights(None, sign=1))
+        inputs = self._recipe_sums(self._entry_weights(None, sign=-1))
+        ratios: Dict[str, Optional[float]] = {}
+        for recipe, output, ingredient in zip(self.recipes, outputs, inputs):
+            ratios.setdefault(recipe.name_id, output / ingredient if ingredient else None)
+        return ratios
+
+    def _item_id(self, item_name_id: str) -> int:
+        item_id = self._item_ids.get(item_name_id)
+        if item_id is None:
+            item_id = self._item_ids[item_name_id] = len(self.item_name_ids)
+            self.item_name_ids.append(item_name_id)
+        return item_id
+
+    def _recipe_runs(self, runs: Optional[Mapping[str, float]]) -> Sequence[float]:
+        if not runs:
+            return array('d', [1.0]) * len(self.recipes)
+        return array('d', (float(runs.get(recipe.name_id, 1.0)) for recipe in self.recipes))
+
+    def _entry_weights(self, runs: Optional[Mapping[str, float]], sign: int = 0) -> Sequence[float]:
+        """The matrix entries times the runs of their recipe.
+
+        With sign=1 only the outputs are kept, with sign=-1 only the ingredients, as
+        positive quantities.
+        """
+        if self._numpy is not None:
+            values = self._numpy_values
+            if sign:
+                values = self._numpy.maximum(values * sign, 0.0)
+            if runs:
+                values = values * self._numpy.frombuffer(self._recipe_runs(runs), dtype=float)[self._numpy_columns]
+            return values
+
+        values = self._values
+        if sign:
+            values = array('d', (value * sign if value * sign > 0 else 0.0 for value in values))
+        if runs:
+            recipe_runs = self._recipe_runs(runs)
+            values = array('d', (value * recipe_runs[column] for value, column in zip(values, self._columns)))
+        return values
+
+    def _item_sums(self, weights: Sequence[float]) -> Sequence[float]:
+        return self._grouped_sums(self._rows, weights, len(self.item_name_ids))
+
+    def _recipe_sums(self, weights: Sequence[float]) -> Sequence[float]:
+        return self._grouped_sums(self._columns, weights, len(self.recipes))
+
+    def _grouped_sums(self, keys: array, weights: Sequence[float], length: int) -> Sequence[float]:
+        """sums[k] = total of the weights whose key is k."""
+        if self._numpy is not None:
+            return self._numpy.bincount(self._numpy.frombuffer(keys, dtype=self._numpy.intc),
+                                        weights=weights, minlength=length).tolist()
+        sums = [0.0] * length
+        for key, weight in zip(keys, weights):
+            sums[key] += weight
+        return sums
+
+    def _labor_by(self, key: Callable[[Recipe], str], runs: Optional[Mapping[str, float]]) -> Dict[str, float]:
+        group_ids: Dict[str, int] = {}
+        keys = array('i', (group_ids.setdefault(key(recipe), len(group_ids)) for recipe in self.recipes))
+        recipe_runs = self._recipe_runs(runs)
+        labor = array('d', (recipe.labor * recipe_runs[index] for index, recipe in enumerate(self.recipes)))
+        if self._numpy is not None:
+            labor = self._numpy.frombuffer(labor, dtype=float)
+        return dict(zip(group_ids, self._grouped_sums(keys, labor, len(group_ids))))
+
+    def _by_item(self, sums: Sequence[float]) -> Dict[str, float]:
+        return {name_id: total for name_id, total in zip(self.item_name_ids, sums) if total}
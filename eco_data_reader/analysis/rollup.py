@@ -0,0 +1,184 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional
+from ..models import Item, Recipe
+from .recipe_graph import RecipeGraph
+
+logger = logging.getLogger(__name__)
+
+_NOT_STARTED, _IN_PROGRESS, _DONE = 0, 1, 2
+
+
+@dataclass
+class Rollup:
+    """Raw materials, byproducts and labor needed to make one unit of an item."""
+    item_name_id: str
+    # None for raw materials and where a cycle was cut
+    recipe: Optional[Recipe] = None
+    raw_materials: Dict[str, Decimal] = field(default_factory=dict)
+    byproducts: Dict[str, Decimal] = field(default_factory=dict)
+    labor: Decimal = Decimal(0)
+    # True when part of the tree was cut off because it led back to an item being made
+    cyclic: bool = False
+
+    def to_dict(self):
+        return {
+            'item': self.item_name_id,
+            'recipe': self.recipe.name_id if self.recipe else None,
+            'rawMaterials': {name_id: float(quantity) for name_id, quantity in self.raw_materials.items()},
+            'byproducts': {name_id: float(quantity) for name_id, quantity in self.byproducts.items()},
+            'labor': float(self.labor),
+            'cyclic': self.cyclic
+        }
+
+
+class RollupCalculator:
+    """Rolls recipes up into the raw materials and labor needed per unit of each item.
+
+    Every item is made with one recipe (see RecipeGraph.producers()): the one given
+    in default_recipes (item name ID -> recipe name ID), else the first recipe with the item as its
+    primary output, else the first recipe that outputs it. Items without a recipe
+    are raw materials. Quantities are the base quantities, without upgrade module
+    or talent reductions.
+
+    Secondary outputs are netted against the ingredients of the same recipe (e.g. a
+    barrel that is used and returned costs nothing), and what is left over is
+    reported as byproducts. When making an item needs that same item further down
+    the tree, the loop is cut there and the item counts as a raw material.
+
+    Every item is rolled up in one depth-first pass over the items in graph order,
+    the first time any rollup is asked for. Each loop is cut where that pass first
+    closes it, so the results do not depend on which item is asked for first.
+    Results are memoized, so shared sub-trees are only computed once and the pass
+    visits every recipe a single time.
+    """
+
+    def __init__(self, graph: RecipeGraph, default_recipes: Optional[Mapping[str, str]] = None):
+        self.graph = graph
+        self.default_recipes = dict(default_recipes or {})
+        item_count = len(graph.item_name_ids)
+        self._rollups: List[Optional[Rollup]] = [None] * item_count
+        self._states = bytearray(item_count)
+        self._resolved = False
+
+    def rollup(self, item_name_id: str) -> Rollup:
+        self._resolve()
+        item_id = self.graph.item_id(item_name_id)
+        if item_id < 0:
+            recipe = self.choose_recipe(item_name_id)
+            if recipe is not None:
+                # Only made by the recipes of an equivalent item
+                return self._rollup_recipe(item_name_id, recipe) or Rollup(
+                    item_name_id, raw_materials={item_name_id: Decimal(1)})
+            return Rollup(item_name_id, raw_materials={item_name_id: Decimal(1)})
+        return self._rollups[item_id]
+
+    def rollup_all(self) -> Dict[str, Rollup]:
+        """Roll up every item that a recipe uses or produces, keyed by item name ID."""
+        self._resolve()
+        return dict(zip(self.graph.item_name_ids, self._rollups))
+
+    def choose_recipe(self, item_name_id: str) -> Optional[Recipe]:
+        producers = self.graph.producers(item_name_id)
+        if not producers:
+            return None
+
+        default_recipe = self.default_recipes.get(item_name_id)
+        if default_recipe:
+            for recipe in producers:
+                if recipe.name_id == default_recipe:
+                    return recipe
+            logger.warning(f"Default recipe {default_recipe} does not produce {item_name_id}, ignoring it")
+
+        for recipe in producers:
+            primary = next((output for output in recipe.outputs if output.primary), None)
+            if primary and primary.item_name_id == self._produced_name_id(item_name_id, recipe):
+                return recipe
+        return producers[0]
+
+    @staticmethod
+    def _produced_name_id(item_name_id: str, recipe: Recipe) -> str:
+        """The output of the recipe that makes the item: the item itself, or the first
+        equivalent item when the recipe was matched through an equivalent name ID."""
+        output_name_ids = [output.item_name_id for output in recipe.outputs]
+        if item_name_id in output_name_ids:
+            return item_name_id
+        canonical_name_id = Item.canonical_name_id(item_name_id)
+        return next((name_id for name_id in output_name_ids if Item.canonical_name_id(name_id) == canonical_name_id),
+                    item_name_id)
+
+    def _resolve(self):
+        if not self._resolved:
+            for item_id in range(len(self.graph.item_name_ids)):
+                self._rollup(item_id)
+            self._resolved = True
+
+    def _rollup(self, item_id: int) -> Rollup:
+        if self._states[item_id] == _DONE:
+            return self._rollups[item_id]
+
+        item_name_id = self.graph.item_name_ids[item_id]
+        raw_material = Rollup(item_name_id, raw_materials={item_name_id: Decimal(1)})
+        if self._states[item_id] == _IN_PROGRESS:
+            # Cycle: the item is needed to make itself, cut the loop here
+            raw_material.cyclic = True
+            return raw_material
+
+        recipe = self.choose_recipe(item_name_id)
+        if recipe is None:
+            self._finish(item_id, raw_material)
+            return raw_material
+
+        self._states[item_id] = _IN_PROGRESS
+        result = self._rollup_recipe(item_name_id, recipe) or raw_material
+        self._finish(item_id, result)
+        return result
+
+    def _rollup_recipe(self, item_name_id: str, recipe: Recipe) -> Optional[Rollup]:
+        # Net quantity of every item per craft: outputs positive, ingredients negative
+        net = defaultdict(Decimal)
+        for output in recipe.outputs:
+            net[output.item_name_id] += output.quantity
+        for ingredient in recipe.ingredients:
+            net[ingredient.item_name_id] -= ingredient.quantity
+
+        produced = net.pop(self._produced_name_id(item_name_id, recipe), Decimal(0))
+        if produced <= 0:
+            logger.warning(f"Recipe {recipe.name_id} does not produce more {item_name_id} than it uses")
+            return None
+
+        result = Rollup(item_name_id, recipe=recipe, labor=Decimal(recipe.labor) / produced)
+        raw_materials = defaultdict(Decimal)
+        byproducts = defaultdict(Decimal)
+        for other_name_id, quantity in net.items():
+            per_unit = quantity / produced
+            if per_unit > 0:
+                byproducts[other_name_id] += per_unit
+                continue
+            if per_unit == 0:
+                continue
+
+            ingredient = self._rollup(self.graph.item_id(other_name_id))
+            needed = -per_unit
+            for name_id, amount in ingredient.raw_materials.items():
+                raw_materials[name_id] += amount * needed
+            for name_id, amount in ingredient.byproducts.items():
+                byproducts[name_id] += amount * needed
+            result.labor += ingredient.labor * needed
+            result.cyclic = result.cyclic or ingredient.cyclic
+
+        # A byproduct that is also needed as a raw material covers part of it
+        for name_id in set(byproducts) & set(raw_materials):
+            offset = min(byproducts[name_id], raw_materials[name_id])
+            byproducts[name_id] -= offset
+            raw_materials[name_id] -= offset
+
+        result.raw_materials = {name_id: amount for name_id, amount in raw_materials.items() if amount}
+        result.byproducts = {name_id: amount for name_id, amount in byproducts.items() if amount}
+        return result
+
+    def _finish(self, item_id: int, rollup: Rollup):
+        self._rollups[item_id] = rollup
+        self._states[item_id] = _DONE
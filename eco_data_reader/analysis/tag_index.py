@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, List, Tuple
+from ..models import Ingredient, Item, Recipe
+
+
+def _tag_key(tag: str) -> str:
+    # Tag ingredient names and item tags are both stored without spaces
+    return tag.replace(" ", "")
+
+
+class TagIndex:
+    """Index of which items carry each tag and which tags each item carries.
+
+    Built from the [Tag("...")] attributes the scan found on item classes. Tag
+    ingredients of recipes (e.g. 3 Wood) are expanded into the items that satisfy
+    them with dictionary lookups instead of searching the items per query.
+    Item lookups accept equivalent name IDs (e.g. WoodBoard and BoardItem).
+    """
+
+    def __init__(self, items: Iterable[Item]):
+        tag_items: Dict[str, Dict[str, None]] = {}
+        item_tags: Dict[str, Dict[str, None]] = {}
+        for item in items:
+            if item.tag or not item.tags or not item.item_name_id:
+                continue
+            canonical_name_id = Item.canonical_name_id(item.item_name_id)
+            for tag in item.tags:
+                # dicts as ordered sets, so items are listed once in the order given
+                tag_items.setdefault(tag, {})[item.item_name_id] = None
+                item_tags.setdefault(canonical_name_id, {})[tag] = None
+
+        self._tag_items: Dict[str, Tuple[str, ...]] = {tag: tuple(name_ids) for tag, name_ids in tag_items.items()}
+        self._item_tags: Dict[str, Tuple[str, ...]] = {name_id: tuple(tags) for name_id, tags in item_tags.items()}
+
+    @property
+    def tags(self) -> List[str]:
+        """Every tag carried by at least one item, sorted."""
+        return sorted(self._tag_items)
+
+    def items_with_tag(self, tag: str) -> Tuple[str, ...]:
+        return self._tag_items.get(_tag_key(tag), ())
+
+    def tags_of(self, item_name_id: str) -> Tuple[str, ...]:
+        return self._item_tags.get(Item.canonical_name_id(item_name_id), ())
+
+    def has_tag(self, item_name_id: str, tag: str) -> bool:
+        return _tag_key(tag) in self.tags_of(item_name_id)
+
+    def candidates(self, ingredient: Ingredient) -> Tuple[str, ...]:
+        """Name IDs of the items that satisfy an ingredient: the tagged items for a tag
+        ingredient, else the ingredient's own item."""
+        if ingredient.tag:
+            return self.items_with_tag(ingredient.item_name_id)
+        return (ingredient.item_name_id,)
+
+    def expand_ingredient(self, ingredient: Ingredient) -> List[Ingredient]:
+        """The alternatives for an ingredient, as item ingredients of the same quantity."""
+        if not ingredient.tag:
+            return [ingredient]
+        return [Ingredient(item_name_id=item_name_id, quantity=ingredient.quantity,
+                           reducible=ingredient.reducible, tag=False)
+                for item_name_id in self.items_with_tag(ingredient.item_name_id)]
+
+    def expand_recipe(self, recipe: Recipe) -> List[List[Ingredient]]:
+        """The alternatives for every ingredient of a recipe, in ingredient order.
+
+        Any one ingredient of each list satisfies that part of the recipe. The list
+        of a tag no item carries is empty.
+        """
+        return [self.expand_ingredient(ingredient) for ingredient in recipe.ingredients]
@@ -1,6 +1,8 @@
 import configparser
 import os
+import re
 from pathlib import Path
+from typing import List, Tuple
 
 
 class Config:
@@ -38,3 +40,64 @@ class Config:
     @property
     def white_tiger_path(self) -> str:
         return self.config.get('Paths', 'WHITE_TIGER_PATH', fallback='')
+
+    @property
+    def reference_paths(self) -> List[str]:
+        value = self.config.get('Paths', 'REFERENCE_PATHS', fallback='')
+        return [path.strip() for path in re.split(r'[;\n]', value) if path.strip()]
+
+    @property
+    def equivalent_item_name_ids(self) -> List[Tuple[str, str]]:
+        # Comma or newline separated Left:Right pairs
+        value = self.config.get('Items', 'EQUIVALENT_ITEM_NAME_IDS', fallback='')
+        pairs = []
+        for pair in re.split(r'[,\n]', value):
+            if not pair.strip():
+                continue
+            left, separator, right = pair.partition(':')
+            if not separator or not left.strip() or not right.strip():
+                raise ValueError(f"Invalid EQUIVALENT_ITEM_NAME_IDS entry '{pair.strip()}' in config.ini, "
+                                 f"expected Left:Right")
+            pairs.append((left.strip(), right.strip()))
+        return pairs
+
+    @property
+    def strings_file(self) -> str:
+        return self.config.get('Localization', 'STRINGS_FILE', fallback='')
+
+    @property
+    def languages(self) -> List[str]:
+        value = self.config.get('Localization', 'LANGUAGES', fallback='')
+        return [language.strip() for language in re.split(r'[,\n]', value) if language.strip()]
+
+    @property
+    def chunk_by(self) -> str:
+        return self.config.get('Output', 'CHUNK_BY', fallback='').strip()
+
+    @property
+    def snapshot_database(self) -> str:
+        return self.config.get('Snapshots', 'DATABASE', fallback='') or 'snapshots.sqlite'
+
+    @property
+    def server_host(self) -> str:
+        return self.config.get('Server', 'HOST', fallback='') or '127.0.0.1'
+
+    @property
+    def server_port(self) -> int:
+        return self.config.getint('Server', 'PORT', fallback=8080)
+
+    @property
+    def workers(self) -> int:
+        return self.config.getint('Performance', 'WORKERS', fallback=1)
+
+    @property
+    def read_mode(self) -> str:
+        return self.config.get('Performance', 'READ_MODE', fallback='') or 'text'
+
+    @property
+    def cache_enabled(self) -> bool:
+        return self.config.getboolean('Cache', 'ENABLED', fallback=True)
+
+    @property
+    def cache_dir(self) -> str:
+        return self.config.get('Cache', 'DIRECTORY', fallback='') or '.eco_cache'
@@ -1,8 +1,9 @@
-from .item import Item
+from .item import Item, EQUIVALENT_ITEM_NAME_IDS
 from .recipe import Recipe
 from .ingredient import Ingredient
 from .output import Output
 from .crafting_table import CraftingTable
 from .skill import Skill
+from .dataset import EcoDataset, ParsedFile
 
-__all__ = ['Item', 'Recipe', 'Ingredient', 'Output', 'CraftingTable', 'Skill']
+__all__ = ['Item', 'EQUIVALENT_ITEM_NAME_IDS', 'Recipe', 'Ingredient', 'Output', 'CraftingTable', 'Skill', 'EcoDataset', 'ParsedFile']
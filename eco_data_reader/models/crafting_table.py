@@ -1,8 +1,8 @@
-from dataclasses import dataclass
 from typing import Optional
+from .slots import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class CraftingTable:
     crafting_table_name: str
     crafting_table_name_id: str
@@ -16,3 +16,12 @@ class CraftingTable:
             'upgradeModuleType': self.upgrade_module_tag,
             'hidden': self.hidden
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CraftingTable':
+        return cls(
+            crafting_table_name=data['name'],
+            crafting_table_name_id=data['nameID'],
+            upgrade_module_tag=data.get('upgradeModuleType'),
+            hidden=data.get('hidden', False)
+        )
@@ -0,0 +1,105 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+from .item import Item
+from .recipe import Recipe
+from .crafting_table import CraftingTable
+from .skill import Skill
+from .slots import slotted_dataclass
+
+
+@slotted_dataclass
+class ParsedFile:
+    """Everything the extractors found in a single AutoGen .cs file."""
+    item: Optional[Item] = None
+    recipe: Optional[Recipe] = None
+    crafting_table: Optional[CraftingTable] = None
+    skill: Optional[Skill] = None
+
+    def intern_name_ids(self):
+        """Intern the name IDs again, e.g. after the models were unpickled from a worker process."""
+        if self.item and self.item.item_name_id:
+            self.item.item_name_id = sys.intern(self.item.item_name_id)
+            self.item.tags = tuple(sys.intern(tag) for tag in self.item.tags)
+        if self.recipe:
+            recipe = self.recipe
+            recipe.name_id = sys.intern(recipe.name_id)
+            recipe.skill_name_id = sys.intern(recipe.skill_name_id)
+            recipe.crafting_table_name_id = sys.intern(recipe.crafting_table_name_id)
+            for ingredient in recipe.ingredients:
+                ingredient.item_name_id = sys.intern(ingredient.item_name_id)
+            for output in recipe.outputs:
+                output.item_name_id = sys.intern(output.item_name_id)
+        if self.crafting_table:
+            self.crafting_table.crafting_table_name_id = sys.intern(self.crafting_table.crafting_table_name_id)
+        if self.skill:
+            self.skill.name_id = sys.intern(self.skill.name_id)
+
+
+@dataclass
+class EcoDataset:
+    items: List[Item] = field(default_factory=list)
+    recipes: List[Recipe] = field(default_factory=list)
+    crafting_tables: List[CraftingTable] = field(default_factory=list)
+    skills: List[Skill] = field(default_factory=list)
+
+    @classmethod
+    def from_parsed_files(cls, parsed_files: Iterable[ParsedFile]) -> 'EcoDataset':
+        dataset = cls()
+        dataset.apply_changes((), parsed_files)
+        return dataset
+
+    def apply_changes(self, removed: Iterable[ParsedFile], added: Iterable[ParsedFile]):
+        """Patch the dataset in place, replacing the models of changed source files."""
+        removed_ids = {id(model) for parsed in removed
+                       for model in (parsed.item, parsed.recipe, parsed.crafting_table, parsed.skill) if model}
+
+        self.items = [item for item in self.items if id(item) not in removed_ids]
+        self.recipes = [recipe for recipe in self.recipes if id(recipe) not in removed_ids]
+        self.crafting_tables = [table for table in self.crafting_tables if id(table) not in removed_ids]
+        self.skills = [skill for skill in self.skills if id(skill) not in removed_ids]
+
+        for parsed in added:
+            if parsed.item:
+                self.items.append(parsed.item)
+            if parsed.recipe:
+                self.recipes.append(parsed.recipe)
+            if parsed.crafting_table:
+                self.crafting_tables.append(parsed.crafting_table)
+            if parsed.skill:
+                self.skills.append(parsed.skill)
+        self.sort()
+
+    def to_dict(self):
+        # Also the item tags and ingredient tag flags, which the models leave out of the
+        # TypeScript output but from_dict() reads back, so a saved dataset diffs cleanly
+        return {
+            'items': [dict(item.to_dict(), tags=list(item.tags)) for item in self.items],
+            'recipes': [self._recipe_to_dict(recipe) for recipe in self.recipes],
+            'craftingTables': [table.to_dict() for table in self.crafting_tables],
+            'skills': [skill.to_dict() for skill in self.skills]
+        }
+
+    @staticmethod
+    def _recipe_to_dict(recipe: Recipe) -> dict:
+        data = recipe.to_dict()
+        for ingredient, ingredient_data in zip(recipe.ingredients, data['ingredients']):
+            ingredient_data['tag'] = ingredient.tag
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EcoDataset':
+        dataset = cls(
+            items=[Item.from_dict(item) for item in data.get('items', [])],
+            recipes=[Recipe.from_dict(recipe) for recipe in data.get('recipes', [])],
+            crafting_tables=[CraftingTable.from_dict(table) for table in data.get('craftingTables', [])],
+            skills=[Skill.from_dict(skill) for skill in data.get('skills', [])]
+        )
+        dataset.sort()
+        return dataset
+
+    def sort(self):
+        self.items.sort(key=lambda x: x.item_name_id)
+        self.recipes.sort(key=lambda x: x.name_id)
+        self.crafting_tables.sort(key=lambda x: x.crafting_table_name_id)
+        self.skills.sort(key=lambda x: x.name_id)
@@ -1,9 +1,9 @@
-from dataclasses import dataclass
 from decimal import Decimal
 from .item import Item
+from .slots import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Ingredient:
     item_name_id: str
     quantity: Decimal
@@ -23,7 +23,8 @@ class Ingredient:
                 self.quantity == other.quantity)
 
     def __hash__(self):
-        return hash((self.item_name_id, self.quantity, self.reducible))
+        # Equivalent name IDs compare equal, so they must hash alike
+        return hash((Item.canonical_name_id(self.item_name_id), self.quantity, self.reducible))
 
     def to_dict(self):
         return {
@@ -31,3 +32,13 @@ class Ingredient:
             'quantity': float(self.quantity),
             'reducible': self.reducible
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Ingredient':
+        return cls(
+            item_name_id=data['item'],
+            # Through str, so 0.5 becomes Decimal('0.5') and not its binary expansion
+            quantity=Decimal(str(data['quantity'])),
+            reducible=data.get('reducible', False),
+            tag=data.get('tag', False)
+        )
@@ -1,8 +1,51 @@
-from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import ClassVar, Dict, Iterable, Tuple
+from .slots import slotted_dataclass
 
+EQUIVALENT_ITEM_NAME_IDS = (
+    ("WoodBoard", "BoardItem"),
+    ("Oil", "OilItem"),
+    ("AshlarStone", "AshlarBasaltItem"),
+    ("AshlarStone", "AshlarGneissItem"),
+    ("AshlarStone", "AshlarGraniteItem"),
+    ("AshlarStone", "AshlarLimestoneItem"),
+    ("AshlarStone", "AshlarSandstoneItem"),
+    ("AshlarStone", "AshlarShaleItem"),
+    ("HewnLog", "HewnLogItem"),
+    ("CompositeLumber", "CompositeLumberItem"),
+    ("Lumber", "LumberItem")
+)
 
-@dataclass
+
+def build_canonical_name_ids(pairs: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """Map every name ID in pairs to one canonical ID per group of equivalent IDs.
+
+    Equivalence is transitive, so pairs sharing an ID form one group. The canonical
+    ID of a group is the first ID of it that appears in pairs.
+    """
+    parents: Dict[str, str] = {}
+
+    def find(name_id: str) -> str:
+        root = parents.setdefault(name_id, name_id)
+        while root != parents[root]:
+            root = parents[root]
+        while name_id != root:
+            parents[name_id], name_id = root, parents[name_id]
+        return root
+
+    order: Dict[str, int] = {}
+    for left, right in pairs:
+        order.setdefault(left, len(order))
+        order.setdefault(right, len(order))
+        left_root, right_root = find(left), find(right)
+        if left_root != right_root:
+            if order[right_root] < order[left_root]:
+                left_root, right_root = right_root, left_root
+            parents[right_root] = left_root
+
+    return {name_id: find(name_id) for name_id in parents if find(name_id) != name_id}
+
+
+@slotted_dataclass
 class Item:
     name: str
     item_name_id: str
@@ -10,45 +53,29 @@ class Item:
     image_file: str = "UI_Icons_06.png"
     x_pos: int = 0
     y_pos: int = 0
+    # Tags the item carries (e.g. Wood), which tag ingredients accept; not part of to_dict()
+    tags: Tuple[str, ...] = ()
 
-    EQUIVALENT_ITEM_NAME_IDS: List[Tuple[str, str]] = field(default_factory=lambda: [
-        ("WoodBoard", "BoardItem"),
-        ("Oil", "OilItem"),
-        ("AshlarStone", "AshlarBasaltItem"),
-        ("AshlarStone", "AshlarGneissItem"),
-        ("AshlarStone", "AshlarGraniteItem"),
-        ("AshlarStone", "AshlarLimestoneItem"),
-        ("AshlarStone", "AshlarSandstoneItem"),
-        ("AshlarStone", "AshlarShaleItem"),
-        ("HewnLog", "HewnLogItem"),
-        ("CompositeLumber", "CompositeLumberItem"),
-        ("Lumber", "LumberItem")
-    ], repr=False, compare=False, hash=False)
+    EQUIVALENT_ITEM_NAME_IDS: ClassVar[Tuple[Tuple[str, str], ...]] = EQUIVALENT_ITEM_NAME_IDS
+    # Name ID -> canonical name ID, only for IDs that have equivalents
+    CANONICAL_NAME_IDS: ClassVar[Dict[str, str]] = build_canonical_name_ids(EQUIVALENT_ITEM_NAME_IDS)
 
-    @staticmethod
-    def name_ids_match(item_name_id: str, other_item_name_id: str) -> bool:
-        if item_name_id == other_item_name_id:
-            return True
-
-        equivalent_ids = [
-            ("WoodBoard", "BoardItem"),
-            ("Oil", "OilItem"),
-            ("AshlarStone", "AshlarBasaltItem"),
-            ("AshlarStone", "AshlarGneissItem"),
-            ("AshlarStone", "AshlarGraniteItem"),
-            ("AshlarStone", "AshlarLimestoneItem"),
-            ("AshlarStone", "AshlarSandstoneItem"),
-            ("AshlarStone", "AshlarShaleItem"),
-            ("HewnLog", "HewnLogItem"),
-            ("CompositeLumber", "CompositeLumberItem"),
-            ("Lumber", "LumberItem")
-        ]
-
-        for left, right in equivalent_ids:
-            if (left == item_name_id and right == other_item_name_id) or \
-               (right == item_name_id and left == other_item_name_id):
-                return True
-        return False
+    @classmethod
+    def add_equivalent_name_ids(cls, pairs: Iterable[Tuple[str, str]]):
+        """Register extra equivalent name IDs, e.g. aliases used by a mod."""
+        pairs = tuple(dict.fromkeys(pair for pair in pairs if pair not in cls.EQUIVALENT_ITEM_NAME_IDS))
+        if pairs:
+            cls.EQUIVALENT_ITEM_NAME_IDS = cls.EQUIVALENT_ITEM_NAME_IDS + pairs
+            cls.CANONICAL_NAME_IDS = build_canonical_name_ids(cls.EQUIVALENT_ITEM_NAME_IDS)
+
+    @classmethod
+    def canonical_name_id(cls, item_name_id: str) -> str:
+        return cls.CANONICAL_NAME_IDS.get(item_name_id, item_name_id)
+
+    @classmethod
+    def name_ids_match(cls, item_name_id: str, other_item_name_id: str) -> bool:
+        return item_name_id == other_item_name_id or \
+            cls.canonical_name_id(item_name_id) == cls.canonical_name_id(other_item_name_id)
 
     @staticmethod
     def items_are_equal(old_item: 'Item', new_item: 'Item') -> bool:
@@ -63,3 +90,15 @@ class Item:
             'xPos': self.x_pos,
             'yPos': self.y_pos
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Item':
+        return cls(
+            name=data['name'],
+            item_name_id=data['nameID'],
+            tag=data.get('tag', False),
+            image_file=data.get('imageFile', "UI_Icons_06.png"),
+            x_pos=data.get('xPos', 0),
+            y_pos=data.get('yPos', 0),
+            tags=tuple(data.get('tags', ()))
+        )
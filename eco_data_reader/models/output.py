@@ -1,9 +1,9 @@
-from dataclasses import dataclass
 from decimal import Decimal
 from .item import Item
+from .slots import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Output:
     item_name_id: str
     quantity: Decimal
@@ -24,7 +24,8 @@ class Output:
                 self.quantity == other.quantity)
 
     def __hash__(self):
-        return hash((self.item_name_id, self.quantity, self.reducible, self.primary))
+        # Equivalent name IDs compare equal, so they must hash alike
+        return hash((Item.canonical_name_id(self.item_name_id), self.quantity, self.reducible, self.primary))
 
     def to_dict(self):
         return {
@@ -33,3 +34,12 @@ class Output:
             'reducible': self.reducible,
             'primary': self.primary
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Output':
+        return cls(
+            item_name_id=data['item'],
+            quantity=Decimal(str(data['quantity'])),
+            reducible=data.get('reducible', False),
+            primary=data.get('primary', False)
+        )
@@ -1,13 +1,15 @@
-from dataclasses import dataclass, field
+from collections import Counter
+from dataclasses import field
 from typing import List
 import logging
 from .ingredient import Ingredient
 from .output import Output
+from .slots import slotted_dataclass
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@slotted_dataclass
 class Recipe:
     name: str
     name_id: str
@@ -33,40 +35,48 @@ class Recipe:
 
     @staticmethod
     def recipes_are_equal(old_recipe: 'Recipe', new_recipe: 'Recipe') -> bool:
-        if old_recipe == new_recipe:
-            return False
+        """Return whether the recipes match, logging every property that differs."""
+        equal = True
 
         if old_recipe.name != new_recipe.name:
+            equal = False
             Recipe._log_diff("name", old_recipe.name, new_recipe.name, new_recipe.name)
 
         if old_recipe.skill_name_id != new_recipe.skill_name_id:
+            equal = False
             Recipe._log_diff("skill", old_recipe.skill_name_id, new_recipe.skill_name_id, new_recipe.name)
 
         if old_recipe.level != new_recipe.level:
+            equal = False
             Recipe._log_diff("level", old_recipe.level, new_recipe.level, new_recipe.name)
 
         if old_recipe.labor != new_recipe.labor:
+            equal = False
             Recipe._log_diff("labor", old_recipe.labor, new_recipe.labor, new_recipe.name)
 
         if old_recipe.crafting_table_name_id != new_recipe.crafting_table_name_id:
+            equal = False
             Recipe._log_diff("craftingTable", old_recipe.crafting_table_name_id,
                            new_recipe.crafting_table_name_id, new_recipe.name)
 
-        old_ingredients = sorted(old_recipe.ingredients, key=lambda i: i.item_name_id)
-        new_ingredients = sorted(new_recipe.ingredients, key=lambda i: i.item_name_id)
-        if old_ingredients != new_ingredients:
+        # Multiset comparison; equivalent name IDs hash alike, so the order does not matter
+        if Counter(old_recipe.ingredients) != Counter(new_recipe.ingredients):
+            old_ingredients = sorted(old_recipe.ingredients, key=lambda i: i.item_name_id)
+            new_ingredients = sorted(new_recipe.ingredients, key=lambda i: i.item_name_id)
             old_ing_strings = [ing.to_readable_string() for ing in old_ingredients]
             new_ing_strings = [ing.to_readable_string() for ing in new_ingredients]
+            equal = False
             Recipe._log_diff("ingredients", old_ing_strings, new_ing_strings, new_recipe.name)
 
-        old_outputs = sorted(old_recipe.outputs, key=lambda o: o.item_name_id)
-        new_outputs = sorted(new_recipe.outputs, key=lambda o: o.item_name_id)
-        if old_outputs != new_outputs:
+        if Counter(old_recipe.outputs) != Counter(new_recipe.outputs):
+            old_outputs = sorted(old_recipe.outputs, key=lambda o: o.item_name_id)
+            new_outputs = sorted(new_recipe.outputs, key=lambda o: o.item_name_id)
             old_out_strings = [out.to_readable_string() for out in old_outputs]
             new_out_strings = [out.to_readable_string() for out in new_outputs]
+            equal = False
             Recipe._log_diff("outputs", old_out_strings, new_out_strings, new_recipe.name)
 
-        return True
+        return equal
 
     @staticmethod
     def _log_diff(prop_name: str, old, newer, recipe_name: str):
@@ -84,3 +94,17 @@ class Recipe:
             'ingredients': [ing.to_dict() for ing in self.ingredients],
             'outputs': [out.to_dict() for out in self.outputs]
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Recipe':
+        return cls(
+            name=data['name'],
+            name_id=data['nameID'],
+            skill_name_id=data['skill'],
+            level=data['level'],
+            labor=data['labor'],
+            crafting_table_name_id=data['craftingTable'],
+            ingredients=[Ingredient.from_dict(ing) for ing in data.get('ingredients', [])],
+            outputs=[Output.from_dict(out) for out in data.get('outputs', [])],
+            hidden=data.get('hidden', False)
+        )
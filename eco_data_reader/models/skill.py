@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from .slots import slotted_dataclass
 
 
-@dataclass
+@slotted_dataclass
 class Skill:
     name: str
     name_id: str
@@ -11,3 +11,7 @@ class Skill:
             'name': self.name,
             'nameID': self.name_id
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Skill':
+        return cls(name=data['name'], name_id=data['nameID'])
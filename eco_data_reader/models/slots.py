@@ -0,0 +1,23 @@
+from dataclasses import dataclass, fields
+
+
+def slotted_dataclass(cls=None, **kwargs):
+    """dataclass() that also gives the class __slots__, so instances carry no __dict__.
+
+    Equivalent to dataclass(slots=True), which needs Python 3.10.
+    """
+    def wrap(cls):
+        cls = dataclass(cls, **kwargs)
+        field_names = tuple(f.name for f in fields(cls))
+
+        # Rebuild the class: default values cannot stay class attributes next to same-named slots
+        namespace = dict(cls.__dict__)
+        for name in field_names + ('__dict__', '__weakref__'):
+            namespace.pop(name, None)
+        namespace['__slots__'] = field_names
+
+        slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+        slotted_cls.__qualname__ = cls.__qualname__
+        return slotted_cls
+
+    return wrap if cls is None else wrap(cls)
@@ -0,0 +1,125 @@
+import cProfile
+import heapq
+import io
+import json
+import logging
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FileTimings(NamedTuple):
+    read_seconds: float
+    # Extractor name -> (seconds, whether it found something)
+    extractors: Dict[str, Tuple[float, bool]]
+
+
+class ScanProfiler:
+    """Collects wall time per phase and per folder, the slowest files and extractor hit counts.
+
+    Pass one to EcoServerFileService and the main.py pipeline to get a JSON report of
+    where a run spends its time. Without a profiler none of this is recorded.
+    """
+
+    def __init__(self, slowest_file_count: int = 20, capture_cprofile: bool = False):
+        self.slowest_file_count = slowest_file_count
+        self.phases: List[Dict] = []
+        self.folders: Dict[str, Dict[str, float]] = {}
+        self.extractors: Dict[str, Dict[str, float]] = {}
+        # Min-heap of (total seconds, path, folder, read seconds, parse seconds)
+        self._slowest_files: List[Tuple[float, str, str, float, float]] = []
+        self._cprofile = cProfile.Profile() if capture_cprofile else None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({'name': name, 'seconds': time.perf_counter() - start})
+
+    def start_cprofile(self):
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop_cprofile(self):
+        if self._cprofile:
+            self._cprofile.disable()
+
+    def record_enumeration(self, folder: str, seconds: float, file_count: int):
+        stats = self._folder_stats(folder)
+        stats['enumerateSeconds'] += seconds
+        stats['files'] += file_count
+
+    def record_file(self, folder: str, file_path: str, timings: FileTimings):
+        parse_seconds = sum(seconds for seconds, _ in timings.extractors.values())
+        stats = self._folder_stats(folder)
+        stats['readSeconds'] += timings.read_seconds
+        stats['parseSeconds'] += parse_seconds
+
+        for name, (seconds, hit) in timings.extractors.items():
+            extractor = self.extractors.setdefault(name, {'hits': 0, 'misses': 0, 'seconds': 0.0})
+            extractor['hits' if hit else 'misses'] += 1
+            extractor['seconds'] += seconds
+
+        entry = (timings.read_seconds + parse_seconds, file_path, folder, timings.read_seconds, parse_seconds)
+        if len(self._slowest_files) < self.slowest_file_count:
+            heapq.heappush(self._slowest_files, entry)
+        else:
+            heapq.heappushpop(self._slowest_files, entry)
+
+    def report(self) -> Dict:
+        return {
+            'totalSeconds': time.perf_counter() - self._started,
+            'phases': self.phases,
+            'folders': self.folders,
+            'extractors': self.extractors,
+            'slowestFiles': [
+                {'path': path, 'folder': folder, 'readSeconds': read_seconds, 'parseSeconds': parse_seconds}
+                for _, path, folder, read_seconds, parse_seconds in sorted(self._slowest_files, reverse=True)
+            ],
+        }
+
+    def write_report(self, output_dir: Path) -> Path:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        report = self.report()
+        if self._cprofile:
+            profile_file = output_dir / "profile.prof"
+            self._cprofile.dump_stats(str(profile_file))
+            stats_text = io.StringIO()
+            pstats.Stats(self._cprofile, stream=stats_text).sort_stats('cumulative').print_stats(30)
+            report['cprofile'] = {'file': profile_file.name, 'top': stats_text.getvalue()}
+
+        report_file = output_dir / "profile-report.json"
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Wrote profiling report to: {report_file}")
+        return report_file
+
+    def _folder_stats(self, folder: str) -> Dict[str, float]:
+        return self.folders.setdefault(folder, {
+            'files': 0, 'enumerateSeconds': 0.0, 'readSeconds': 0.0, 'parseSeconds': 0.0
+        })
+
+
+def profile_phase(profiler: Optional[ScanProfiler], name: str):
+    """profiler.phase(name), or a no-op context when there is no profiler."""
+    return profiler.phase(name) if profiler else nullcontext()
+
+
+def run_timed_extractor(name: str, timings: Optional[Dict[str, Tuple[float, bool]]], extractor, *args):
+    """Call an extractor, recording its time and whether it found something when timings is given."""
+    if timings is None:
+        return extractor(*args)
+
+    start = time.perf_counter()
+    result = extractor(*args)
+    timings[name] = (time.perf_counter() - start, result is not None)
+    return result
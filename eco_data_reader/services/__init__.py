@@ -1,3 +1,13 @@
-from .eco_server_file_service import EcoServerFileService
+from .eco_server_file_service import EcoServerFileService, ScannedFile
+from .parse_cache import ParseCache
+from .incremental_scanner import IncrementalScanner, ScanChanges
+from .reference_names import ReferenceNames
+from .crafting_tool_data import CraftingToolDataService
+from .localization import LocalizationService
+from .server_archive import ServerArchive
+from .snapshot_store import SnapshotStore
+from .query_server import QueryServer
 
-__all__ = ['EcoServerFileService']
+__all__ = ['EcoServerFileService', 'ScannedFile', 'ParseCache', 'IncrementalScanner', 'ScanChanges', 'ReferenceNames',
+           'CraftingToolDataService', 'LocalizationService', 'ServerArchive', 'SnapshotStore',
+           'QueryServer']
@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models import Item, Recipe
+from ..utils import TypeScriptReader
+from .parse_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the reader or the model classes change what a file loads into
+CRAFTING_TOOL_CACHE_VERSION = 3
+
+DATA_FILE_SUFFIX = ".ts"
+DATA_KINDS = ("item", "recipe")
+
+# How much of a lone data file is read to tell whether it holds items or recipes
+KIND_DETECTION_SIZE = 1 << 16
+DECLARATION_PATTERN = re.compile(r"\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)")
+
+
+class CraftingToolDataService:
+    """Loads the items and recipes of an EcoCraftingTool checkout into models.
+
+    eco_crafting_tool_path is a data folder (every .ts file whose name contains
+    "item" or "recipe" is read) or a single data file, which is read as items or
+    recipes by its name or else by its content. The models of each file are cached
+    by kind, size and mtime in cache_dir, so unchanged files are not parsed again.
+    """
+
+    def __init__(self, eco_crafting_tool_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.path = Path(eco_crafting_tool_path)
+        self.cache_file = None
+        if cache_dir:
+            path_key = hashlib.sha1(str(eco_crafting_tool_path).encode('utf-8')).hexdigest()[:16]
+            self.cache_file = Path(cache_dir) / f"crafting-tool-{path_key}.pickle"
+        # (kind, file path) -> (size, mtime_ns, models)
+        self._entries: Dict[Tuple[str, str], Tuple[int, int, list]] = self._load_cache()
+        self._changed = False
+
+    def get_items(self) -> List[Item]:
+        return self._get_models("item", Item.from_dict)
+
+    def get_recipes(self) -> List[Recipe]:
+        return self._get_models("recipe", Recipe.from_dict)
+
+    def _get_models(self, kind: str, from_dict: Callable[[dict], object]) -> list:
+        models = []
+        for file_path in self._data_files(kind):
+            models.extend(self._get_file_models(kind, file_path, from_dict))
+        self._save_cache()
+        return models
+
+    def _data_files(self, kind: str) -> List[Path]:
+        if self.path.is_file():
+            return [self.path] if self._file_kind(self.path) == kind else []
+        if not self.path.is_dir():
+            logger.warning(f"EcoCraftingTool path {self.path} does not exist")
+            return []
+        return [file_path for file_path in sorted(self.path.iterdir())
+                if kind in file_path.name.lower() and file_path.suffix == DATA_FILE_SUFFIX]
+
+    @staticmethod
+    def _file_kind(file_path: Path) -> Optional[str]:
+        """Whether a data file holds items or recipes: by its name, else by the name of the
+        variable it declares, else by whether its entries have ingredients."""
+        for kind in DATA_KINDS:
+            if kind in file_path.name.lower():
+                return kind
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                head = f.read(KIND_DETECTION_SIZE)
+        except OSError as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return None
+        for variable in DECLARATION_PATTERN.findall(head):
+            for kind in DATA_KINDS:
+                if kind in variable.lower():
+                    return kind
+        return "recipe" if "ingredients" in head else "item"
+
+    def _get_file_models(self, kind: str, file_path: Path, from_dict: Callable[[dict], object]) -> list:
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return []
+
+        key = (kind, str(file_path))
+        entry = self._entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+
+        models = self._read_file(file_path, from_dict)
+        self._entries[key] = (stat.st_size, stat.st_mtime_ns, models)
+        self._changed = True
+        return models
+
+    @staticmethod
+    def _read_file(file_path: Path, from_dict: Callable[[dict], object]) -> list:
+        models = []
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for index, data in enumerate(TypeScriptReader(f).iter_array()):
+                    try:
+                        models.append(from_dict(data))
+                    except (KeyError, TypeError, AttributeError) as e:
+                        logger.warning(f"Skipping entry {index} of {file_path}: missing or invalid {e}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading EcoCraftingTool data {file_path}: {e}")
+        logger.info(f"Loaded {len(models)} entries from {file_path}")
+        return models
+
+    def _load_cache(self) -> Dict[Tuple[str, str], Tuple[int, int, list]]:
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable EcoCraftingTool cache {self.cache_file}: {e}")
+            return {}
+
+        if data.get('version') != CRAFTING_TOOL_CACHE_VERSION:
+            return {}
+        return data['entries']
+
+    def _save_cache(self):
+        if self.cache_file is None or not self._changed:
+            return
+
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_suffix(".tmp")
+            with open(temp_file, 'wb') as f:
+                pickle.dump({'version': CRAFTING_TOOL_CACHE_VERSION, 'entries': self._entries}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, self.cache_file)
+            self._changed = False
+        except Exception as e:
+            logger.error(f"Error writing EcoCraftingTool cache {self.cache_file}: {e}")
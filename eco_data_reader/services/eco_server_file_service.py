@@ -1,17 +1,156 @@
+import codecs
+import mmap
 import os
+import queue
 import re
+import sys
+import threading
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from decimal import Decimal
-from typing import List, Optional
-from ..models import Item, Recipe, Ingredient, Output, CraftingTable, Skill
+from typing import Iterator, List, NamedTuple, Optional, Pattern, Tuple, Union
+from ..models import Item, Recipe, Ingredient, Output, CraftingTable, Skill, EcoDataset, ParsedFile
+from .parse_cache import ParseCache
+from .server_archive import MemberStat, ServerArchive
+from ..profiling import FileTimings, ScanProfiler, profile_phase, run_timed_extractor
 
 logger = logging.getLogger(__name__)
 
+# Number of files sent to a worker process at a time when parsing in parallel
+DEFAULT_CHUNK_SIZE = 64
+
+# How .cs files are read: decoded in full (text) or memory mapped and matched as bytes (mmap)
+READ_MODE_TEXT = "text"
+READ_MODE_MMAP = "mmap"
+READ_MODES = (READ_MODE_TEXT, READ_MODE_MMAP)
+
+# Smaller files are read instead of mapped; setting up a mapping costs more than copying a page
+MMAP_MIN_SIZE = mmap.PAGESIZE
+# How often a prefetch thread waiting on a full queue checks whether iteration was stopped
+PREFETCH_POLL_SECONDS = 0.1
+
+# Marks the end of the files read by a prefetch thread
+_END_OF_FILES = object()
+
+# Bytes of a mapping copied at a time to check that it is ASCII
+ASCII_CHECK_CHUNK_SIZE = 1 << 16
+
+# Substrings an extractor needs to find anything; checking them first is much cheaper
+# than letting every pattern scan files that cannot match
+ITEM_MARKER = 'LocDisplayName("'
+RECIPE_MARKER = 'recipe.Init('
+CRAFTING_TABLE_MARKER = 'RequireComponent(typeof(CraftingComponent'
+SKILL_MARKER = 'Tag("Specialty")'
+TAG_MARKER = 'Tag("'
+
+TAG_DEFINITION_PATTERN = re.compile(r'new TagDefinition\("([\w\s]+)"')
+CAMEL_CASE_WORD_PATTERN = re.compile('([A-Z][a-z]+)')
+CAPITALS_PATTERN = re.compile('([A-Z]+)')
+
+ITEM_NAME_PATTERN = re.compile(r'LocDisplayName\("([\w\s]+)"')
+ITEM_NAME_ID_PATTERN = re.compile(r'public partial class (\w+Item)')
+# No leading \b: it keeps re from searching for the literal prefix, which makes the pattern
+# about 25 times slower. Whole words are checked with WORD_CHARACTER_PATTERN instead
+ITEM_TAG_PATTERN = re.compile(r'Tag\("([\w\s]+)"')
+WORD_CHARACTER_PATTERN = re.compile(r'\w')
+
+RECIPE_NAME_PATTERN = re.compile(r'displayName:\s*Localizer\.DoStr\("([\w\s]+)"\)')
+RECIPE_NAME_ID_PATTERN = re.compile(r'recipe\.Init\(\n*\s*name:\s*"(\w+)"')
+RECIPE_INGREDIENT_PATTERN = re.compile(r'new IngredientElement\(typeof\( *(\w+)\), (\d+(?:\.\d+)?)f?, *(\w+)')
+RECIPE_TAG_INGREDIENT_PATTERN = re.compile(r'new IngredientElement\("([\w\s]+)", *(\d+), *(\w+)')
+RECIPE_OUTPUT_PATTERN = re.compile(r'new CraftingElement<(\w+)>\((\d*\.?\d*)f?\)')
+RECIPE_SECONDARY_OUTPUT_PATTERN = re.compile(r'new CraftingElement<(\w+)>\(typeof\(\w+\), (\d+)(,?)')
+RECIPE_SKILL_LEVEL_PATTERN = re.compile(r'\[RequiresSkill\(typeof\((\w+)\), (\d)')
+RECIPE_LABOR_PATTERN = re.compile(r'CreateLaborInCaloriesValue\((\d+)')
+RECIPE_CRAFTING_TABLE_PATTERN = re.compile(r'CraftingComponent\.AddRecipe\(tableType:\s*typeof\((\w+)\)')
+
+SKILL_NAME_ID_PATTERN = re.compile(r'public partial class (\w+Skill) : Skill')
+
+CRAFTING_TABLE_NAME_PATTERN = re.compile(r'DisplayName\s+=>\s+Localizer\.DoStr\("([\w\s]+)"\)')
+CRAFTING_TABLE_NAME_ID_PATTERN = re.compile(r'public partial class (\w+Object)')
+CRAFTING_TABLE_UPGRADE_MODULE_PATTERN = re.compile(r'AllowPluginModules\(Tags = new\[] \{ "(\w+)')
+
+# The attributes of a class declaration are the lines starting with this right above it
+ATTRIBUTE_LINE_START = '['
+
+# How the result of a scanned file differs from its cache entry, see ScannedFile
+FILE_ADDED = "added"
+FILE_MODIFIED = "modified"
+
+# What the extractors run on: decoded text, or the raw bytes of a file or memory mapping
+Contents = Union[str, bytes, mmap.mmap]
+
+
+class ExtractorPatterns:
+    """The prefilter markers and compiled patterns the extractors use.
+
+    TEXT_PATTERNS matches decoded file contents. BYTES_PATTERNS has the same patterns
+    compiled for bytes, so they run directly on a memory mapped file; text() decodes
+    just the matched spans. Bytes patterns only match ASCII letters and spaces with
+    \\w and \\s, so they give the same results as the text patterns on ASCII files only.
+    """
+
+    def __init__(self, as_bytes: bool = False):
+        self.as_bytes = as_bytes
+        self.ITEM_MARKER = self._literal(ITEM_MARKER)
+        self.RECIPE_MARKER = self._literal(RECIPE_MARKER)
+        self.CRAFTING_TABLE_MARKER = self._literal(CRAFTING_TABLE_MARKER)
+        self.SKILL_MARKER = self._literal(SKILL_MARKER)
+        self.TAG_MARKER = self._literal(TAG_MARKER)
+        self.ATTRIBUTE_LINE_START = self._literal(ATTRIBUTE_LINE_START)
+        self.NEWLINE = self._literal('\n')
+
+        self.ITEM_NAME_PATTERN = self._pattern(ITEM_NAME_PATTERN)
+        self.ITEM_NAME_ID_PATTERN = self._pattern(ITEM_NAME_ID_PATTERN)
+        self.ITEM_TAG_PATTERN = self._pattern(ITEM_TAG_PATTERN)
+        self.WORD_CHARACTER_PATTERN = self._pattern(WORD_CHARACTER_PATTERN)
+        self.RECIPE_NAME_PATTERN = self._pattern(RECIPE_NAME_PATTERN)
+        self.RECIPE_NAME_ID_PATTERN = self._pattern(RECIPE_NAME_ID_PATTERN)
+        self.RECIPE_INGREDIENT_PATTERN = self._pattern(RECIPE_INGREDIENT_PATTERN)
+        self.RECIPE_TAG_INGREDIENT_PATTERN = self._pattern(RECIPE_TAG_INGREDIENT_PATTERN)
+        self.RECIPE_OUTPUT_PATTERN = self._pattern(RECIPE_OUTPUT_PATTERN)
+        self.RECIPE_SECONDARY_OUTPUT_PATTERN = self._pattern(RECIPE_SECONDARY_OUTPUT_PATTERN)
+        self.RECIPE_SKILL_LEVEL_PATTERN = self._pattern(RECIPE_SKILL_LEVEL_PATTERN)
+        self.RECIPE_LABOR_PATTERN = self._pattern(RECIPE_LABOR_PATTERN)
+        self.RECIPE_CRAFTING_TABLE_PATTERN = self._pattern(RECIPE_CRAFTING_TABLE_PATTERN)
+        self.SKILL_NAME_ID_PATTERN = self._pattern(SKILL_NAME_ID_PATTERN)
+        self.CRAFTING_TABLE_NAME_PATTERN = self._pattern(CRAFTING_TABLE_NAME_PATTERN)
+        self.CRAFTING_TABLE_NAME_ID_PATTERN = self._pattern(CRAFTING_TABLE_NAME_ID_PATTERN)
+        self.CRAFTING_TABLE_UPGRADE_MODULE_PATTERN = self._pattern(CRAFTING_TABLE_UPGRADE_MODULE_PATTERN)
+
+    def _literal(self, value: str) -> Union[str, bytes]:
+        return value.encode('ascii') if self.as_bytes else value
+
+    def _pattern(self, pattern: Pattern) -> Pattern:
+        return re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE) if self.as_bytes else pattern
+
+    def text(self, value: Union[str, bytes]) -> str:
+        if not self.as_bytes:
+            return value
+        text = value.decode('utf-8')
+        # Same newlines as a decoded file
+        return text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in text else text
+
+
+TEXT_PATTERNS = ExtractorPatterns()
+BYTES_PATTERNS = ExtractorPatterns(as_bytes=True)
+
+
+class ScannedFile(NamedTuple):
+    """The parse result of one file in EcoServerFileService.scan_files()."""
+    folder: str
+    file_path: str
+    parsed: Optional[ParsedFile]
+    # None when the cached result was still valid, FILE_ADDED when the file had no cache
+    # entry (always without a cache) and FILE_MODIFIED when its content changed
+    change: Optional[str]
+
 
 class EcoServerFileService:
-    ITEMS_LOCATION = "AutoGen\\"
-    TAGS_LOCATION = "Systems\\TagDefinitions.cs"
+    ITEMS_LOCATION = "AutoGen"
+    TAGS_LOCATION = "Systems/TagDefinitions.cs"
 
     ITEM_FOLDERS = ["Block", "Clothing", "Fertilizer", "Food", "Item",
                     "PluginModule", "Seed", "Tool", "Vehicle", "WorldObject"]
@@ -22,59 +161,176 @@ class EcoServerFileService:
     CRAFTING_TABLE_FOLDERS = ["WorldObject"]
     SKILL_FOLDERS = ["Tech"]
 
-    def __init__(self, eco_server_mods_core_path: str):
+    # Every folder read by scan_all(), each listed once
+    SCAN_FOLDERS = list(dict.fromkeys(ITEM_FOLDERS + RECIPE_FOLDERS + CRAFTING_TABLE_FOLDERS + SKILL_FOLDERS))
+
+    def __init__(self, eco_server_mods_core_path: str, profiler: Optional[ScanProfiler] = None,
+                 read_mode: str = READ_MODE_TEXT):
+        if read_mode not in READ_MODES:
+            raise ValueError(f"Unknown read mode '{read_mode}', expected one of {', '.join(READ_MODES)}")
         self.eco_server_path = eco_server_mods_core_path
+        # When set, scan_all() records phase, folder, file and extractor timings on it
+        self.profiler = profiler
+        # How scan_all() reads the .cs files, see READ_MODES
+        self.read_mode = read_mode
+        # Set when the server path is a .zip or .tar(.gz) of the server files instead of a folder
+        self.archive = ServerArchive.open(self.eco_server_path) if ServerArchive.is_archive(self.eco_server_path) \
+            else None
+
+    def scan_all(self, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 cache: Optional[ParseCache] = None) -> EcoDataset:
+        """Read every AutoGen .cs file once and run all extractors on it.
+
+        With workers > 1 (or 0 for one per CPU) the files are parsed in chunks on a
+        process pool. Results are merged in enumeration order, so the dataset is
+        identical to a serial scan. When a cache is given, files whose size and
+        mtime (or content digest) are unchanged are not parsed again.
+        """
+        scanned_files = self.scan_files(workers, chunk_size, cache)
+        if cache is not None:
+            logger.info(f"Parse cache: {cache.hits} hits, {cache.misses} misses")
+            with profile_phase(self.profiler, "cache save"):
+                cache.save()
+
+        with profile_phase(self.profiler, "merge"):
+            return EcoDataset.from_parsed_files(scanned.parsed for scanned in scanned_files if scanned.parsed)
+
+    def scan_files(self, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   cache: Optional[ParseCache] = None) -> List[ScannedFile]:
+        """Parse the AutoGen .cs files, reusing the cached results that are still valid.
+
+        Returns the readable files in enumeration order. The cache is updated: files
+        that cannot be read and files no longer on the server are evicted, but it is
+        not saved. See scan_all() for workers and chunk_size.
+        """
+        with profile_phase(self.profiler, "enumerate"):
+            cs_files = [(folder, str(file_path)) for folder, file_path in self._get_cs_files(self.SCAN_FOLDERS)]
+        scanned_files: List[Optional[ScannedFile]] = [None] * len(cs_files)
+
+        with profile_phase(self.profiler, "cache lookup"):
+            pending = self._get_pending_cs_files(cs_files, scanned_files, cache)
+
+        with profile_phase(self.profiler, "parse"):
+            results = self._parse_cs_files([(folder, file_path, known_digest)
+                                            for _, folder, file_path, _, known_digest in pending],
+                                           workers, chunk_size, profile=self.profiler is not None,
+                                           read_mode=self.read_mode, archive=self.archive,
+                                           with_digest=cache is not None)
+
+        for (index, folder, file_path, stat, known_digest), (digest, parsed, timings) in zip(pending, results):
+            if timings is not None:
+                self.profiler.record_file(folder, file_path, timings)
+            if digest is None and parsed is None:
+                if cache is not None:
+                    # Unreadable now, so an older result must not be used again
+                    cache.discard(file_path)
+                continue
 
-    def get_all_items(self) -> List[Item]:
-        items = []
+            change = FILE_ADDED if known_digest is None else FILE_MODIFIED
+            if cache is not None:
+                if parsed is None:
+                    # Content is unchanged even though the stat info is not
+                    parsed = cache.get(file_path).parsed
+                    change = None
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+                cache.put(file_path, stat, digest, parsed)
+            scanned_files[index] = ScannedFile(folder, file_path, parsed, change)
+
+        if cache is not None:
+            # Files no longer on the server
+            cache.evict_unseen()
+        return [scanned for scanned in scanned_files if scanned is not None]
+
+    def _get_pending_cs_files(self, cs_files: List[Tuple[str, str]], scanned_files: List[Optional[ScannedFile]],
+                              cache: Optional[ParseCache]) -> list:
+        """Fill scanned_files from the cache and return the files that still need parsing."""
+        # (index, folder, path, stat, digest of the cached entry)
+        pending = []
+        for index, (folder, file_path) in enumerate(cs_files):
+            if cache is None:
+                pending.append((index, folder, file_path, None, None))
+                continue
 
-        for folder in self.ITEM_FOLDERS:
-            folder_path = Path(self.eco_server_path) / self.ITEMS_LOCATION / folder
-            if not folder_path.exists():
+            entry = cache.get(file_path)
+            try:
+                stat = self._stat_cs_file(file_path)
+            except OSError as e:
+                logger.error(f"Error reading file {file_path}: {e}")
+                cache.discard(file_path)
                 continue
 
-            for file_path in folder_path.glob("*.cs"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_contents = f.read()
-
-                    name = self._get_name_from_cs_file_contents(file_contents)
-                    if name:
-                        item_name_id = self._get_item_name_id_from_cs_file_contents(file_contents)
-                        items.append(Item(
-                            name=name,
-                            item_name_id=item_name_id,
-                            image_file="UI_Icons_06.png",
-                            x_pos=0,
-                            y_pos=0
-                        ))
-                except Exception as e:
-                    logger.error(f"Error reading file {file_path}: {e}")
+            if entry and entry.matches_stat(stat):
+                scanned_files[index] = ScannedFile(folder, file_path, entry.parsed, None)
+                cache.hits += 1
+            else:
+                pending.append((index, folder, file_path, stat, entry.digest if entry else None))
+        return pending
+
+    @staticmethod
+    def _parse_cs_files(cs_files: List[Tuple[str, str, Optional[str]]], workers: int, chunk_size: int,
+                        profile: bool = False, read_mode: str = READ_MODE_TEXT,
+                        archive: Optional[ServerArchive] = None, with_digest: bool = False
+                        ) -> List[Tuple[Optional[str], Optional[ParsedFile], Optional[FileTimings]]]:
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        if workers == 1 or len(cs_files) <= chunk_size:
+            return _parse_cs_file_chunk(cs_files, profile, read_mode, archive, with_digest)
+
+        chunks = [cs_files[i:i + chunk_size] for i in range(0, len(cs_files), chunk_size)]
+        logger.info(f"Parsing {len(cs_files)} files in {len(chunks)} chunks on {workers} processes")
+        # An archive is pickled by path and indexed once per worker process; the contents of
+        # a compressed tar are already in memory, so each chunk is sent only its own files
+        in_memory = archive is not None and archive.in_memory
+        archives = [archive.subset(file_path for _, file_path, _ in chunk) if in_memory else archive
+                    for chunk in chunks]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = executor.map(_parse_cs_file_chunk, chunks, [profile] * len(chunks),
+                                         [read_mode] * len(chunks), archives, [with_digest] * len(chunks))
+            results = [result for results_of_chunk in chunk_results for result in results_of_chunk]
+
+        # Unpickling gives every chunk its own copies of the name ID strings
+        for _, parsed, _ in results:
+            if parsed:
+                parsed.intern_name_ids()
+        return results
 
+    def get_all_items(self) -> List[Item]:
+        items = list(self.iter_items())
         items.sort(key=lambda x: x.item_name_id)
         return items
 
+    def iter_items(self, prefetch: int = 0) -> Iterator[Item]:
+        """Yield the items of the item folders as their files are parsed, in file order.
+
+        With prefetch > 0 a background thread reads up to that many files ahead.
+        """
+        for file_path, file_contents in self._iter_cs_file_contents(self.ITEM_FOLDERS, prefetch):
+            item = self._get_item_from_cs_file_contents(file_contents)
+            if item:
+                yield item
+
     def get_all_tags(self) -> List[Item]:
         tags = []
 
         try:
             tags_file = Path(self.eco_server_path) / self.TAGS_LOCATION
-            with open(tags_file, 'r', encoding='utf-8') as f:
-                file_contents = f.read()
+            file_contents = self._read_cs_file(tags_file)
+            if file_contents is None:
+                return tags
 
             # Ignore hidden tags in tag definitions file
             hidden_index = file_contents.find("Hidden")
             if hidden_index != -1:
                 file_contents = file_contents[:hidden_index]
 
-            tag_regex = r'new TagDefinition\("([\w\s]+)"'
-            matches = re.finditer(tag_regex, file_contents)
+            matches = TAG_DEFINITION_PATTERN.finditer(file_contents)
 
             for match in matches:
                 tag_name = match.group(1)
                 tag_name = tag_name.replace(" ", "")
                 # Split by camel case
-                tag_name_spaced = re.sub('([A-Z][a-z]+)', r' \1', re.sub('([A-Z]+)', r' \1', tag_name)).strip()
+                tag_name_spaced = CAMEL_CASE_WORD_PATTERN.sub(r' \1', CAPITALS_PATTERN.sub(r' \1', tag_name)).strip()
                 tags.append(Item(
                     name=tag_name_spaced,
                     item_name_id=tag_name.replace(" ", ""),
@@ -87,46 +343,35 @@ class EcoServerFileService:
         return tags
 
     def get_all_recipes(self) -> List[Recipe]:
-        recipes = []
-
-        for folder in self.RECIPE_FOLDERS:
-            folder_path = Path(self.eco_server_path) / self.ITEMS_LOCATION / folder
-            if not folder_path.exists():
-                continue
-
-            for file_path in folder_path.glob("*.cs"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_contents = f.read()
-
-                    recipe = self._get_recipe_from_cs_file_contents(file_contents, file_path.name)
-                    if recipe:
-                        recipes.append(recipe)
-                except Exception as e:
-                    logger.error(f"Error reading file {file_path}: {e}")
-
+        recipes = list(self.iter_recipes())
         recipes.sort(key=lambda x: x.name_id)
         return recipes
 
+    def iter_recipes(self, prefetch: int = 0) -> Iterator[Recipe]:
+        """Yield the recipes of the recipe folders as their files are parsed, in file order.
+
+        With prefetch > 0 a background thread reads up to that many files ahead.
+        """
+        for file_path, file_contents in self._iter_cs_file_contents(self.RECIPE_FOLDERS, prefetch):
+            try:
+                recipe = self._get_recipe_from_cs_file_contents(file_contents, file_path.name)
+            except Exception as e:
+                logger.error(f"Error reading file {file_path}: {e}")
+                continue
+            if recipe:
+                yield recipe
+
     def get_all_crafting_tables(self) -> List[CraftingTable]:
         crafting_tables = []
 
-        for folder in self.CRAFTING_TABLE_FOLDERS:
-            folder_path = Path(self.eco_server_path) / self.ITEMS_LOCATION / folder
-            if not folder_path.exists():
+        for _, file_path in self._get_cs_files(self.CRAFTING_TABLE_FOLDERS):
+            file_contents = self._read_cs_file(file_path)
+            if file_contents is None:
                 continue
 
-            for file_path in folder_path.glob("*.cs"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_contents = f.read()
-
-                    crafting_table = self._get_crafting_table_from_cs_file_contents(
-                        file_contents, file_path.name)
-                    if crafting_table:
-                        crafting_tables.append(crafting_table)
-                except Exception as e:
-                    logger.error(f"Error reading file {file_path}: {e}")
+            crafting_table = self._get_crafting_table_from_cs_file_contents(file_contents, file_path.name)
+            if crafting_table:
+                crafting_tables.append(crafting_table)
 
         crafting_tables.sort(key=lambda x: x.crafting_table_name_id)
         return crafting_tables
@@ -134,52 +379,270 @@ class EcoServerFileService:
     def get_all_skills(self) -> List[Skill]:
         skills = []
 
-        for folder in self.SKILL_FOLDERS:
-            folder_path = Path(self.eco_server_path) / self.ITEMS_LOCATION / folder
-            if not folder_path.exists():
+        for _, file_path in self._get_cs_files(self.SKILL_FOLDERS):
+            file_contents = self._read_cs_file(file_path)
+            if file_contents is None:
                 continue
 
-            for file_path in folder_path.glob("*.cs"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_contents = f.read()
-
-                    skill = self._get_skill_from_cs_file_contents(file_contents, file_path.name)
-                    if skill:
-                        skills.append(skill)
-                except Exception as e:
-                    logger.error(f"Error reading file {file_path}: {e}")
+            skill = self._get_skill_from_cs_file_contents(file_contents, file_path.name)
+            if skill:
+                skills.append(skill)
 
         skills.sort(key=lambda x: x.name_id)
         return skills
 
+    def _iter_cs_file_contents(self, folders: List[str], prefetch: int = 0) -> Iterator[Tuple[Path, str]]:
+        """Yield the path and decoded contents of every readable .cs file in folders.
+
+        With prefetch > 0 the files are read on a background thread while the caller
+        parses. The queue holds at most prefetch files, so memory stays bounded.
+        """
+        if prefetch <= 0:
+            for _, file_path in self._get_cs_files(folders):
+                file_contents = self._read_cs_file(file_path)
+                if file_contents is not None:
+                    yield file_path, file_contents
+            return
+
+        files = queue.Queue(maxsize=prefetch)
+        stopped = threading.Event()
+
+        def put(entry) -> bool:
+            # Gives up once the consumer has stopped, instead of blocking on a full queue forever
+            while not stopped.is_set():
+                try:
+                    files.put(entry, timeout=PREFETCH_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read_files():
+            try:
+                for _, file_path in self._get_cs_files(folders):
+                    file_contents = self._read_cs_file(file_path)
+                    if file_contents is not None and not put((file_path, file_contents)):
+                        return
+                put(_END_OF_FILES)
+            except Exception as e:
+                put(e)
+
+        reader = threading.Thread(target=read_files, name="cs-file-prefetch", daemon=True)
+        reader.start()
+        try:
+            while True:
+                entry = files.get()
+                if entry is _END_OF_FILES:
+                    return
+                if isinstance(entry, Exception):
+                    raise entry
+                yield entry
+        finally:
+            # Also runs when the caller stops iterating early
+            stopped.set()
+            reader.join()
+
+    def _get_cs_files(self, folders: List[str]) -> Iterator[Tuple[str, Path]]:
+        if self.archive is not None:
+            # Picks up a replaced archive, e.g. between polls of an incremental scan
+            self.archive = ServerArchive.open(self.eco_server_path)
+        for folder in folders:
+            start = time.perf_counter()
+            if self.archive is not None:
+                file_paths = self.archive.list_files(f"{self.ITEMS_LOCATION}/{folder}", ".cs")
+                if not file_paths:
+                    continue
+            else:
+                folder_path = Path(self.eco_server_path) / self.ITEMS_LOCATION / folder
+                if not folder_path.exists():
+                    continue
+                file_paths = sorted(folder_path.glob("*.cs"))
+            if self.profiler:
+                self.profiler.record_enumeration(folder, time.perf_counter() - start, len(file_paths))
+
+            for file_path in file_paths:
+                yield folder, file_path
+
+    def _read_cs_file(self, file_path: Path) -> Optional[str]:
+        data = self._read_cs_file_bytes(file_path, self.archive)
+        return self._decode_cs_file(data, file_path) if data is not None else None
+
+    def _stat_cs_file(self, file_path: str) -> Union[os.stat_result, MemberStat]:
+        return self.archive.stat(file_path) if self.archive is not None else os.stat(file_path)
+
+    @staticmethod
+    def _read_cs_file_bytes(file_path: Path, archive: Optional[ServerArchive] = None) -> Optional[bytes]:
+        try:
+            if archive is not None:
+                return archive.read(file_path)
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def _decode_cs_file(data: bytes, file_path: Path) -> Optional[str]:
+        try:
+            # Same result as reading in text mode with universal newlines
+            return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except UnicodeDecodeError as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return None
+
     @staticmethod
-    def _get_recipe_from_cs_file_contents(contents: str, file_name: str) -> Optional[Recipe]:
+    def _map_cs_file(file_path: Path) -> Optional[Union[bytes, mmap.mmap]]:
+        """Memory map a file read-only, or read it when it is too small for mapping to pay off.
+
+        Empty files cannot be mapped and are always read.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                    return f.read()
+                # The mapping stays valid after the file is closed
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def _is_ascii(data: Union[bytes, mmap.mmap]) -> bool:
+        # A UTF-8 byte order mark is the only non-ASCII the bytes patterns can skip over
+        start = len(codecs.BOM_UTF8) if data[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+        if isinstance(data, bytes) and start == 0:
+            return data.isascii()
+        # Slices of a mapping are copies, so it is checked a bounded chunk at a time
+        return all(data[position:position + ASCII_CHECK_CHUNK_SIZE].isascii()
+                   for position in range(start, len(data), ASCII_CHECK_CHUNK_SIZE))
+
+    @classmethod
+    def _parse_cs_file(cls, folder: str, file_path: Path, known_digest: Optional[str] = None,
+                       profile: bool = False, read_mode: str = READ_MODE_TEXT,
+                       archive: Optional[ServerArchive] = None,
+                       with_digest: bool = False) -> Tuple[Optional[str], Optional[ParsedFile], Optional[FileTimings]]:
+        """Return the file's content digest, parse result and, when profiling, its timings.
+
+        The digest is only computed with_digest (to store it in a cache) or to compare
+        it with known_digest. The result is None when the digest equals known_digest,
+        and digest and result are both None when the file cannot be read. In mmap read mode the extractors
+        run on the mapped bytes and only matched spans are decoded; files with
+        non-ASCII content are decoded in full, since the bytes patterns only know
+        ASCII letters and spaces. Files in an archive are read into memory either way.
+        """
+        start = time.perf_counter()
+        extractor_timings = {} if profile else None
+
+        def timed(digest, parsed):
+            timings = FileTimings(read_seconds, extractor_timings) if profile else None
+            return digest, parsed, timings
+
+        if read_mode == READ_MODE_MMAP and archive is None:
+            data = cls._map_cs_file(file_path)
+        else:
+            data = cls._read_cs_file_bytes(file_path, archive)
+        read_seconds = time.perf_counter() - start
+        if data is None:
+            return timed(None, None)
+
+        try:
+            digest = None
+            if with_digest or known_digest is not None:
+                digest = ParseCache.compute_digest(data)
+                if digest == known_digest:
+                    return timed(digest, None)
+
+            if read_mode == READ_MODE_MMAP and cls._is_ascii(data):
+                file_contents, patterns = data, BYTES_PATTERNS
+            else:
+                # Slicing copies a mapping into bytes
+                file_contents = cls._decode_cs_file(data if isinstance(data, bytes) else data[:], file_path)
+                patterns = TEXT_PATTERNS
+            read_seconds = time.perf_counter() - start
+            if file_contents is None:
+                return timed(None, None)
+
+            try:
+                return timed(digest, cls._parse_cs_file_contents(folder, file_contents, file_path.name,
+                                                                 extractor_timings, patterns))
+            except Exception as e:
+                logger.error(f"Error parsing file {file_path}: {e}")
+                return timed(None, None)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    @classmethod
+    def _parse_cs_file_contents(cls, folder: str, contents: Contents, file_name: str,
+                                timings: Optional[dict] = None,
+                                patterns: 'ExtractorPatterns' = TEXT_PATTERNS) -> ParsedFile:
+        """Run the extractors of folder on decoded contents, or on bytes with patterns=BYTES_PATTERNS."""
+        parsed = ParsedFile()
+        if folder in cls.ITEM_FOLDERS:
+            parsed.item = run_timed_extractor('item', timings, cls._get_item_from_cs_file_contents,
+                                              contents, patterns)
+        if folder in cls.RECIPE_FOLDERS:
+            parsed.recipe = run_timed_extractor('recipe', timings, cls._get_recipe_from_cs_file_contents,
+                                                contents, file_name, patterns)
+        if folder in cls.CRAFTING_TABLE_FOLDERS:
+            parsed.crafting_table = run_timed_extractor('crafting_table', timings,
+                                                        cls._get_crafting_table_from_cs_file_contents,
+                                                        contents, file_name, patterns)
+        if folder in cls.SKILL_FOLDERS:
+            parsed.skill = run_timed_extractor('skill', timings, cls._get_skill_from_cs_file_contents,
+                                               contents, file_name, patterns)
+        return parsed
+
+    @classmethod
+    def _get_item_from_cs_file_contents(cls, contents: Contents,
+                                        patterns: ExtractorPatterns = TEXT_PATTERNS) -> Optional[Item]:
+        name = cls._get_name_from_cs_file_contents(contents, patterns)
+        if not name:
+            return None
+
+        item_name_id = None
+        tags = ()
+        match = patterns.ITEM_NAME_ID_PATTERN.search(contents)
+        if match:
+            item_name_id = sys.intern(patterns.text(match.group(1)))
+            tags = cls._get_item_tags_from_cs_file_contents(contents, match.start(), patterns)
+        return Item(
+            name=name,
+            item_name_id=item_name_id,
+            image_file="UI_Icons_06.png",
+            x_pos=0,
+            y_pos=0,
+            tags=tags
+        )
+
+    @staticmethod
+    def _get_recipe_from_cs_file_contents(contents: Contents, file_name: str,
+                                          patterns: ExtractorPatterns = TEXT_PATTERNS) -> Optional[Recipe]:
+        if contents.find(patterns.RECIPE_MARKER) == -1:
+            return None
+
         # Recipe display name (e.g. Butcher Bison)
-        recipe_name_regex = r'displayName:\s*Localizer\.DoStr\("([\w\s]+)"\)'
-        match = re.search(recipe_name_regex, contents)
+        match = patterns.RECIPE_NAME_PATTERN.search(contents)
         if not match:
             logger.warning(f"Could not find recipe name for file {file_name}")
             return None
-        recipe_name = match.group(1)
+        recipe_name = patterns.text(match.group(1))
 
         # Recipe name ID (e.g. ButcherBison)
-        recipe_name_id_regex = r'recipe.Init\(\n*\s*name:\s*"(\w+)"'
-        match = re.search(recipe_name_id_regex, contents)
+        match = patterns.RECIPE_NAME_ID_PATTERN.search(contents)
         if not match:
             logger.warning(f"Could not find recipe name ID for recipe {recipe_name}")
             return None
-        recipe_name_id = match.group(1)
+        recipe_name_id = sys.intern(patterns.text(match.group(1)))
 
         ingredients = []
 
         # Recipe ingredients - Specific items (non-tag)
-        recipe_ingredient_regex = r'new IngredientElement\(typeof\( *(\w+)\), (\d+(?:\.\d+)?)f?, *(\w+)'
-        matches = re.finditer(recipe_ingredient_regex, contents)
+        matches = patterns.RECIPE_INGREDIENT_PATTERN.finditer(contents)
         for match in matches:
-            ingredient_name_id = match.group(1)
-            quantity = Decimal(match.group(2))
-            reducible = match.group(3).lower() == "typeof"
+            ingredient_name_id = sys.intern(patterns.text(match.group(1)))
+            quantity = Decimal(patterns.text(match.group(2)))
+            reducible = patterns.text(match.group(3)).lower() == "typeof"
             ingredients.append(Ingredient(
                 item_name_id=ingredient_name_id,
                 quantity=quantity,
@@ -188,12 +651,11 @@ class EcoServerFileService:
             ))
 
         # Recipe ingredients - tags
-        tag_recipe_ingredients_regex = r'new IngredientElement\("([\w\s]+)", *(\d+), *(\w+)'
-        matches = re.finditer(tag_recipe_ingredients_regex, contents)
+        matches = patterns.RECIPE_TAG_INGREDIENT_PATTERN.finditer(contents)
         for match in matches:
-            tag_ingredient_name_id = match.group(1).replace(" ", "")
-            quantity = Decimal(match.group(2))
-            reducible = match.group(3).lower() == "typeof"
+            tag_ingredient_name_id = sys.intern(patterns.text(match.group(1)).replace(" ", ""))
+            quantity = Decimal(patterns.text(match.group(2)))
+            reducible = patterns.text(match.group(3)).lower() == "typeof"
             ingredients.append(Ingredient(
                 item_name_id=tag_ingredient_name_id,
                 quantity=quantity,
@@ -207,12 +669,11 @@ class EcoServerFileService:
         outputs = []
 
         # Recipe outputs
-        recipe_outputs_regex = r'new CraftingElement<(\w+)>\((\d*\.?\d*)f?\)'
-        matches = re.finditer(recipe_outputs_regex, contents)
+        matches = patterns.RECIPE_OUTPUT_PATTERN.finditer(contents)
         output_count = 0
         for match in matches:
-            output_item_name_id = match.group(1)
-            quantity_string = match.group(2)
+            output_item_name_id = sys.intern(patterns.text(match.group(1)))
+            quantity_string = patterns.text(match.group(2))
             quantity = Decimal(1) if not quantity_string else Decimal(quantity_string)
             output = Output(
                 item_name_id=output_item_name_id,
@@ -227,11 +688,10 @@ class EcoServerFileService:
             logger.warning(f"Could not find outputs for recipe {recipe_name}")
 
         # Recipe outputs - secondary (e.g. Tailings, Slag, Barrel)
-        recipe_outputs_waste_regex = r'new CraftingElement<(\w+)>\(typeof\(\w+\), (\d+)(,?)'
-        matches = re.finditer(recipe_outputs_waste_regex, contents)
+        matches = patterns.RECIPE_SECONDARY_OUTPUT_PATTERN.finditer(contents)
         for match in matches:
-            output_item_name_id = match.group(1)
-            quantity = Decimal(match.group(2))
+            output_item_name_id = sys.intern(patterns.text(match.group(1)))
+            quantity = Decimal(patterns.text(match.group(2)))
             reducible = bool(match.group(3)) or "Tailings" in output_item_name_id or "Slag" in output_item_name_id
             outputs.append(Output(
                 item_name_id=output_item_name_id,
@@ -240,30 +700,27 @@ class EcoServerFileService:
             ))
 
         # Skill and level
-        skill_level_regex = r'\[RequiresSkill\(typeof\((\w+)\), (\d)'
-        match = re.search(skill_level_regex, contents)
+        match = patterns.RECIPE_SKILL_LEVEL_PATTERN.search(contents)
         if match:
-            skill_name_id = match.group(1)
-            level = int(match.group(2))
+            skill_name_id = sys.intern(patterns.text(match.group(1)))
+            level = int(patterns.text(match.group(2)))
         else:
             logger.warning(f"Could not find skill and level for recipe {recipe_name}, assuming SelfImprovement")
             skill_name_id = "SelfImprovementSkill"
             level = 0
 
         # Labor cost
-        labor_regex = r'CreateLaborInCaloriesValue\((\d+)'
-        match = re.search(labor_regex, contents)
+        match = patterns.RECIPE_LABOR_PATTERN.search(contents)
         if match:
-            labor = int(match.group(1))
+            labor = int(patterns.text(match.group(1)))
         else:
             logger.warning(f"Could not find labor cost for recipe {recipe_name}")
             labor = 0
 
         # Crafting table
-        crafting_table_regex = r'CraftingComponent\.AddRecipe\(tableType:\s*typeof\((\w+)\)'
-        match = re.search(crafting_table_regex, contents)
+        match = patterns.RECIPE_CRAFTING_TABLE_PATTERN.search(contents)
         if match:
-            crafting_table_name_id = match.group(1)
+            crafting_table_name_id = sys.intern(patterns.text(match.group(1)))
         else:
             logger.warning(f"Could not find crafting table for recipe {recipe_name}")
             crafting_table_name_id = ""
@@ -280,62 +737,88 @@ class EcoServerFileService:
         )
 
     @staticmethod
-    def _get_name_from_cs_file_contents(contents: str) -> Optional[str]:
-        name_search_regex = r'LocDisplayName\("([\w\s]+)"'
-        match = re.search(name_search_regex, contents)
-        return match.group(1) if match else None
+    def _get_name_from_cs_file_contents(contents: Contents,
+                                        patterns: ExtractorPatterns = TEXT_PATTERNS) -> Optional[str]:
+        if contents.find(patterns.ITEM_MARKER) == -1:
+            return None
+        match = patterns.ITEM_NAME_PATTERN.search(contents)
+        return patterns.text(match.group(1)) if match else None
 
     @staticmethod
-    def _get_item_name_id_from_cs_file_contents(contents: str) -> Optional[str]:
-        name_search_regex = r'public partial class (\w+Item)'
-        match = re.search(name_search_regex, contents)
-        return match.group(1) if match else None
+    def _get_item_tags_from_cs_file_contents(contents: Contents, class_start: int,
+                                             patterns: ExtractorPatterns = TEXT_PATTERNS) -> Tuple[str, ...]:
+        """Return the [Tag("...")] attributes of the class declared at class_start."""
+        if contents.find(patterns.TAG_MARKER) == -1:
+            return ()
+
+        # Walk back over the run of attribute lines right above the declaration. Finding the end
+        # of the previous statement instead would stop early at a ';' inside an attribute string
+        attributes_start = contents.rfind(patterns.NEWLINE, 0, class_start) + 1
+        while attributes_start:
+            line_start = contents.rfind(patterns.NEWLINE, 0, attributes_start - 1) + 1
+            if not contents[line_start:attributes_start - 1].lstrip().startswith(patterns.ATTRIBUTE_LINE_START):
+                break
+            attributes_start = line_start
+        tags = []
+        for match in patterns.ITEM_TAG_PATTERN.finditer(contents, attributes_start, class_start):
+            # Tag("...") itself, not e.g. ItemTag("...")
+            if match.start() and patterns.WORD_CHARACTER_PATTERN.match(contents, match.start() - 1):
+                continue
+            # Spaces are removed like in tag ingredient names (e.g. "Burnable Fuel" -> BurnableFuel)
+            tags.append(sys.intern(patterns.text(match.group(1)).replace(" ", "")))
+        return tuple(dict.fromkeys(tags))
 
     @staticmethod
-    def _get_skill_from_cs_file_contents(file_contents: str, file_name: str) -> Optional[Skill]:
-        skill_search_regex = r'Tag\("Specialty"\)'
-        if not re.search(skill_search_regex, file_contents):
+    def _get_skill_from_cs_file_contents(file_contents: Contents, file_name: str,
+                                         patterns: ExtractorPatterns = TEXT_PATTERNS) -> Optional[Skill]:
+        if file_contents.find(patterns.SKILL_MARKER) == -1:
             return None
 
-        name_id_search_regex = r'public partial class (\w+Skill) : Skill'
-        match = re.search(name_id_search_regex, file_contents)
+        match = patterns.SKILL_NAME_ID_PATTERN.search(file_contents)
         if not match:
             logger.warning(f"Could not find skill name ID for file {file_name}")
             return None
-        name_id = match.group(1)
+        name_id = sys.intern(patterns.text(match.group(1)))
 
         name = file_name.replace(".cs", "")
         # Split by camel case
-        name = re.sub('([A-Z][a-z]+)', r' \1', re.sub('([A-Z]+)', r' \1', name)).strip()
+        name = CAMEL_CASE_WORD_PATTERN.sub(r' \1', CAPITALS_PATTERN.sub(r' \1', name)).strip()
 
         return Skill(name=name, name_id=name_id)
 
     @staticmethod
-    def _get_crafting_table_from_cs_file_contents(file_contents: str, file_name: str) -> Optional[CraftingTable]:
-        crafting_search_regex = r'RequireComponent\(typeof\(CraftingComponent'
-        if not re.search(crafting_search_regex, file_contents):
+    def _get_crafting_table_from_cs_file_contents(file_contents: Contents, file_name: str,
+                                                  patterns: ExtractorPatterns = TEXT_PATTERNS) -> Optional[CraftingTable]:
+        if file_contents.find(patterns.CRAFTING_TABLE_MARKER) == -1:
             return None
 
-        name_search_regex = r'DisplayName\s+=>\s+Localizer\.DoStr\("([\w\s]+)"\)'
-        match = re.search(name_search_regex, file_contents)
+        match = patterns.CRAFTING_TABLE_NAME_PATTERN.search(file_contents)
         if not match:
             logger.warning(f"Could not find crafting table name for file {file_name}")
             return None
-        name = match.group(1)
+        name = patterns.text(match.group(1))
 
-        name_id_search_regex = r'public partial class (\w+Object)'
-        match = re.search(name_id_search_regex, file_contents)
+        match = patterns.CRAFTING_TABLE_NAME_ID_PATTERN.search(file_contents)
         if not match:
             logger.warning(f"Could not find nameID for crafting table {name}")
             return None
-        name_id = match.group(1)
+        name_id = sys.intern(patterns.text(match.group(1)))
 
-        upgrade_module_search_regex = r'AllowPluginModules\(Tags = new\[] \{ "(\w+)'
-        match = re.search(upgrade_module_search_regex, file_contents)
-        upgrade_module = match.group(1) if match else None
+        match = patterns.CRAFTING_TABLE_UPGRADE_MODULE_PATTERN.search(file_contents)
+        upgrade_module = patterns.text(match.group(1)) if match else None
 
         return CraftingTable(
             crafting_table_name=name,
             crafting_table_name_id=name_id,
             upgrade_module_tag=upgrade_module
         )
+
+
+def _parse_cs_file_chunk(chunk: List[Tuple[str, str, Optional[str]]], profile: bool = False,
+                         read_mode: str = READ_MODE_TEXT, archive: Optional[ServerArchive] = None,
+                         with_digest: bool = False
+                         ) -> List[Tuple[Optional[str], Optional[ParsedFile], Optional[FileTimings]]]:
+    # Module level so it can be pickled for ProcessPoolExecutor workers
+    return [EcoServerFileService._parse_cs_file(folder, Path(file_path), known_digest, profile, read_mode,
+                                                archive, with_digest)
+            for folder, file_path, known_digest in chunk]
@@ -0,0 +1,86 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from ..models import EcoDataset, ParsedFile
+from .eco_server_file_service import EcoServerFileService, DEFAULT_CHUNK_SIZE, FILE_ADDED
+from .parse_cache import ParseCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanChanges:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def summary(self) -> str:
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.modified)} modified"
+
+
+class IncrementalScanner:
+    """Keeps an EcoDataset in sync with the server files, re-parsing only what changed.
+
+    The file manifest of the previous scan is the parse cache: its entries hold the
+    size, mtime, digest and parse result of every file seen last time, so the first
+    refresh in a new process already only parses files changed since the last run.
+    """
+
+    def __init__(self, eco_server_service: EcoServerFileService, cache: ParseCache,
+                 workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.eco_server_service = eco_server_service
+        self.cache = cache
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.dataset = EcoDataset()
+        self._parsed_files: Dict[str, ParsedFile] = {}
+        self._scanned = False
+
+    def refresh(self) -> ScanChanges:
+        """Find added, removed and modified .cs files and patch the dataset with them."""
+        changes = ScanChanges()
+        previous_paths = set(self._parsed_files) if self._scanned else set(self.cache.paths())
+        current: Dict[str, ParsedFile] = {}
+        changed: Dict[str, ParsedFile] = {}
+
+        for scanned in self.eco_server_service.scan_files(self.workers, self.chunk_size, self.cache):
+            current[scanned.file_path] = scanned.parsed
+            if scanned.change is not None:
+                changed[scanned.file_path] = scanned.parsed
+                (changes.added if scanned.change == FILE_ADDED else changes.modified).append(scanned.file_path)
+        # Includes files that can no longer be read
+        changes.removed = sorted(previous_paths - set(current))
+
+        if not self._scanned:
+            self._parsed_files = current
+            self.dataset = EcoDataset.from_parsed_files(current.values())
+            self._scanned = True
+        elif changes:
+            stale = [self._parsed_files.pop(file_path) for file_path in changes.removed + changes.modified
+                     if file_path in self._parsed_files]
+            self._parsed_files.update(changed)
+            self.dataset.apply_changes(stale, changed.values())
+
+        self.cache.save()
+        if changes:
+            logger.info(f"Server files changed: {changes.summary()}")
+        return changes
+
+    def watch(self, on_change: Callable[[EcoDataset, ScanChanges], None], interval: float = 1.0,
+              max_iterations: Optional[int] = None):
+        """Poll the server files and call on_change whenever something changed."""
+        if not self._scanned:
+            self.refresh()
+
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            time.sleep(interval)
+            iterations += 1
+
+            changes = self.refresh()
+            if changes:
+                on_change(self.dataset, changes)
@@ -0,0 +1,152 @@
+import csv
+import hashlib
+import io
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from .parse_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the index layout changes
+LOCALIZATION_INDEX_VERSION = 1
+
+DEFAULT_STRINGS_FILE_NAME = "defaultstrings.csv"
+
+
+class LocalizationService:
+    """Looks up translations in the game's defaultstrings.csv.
+
+    The first column holds the key (the English string the game localizes) and
+    every other column one language, named in the header row. The first run streams
+    the file once to build an index of the byte offset and length of every row,
+    which is kept in cache_dir; later runs only seek to the rows they need.
+    """
+
+    def __init__(self, strings_file: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.strings_file = Path(strings_file)
+        self.index_file = None
+        if cache_dir:
+            file_key = hashlib.sha1(str(strings_file).encode('utf-8')).hexdigest()[:16]
+            self.index_file = Path(cache_dir) / f"locale-index-{file_key}.pickle"
+        self._columns: List[str] = []
+        # Key -> (byte offset, byte length) of its row
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._load_index()
+
+    @property
+    def languages(self) -> List[str]:
+        return self._columns[1:]
+
+    def get_translations(self, keys: Iterable[str],
+                         languages: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+        """Return language -> key -> translation for the given keys.
+
+        Without languages every language column is returned. Keys without a row and
+        empty cells are left out.
+        """
+        languages = list(languages) if languages else self.languages
+        unknown = [language for language in languages if language not in self._columns[1:]]
+        if unknown:
+            raise ValueError(f"Unknown language(s) {', '.join(unknown)} in {self.strings_file}, "
+                             f"available: {', '.join(self.languages)}")
+
+        column_indexes = [(language, self._columns.index(language)) for language in languages]
+        translations: Dict[str, Dict[str, str]] = {language: {} for language in languages}
+
+        # Reading in file order keeps the seeks moving forward
+        rows = sorted((self._offsets[key], key) for key in set(keys) if key in self._offsets)
+        with open(self.strings_file, 'rb') as f:
+            for (offset, length), key in rows:
+                f.seek(offset)
+                row = self._parse_row(f.read(length))
+                for language, column in column_indexes:
+                    if column < len(row) and row[column]:
+                        translations[language][key] = row[column]
+        return translations
+
+    @staticmethod
+    def _parse_row(data: bytes) -> List[str]:
+        return next(csv.reader(io.StringIO(data.decode('utf-8-sig'), newline='')), [])
+
+    def _load_index(self):
+        try:
+            stat = os.stat(self.strings_file)
+        except OSError as e:
+            raise FileNotFoundError(f"Localization file not found at {self.strings_file}") from e
+
+        if self.index_file and self.index_file.exists():
+            try:
+                with open(self.index_file, 'rb') as f:
+                    data = pickle.load(f)
+                if data.get('version') == LOCALIZATION_INDEX_VERSION and \
+                        data['size'] == stat.st_size and data['mtime_ns'] == stat.st_mtime_ns:
+                    self._columns = data['columns']
+                    self._offsets = data['offsets']
+                    return
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable localization index {self.index_file}: {e}")
+
+        self._build_index()
+        self._save_index(stat)
+
+    def _build_index(self):
+        """Stream the CSV once, recording where every row starts and how long it is."""
+        columns = None
+        offsets = {}
+        with open(self.strings_file, 'rb') as f:
+            for offset, record in self._iter_records(f):
+                row = self._parse_row(record)
+                if not row:
+                    continue
+                if columns is None:
+                    columns = [column.strip() for column in row]
+                    continue
+                # The first row of a duplicated key wins
+                offsets.setdefault(row[0], (offset, len(record)))
+
+        self._columns = columns or []
+        self._offsets = offsets
+        logger.info(f"Indexed {len(offsets)} localized strings in {len(self.languages)} languages "
+                    f"from {self.strings_file}")
+
+    @staticmethod
+    def _iter_records(f) -> Iterable[Tuple[int, bytes]]:
+        # A quoted field can contain line breaks, so a record ends at the first line
+        # break after an even number of quote characters
+        offset = 0
+        record_start = 0
+        parts = []
+        quotes = 0
+        for line in f:
+            parts.append(line)
+            quotes += line.count(b'"')
+            offset += len(line)
+            if quotes % 2 == 0:
+                yield record_start, b"".join(parts)
+                record_start = offset
+                parts = []
+                quotes = 0
+        if parts:
+            yield record_start, b"".join(parts)
+
+    def _save_index(self, stat: os.stat_result):
+        if self.index_file is None:
+            return
+
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.index_file.with_suffix(".tmp")
+            with open(temp_file, 'wb') as f:
+                pickle.dump({
+                    'version': LOCALIZATION_INDEX_VERSION,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'columns': self._columns,
+                    'offsets': self._offsets
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, self.index_file)
+        except Exception as e:
+            logger.error(f"Error writing localization index {self.index_file}: {e}")
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..models import ParsedFile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".eco_cache"
+
+# Bump whenever the extractors change what they produce, so stale results are discarded
+CACHE_VERSION = 4
+
+
+@dataclass
+class CacheEntry:
+    size: int
+    mtime_ns: int
+    digest: str
+    parsed: ParsedFile
+
+    def matches_stat(self, stat: os.stat_result) -> bool:
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+class ParseCache:
+    """On-disk cache of parse results for the .cs files of one Eco server.
+
+    Entries are keyed by file path and validated by size and mtime. When the stat
+    info changed the caller re-reads the file and can reuse the entry if the
+    content digest is still the same.
+    """
+
+    def __init__(self, eco_server_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        # Without a cache_dir the cache only lives in memory, e.g. for a watch loop run with --no-cache
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_file = None
+        if self.cache_dir:
+            server_key = hashlib.sha1(str(eco_server_path).encode('utf-8')).hexdigest()[:16]
+            self.cache_file = self.cache_dir / f"parse-cache-{server_key}.pickle"
+        self._entries: Dict[str, CacheEntry] = self._load()
+        self._seen = set()
+        # Whether the entries differ from the cache file, so save() has something to write
+        self._modified = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def compute_digest(data: bytes) -> str:
+        return hashlib.sha1(data).hexdigest()
+
+    def get(self, file_path: str) -> Optional[CacheEntry]:
+        self._seen.add(file_path)
+        return self._entries.get(file_path)
+
+    def put(self, file_path: str, stat: os.stat_result, digest: str, parsed: ParsedFile):
+        self._seen.add(file_path)
+        self._modified = True
+        self._entries[file_path] = CacheEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            digest=digest,
+            parsed=parsed
+        )
+
+    def discard(self, file_path: str):
+        if self._entries.pop(file_path, None) is not None:
+            self._modified = True
+        self._seen.discard(file_path)
+
+    def evict_unseen(self) -> List[str]:
+        """Drop the entries of files not looked up or stored since the last call, e.g. deleted files.
+
+        Returns their paths.
+        """
+        unseen = [path for path in self._entries if path not in self._seen]
+        for path in unseen:
+            del self._entries[path]
+        self._modified = self._modified or bool(unseen)
+        self._seen = set()
+        return unseen
+
+    def paths(self) -> List[str]:
+        return list(self._entries)
+
+    def save(self):
+        if self.cache_file is None or not self._modified:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_suffix(".tmp")
+            with open(temp_file, 'wb') as f:
+                pickle.dump({'version': CACHE_VERSION, 'entries': self._entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, self.cache_file)
+            self._modified = False
+        except Exception as e:
+            logger.error(f"Error writing parse cache {self.cache_file}: {e}")
+
+    @staticmethod
+    def clear(cache_dir: str = DEFAULT_CACHE_DIR):
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+            logger.info(f"Cleared parse cache in {cache_dir}")
+
+    def _load(self) -> Dict[str, CacheEntry]:
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse cache {self.cache_file}: {e}")
+            return {}
+
+        if data.get('version') != CACHE_VERSION:
+            logger.info("Parse cache was written by a different version, rebuilding it")
+            return {}
+        return data['entries']
@@ -0,0 +1,201 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from ..models import EcoDataset, Item
+from ..analysis import RecipeGraph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+GZIP_COMPRESS_LEVEL = 6
+
+
+class _Response(NamedTuple):
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    gzip_etag: str
+
+
+def _make_response(body: str) -> _Response:
+    data = body.encode('utf-8')
+    digest = hashlib.sha1(data).hexdigest()[:20]
+    # Each encoding is a different representation, so it needs its own strong ETag
+    return _Response(data, gzip.compress(data, GZIP_COMPRESS_LEVEL), f'"{digest}"', f'"{digest}-gzip"')
+
+
+def _to_json(value) -> str:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def _json_array(elements: Iterable[str]) -> str:
+    return f"[{','.join(elements)}]"
+
+
+class QueryIndex:
+    """Every response of the query server, serialized and compressed up front.
+
+    The recipes of /recipes?produces=X come from RecipeGraph.producers(), so an item
+    that no recipe outputs gets the recipes of its equivalent item name IDs (e.g.
+    WoodBoard gets the BoardItem recipes). Requests are
+    dictionary lookups; nothing is serialized while serving.
+    """
+
+    def __init__(self, dataset: EcoDataset):
+        start = time.perf_counter()
+        self._graph = RecipeGraph(dataset.recipes)
+        recipe_json = [_to_json(recipe.to_dict()) for recipe in self._graph.recipes]
+
+        self._paths: Dict[str, _Response] = {
+            '/items': _make_response(_json_array(_to_json(item.to_dict()) for item in dataset.items)),
+            '/recipes': _make_response(_json_array(recipe_json)),
+            '/tables': _make_response(_json_array(_to_json(table.to_dict()) for table in dataset.crafting_tables)),
+            '/skills': _make_response(_json_array(_to_json(skill.to_dict()) for skill in dataset.skills))
+        }
+        self._no_recipes = _make_response("[]")
+        # Item name ID -> response, for every item in the graph and every equivalent name ID
+        self._producers: Dict[str, _Response] = {}
+        responses: Dict[Tuple[int, ...], _Response] = {(): self._no_recipes}
+        item_name_ids = dict.fromkeys(self._graph.item_name_ids)
+        for alias, canonical_name_id in Item.CANONICAL_NAME_IDS.items():
+            item_name_ids.update(dict.fromkeys((alias, canonical_name_id)))
+        for item_name_id in item_name_ids:
+            recipe_ids = tuple(self._graph.matching_producer_ids(item_name_id))
+            if recipe_ids not in responses:
+                responses[recipe_ids] = _make_response(_json_array(recipe_json[index] for index in recipe_ids))
+            self._producers[item_name_id] = responses[recipe_ids]
+        logger.info(f"Prepared {len(self._paths) + len(self._producers)} query responses "
+                    f"in {time.perf_counter() - start:.2f}s")
+
+    def lookup(self, path: str, query: Dict[str, List[str]]) -> Optional[_Response]:
+        """The response for a request path and its parsed query string, None for an unknown path.
+
+        Raises ValueError for query parameters the path does not support.
+        """
+        path = path.rstrip('/') or '/'
+        unsupported = set(query) - ({'produces'} if path == '/recipes' else set())
+        if unsupported:
+            raise ValueError(f"Unsupported query parameter(s) for {path}: {', '.join(sorted(unsupported))}")
+        if 'produces' not in query:
+            return self._paths.get(path)
+
+        values = query['produces']
+        if len(values) != 1:
+            raise ValueError("produces takes one item name ID")
+        return self._producers.get(values[0], self._no_recipes)
+
+
+class _QueryRequestHandler(BaseHTTPRequestHandler):
+    server_version = "EcoDataReader"
+    # Keep-alive connections for clients that send many queries
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool):
+        url = urlsplit(self.path)
+        try:
+            response = self.server.index.lookup(url.path, parse_qs(url.query, keep_blank_values=True))
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e), send_body)
+            return
+        if response is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}", send_body)
+            return
+
+        use_gzip = self._accepts_gzip()
+        body, etag = (response.gzip_body, response.gzip_etag) if use_gzip else (response.body, response.etag)
+        if self._etag_matches(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", JSON_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, send_body: bool):
+        body = _to_json({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", JSON_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _accepts_gzip(self) -> bool:
+        for coding in self.headers.get("Accept-Encoding", "").split(','):
+            name, _, parameters = coding.partition(';')
+            if name.strip().lower() == "gzip":
+                quality = parameters.strip()
+                if not quality.startswith("q="):
+                    return True
+                try:
+                    return float(quality[2:]) > 0
+                except ValueError:
+                    return False
+        return False
+
+    def _etag_matches(self, etag: str) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        # Weak comparison, as If-None-Match requires
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Read-only HTTP server answering JSON queries about a dataset held in memory.
+
+    Serves /items, /recipes, /recipes?produces=<item name ID>, /tables and /skills.
+    Responses carry an ETag (If-None-Match is answered with 304 Not Modified) and
+    are sent gzipped to clients that accept it.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, dataset: EcoDataset, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.index = QueryIndex(dataset)
+        super().__init__((host, port), _QueryRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def update(self, dataset: EcoDataset):
+        """Serve a new dataset. Requests already being answered finish with the previous one."""
+        self.index = QueryIndex(dataset)
+
+    def start(self) -> threading.Thread:
+        """Serve on a background thread until shutdown() is called."""
+        thread = threading.Thread(target=self.serve_forever, name="query-server", daemon=True)
+        thread.start()
+        return thread
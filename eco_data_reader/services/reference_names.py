@@ -0,0 +1,69 @@
+import logging
+from pathlib import Path
+from typing import Iterable, Union
+from ..utils import TypeScriptReader
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_FILE_SUFFIXES = (".txt", ".ts")
+REFERENCE_KINDS = ("item", "recipe")
+
+
+class ReferenceNames:
+    """Case-insensitive set of item or recipe names that are already known.
+
+    Names are loaded once from text files (one name per line), TypeScript data files
+    such as the EcoCraftingTool items/recipes, or folders containing either.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names = set()
+        self.update(names)
+
+    def __contains__(self, name: str) -> bool:
+        return name.casefold() in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def update(self, names: Iterable[str]):
+        self._names.update(name.strip().casefold() for name in names if name.strip())
+
+    @classmethod
+    def load(cls, paths: Iterable[Union[str, Path]], kind: str) -> 'ReferenceNames':
+        """Load names from the files and folders whose name contains kind ("item" or "recipe").
+
+        Files are read when their name contains kind, so a recipe list cannot hide items
+        that share a name; in folders the files are filtered the same way.
+        """
+        reference_names = cls()
+        for path in paths:
+            path = Path(path)
+            if path.is_dir():
+                for file_path in sorted(path.iterdir()):
+                    if kind in file_path.name.lower() and file_path.suffix in REFERENCE_FILE_SUFFIXES:
+                        reference_names.add_file(file_path)
+            elif path.is_file():
+                if kind in path.name.lower():
+                    reference_names.add_file(path)
+                elif not any(other in path.name.lower() for other in REFERENCE_KINDS):
+                    logger.warning(f"Skipping reference file {path}: its name must contain "
+                                   f"{' or '.join(REFERENCE_KINDS)} to tell which names it holds")
+            else:
+                logger.debug(f"Reference path {path} does not exist, skipping")
+        return reference_names
+
+    def add_file(self, file_path: Path):
+        count = len(self._names)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                if file_path.suffix == ".ts":
+                    self.update(entry['name'] for entry in TypeScriptReader(f).iter_array()
+                                if isinstance(entry, dict) and isinstance(entry.get('name'), str))
+                else:
+                    self.update(f)
+        except Exception as e:
+            logger.error(f"Error reading reference file {file_path}: {e}")
+            return
+
+        logger.info(f"Loaded {len(self._names) - count} reference names from {file_path}")
@@ -0,0 +1,211 @@
+import logging
+import os
+import tarfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ZIP_SUFFIXES = ('.zip',)
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+# Reading a member of these means decompressing the archive up to it, so they are read in one pass
+COMPRESSED_TAR_SUFFIXES = ('.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+CS_SUFFIX = ".cs"
+
+CORE_FOLDER = "__core__"
+AUTOGEN_FOLDER = "AutoGen"
+
+
+class MemberStat(NamedTuple):
+    """The parts of os.stat_result the parse cache compares."""
+    st_size: int
+    st_mtime_ns: int
+
+
+class ServerArchive:
+    """Read-only view of a Mods/__core__ tree inside a .zip or .tar(.gz) archive.
+
+    The archive is indexed once when it is opened. Members are addressed by the
+    path they would have if archive_path were the extracted __core__ folder
+    (e.g. <archive_path>/AutoGen/Item/IronBarItem.cs), wherever the tree sits in
+    the archive. Zip and uncompressed tar members are read on demand. Compressed
+    tars cannot be read out of order cheaply, so their .cs members are read into
+    memory while indexing, and worker processes receive those contents (see
+    subset()) instead of decompressing the archive again.
+    """
+
+    # (process ID, archive path) -> archive indexed by that process, see open()
+    _opened: Dict[Tuple[int, str], 'ServerArchive'] = {}
+
+    def __init__(self, archive_path: Union[str, Path]):
+        self.path = Path(archive_path)
+        stat = os.stat(self.path)
+        self._archive_stat = MemberStat(stat.st_size, stat.st_mtime_ns)
+        # Relative member path -> zip member name, tar member or (for compressed tars) contents
+        self._members: Dict[str, Union[str, tarfile.TarInfo, bytes]] = {}
+        self._stats: Dict[str, MemberStat] = {}
+        # Folder -> sorted names of the files directly in it
+        self._folders: Dict[str, List[str]] = {}
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+
+        start = time.perf_counter()
+        if self.path.name.lower().endswith(ZIP_SUFFIXES):
+            self._index_zip()
+        else:
+            self._index_tar()
+        self._index_folders()
+        logger.info(f"Indexed {len(self._members)} server files in {self.path} "
+                    f"in {time.perf_counter() - start:.2f}s")
+
+    @classmethod
+    def open(cls, archive_path: Union[str, Path]) -> 'ServerArchive':
+        """Return the archive, indexing it again only when the archive file has changed.
+
+        Forked worker processes inherit the cache of their parent, but must not share its
+        file handles, so entries are per process ID.
+        """
+        key = (os.getpid(), str(archive_path))
+        archive = cls._opened.get(key)
+        if archive is not None:
+            stat = os.stat(archive_path)
+            if archive._archive_stat == (stat.st_size, stat.st_mtime_ns):
+                return archive
+            archive.close()
+        archive = cls._opened[key] = cls(archive_path)
+        return archive
+
+    @staticmethod
+    def is_archive(path: Union[str, Path]) -> bool:
+        return str(path).lower().endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+
+    @property
+    def in_memory(self) -> bool:
+        """Whether the members were read into memory while indexing (compressed tars)."""
+        return self._zip is None and self._tar is None
+
+    def subset(self, file_paths: Iterable[Union[str, Path]]) -> 'ServerArchive':
+        """A copy of an in-memory archive holding only the given files.
+
+        Pickling it sends just their contents, which is how a chunk of files is
+        passed to a worker process.
+        """
+        relatives = [self._relative(file_path) for file_path in file_paths]
+        members = {relative: self._members[relative] for relative in relatives if relative in self._members}
+        return ServerArchive._from_state(str(self.path), self._archive_stat, members,
+                                         {relative: self._stats[relative] for relative in members})
+
+    def __reduce__(self):
+        if self.in_memory:
+            # Decompressing the archive again would cost more than sending the contents
+            return ServerArchive._from_state, (str(self.path), self._archive_stat, self._members, self._stats)
+        # Worker processes open (and index) the archive themselves instead of receiving the handles
+        return ServerArchive.open, (str(self.path),)
+
+    @classmethod
+    def _from_state(cls, archive_path: str, archive_stat: MemberStat, members: Dict[str, bytes],
+                    stats: Dict[str, MemberStat]) -> 'ServerArchive':
+        archive = cls.__new__(cls)
+        archive.path = Path(archive_path)
+        archive._archive_stat = archive_stat
+        archive._members = members
+        archive._stats = stats
+        archive._folders = {}
+        archive._zip = archive._tar = None
+        archive._index_folders()
+        return archive
+
+    def list_files(self, folder: str, suffix: str) -> List[Path]:
+        """Paths of the files directly in folder (relative to the tree root) ending in suffix, sorted."""
+        folder = folder.strip('/')
+        return [self.path / folder / name for name in self._folders.get(folder, ()) if name.endswith(suffix)]
+
+    def exists(self, file_path: Union[str, Path]) -> bool:
+        return self._relative(file_path) in self._members
+
+    def stat(self, file_path: Union[str, Path]) -> MemberStat:
+        relative = self._relative(file_path)
+        if relative not in self._stats:
+            raise FileNotFoundError(f"{relative} is not in {self.path}")
+        return self._stats[relative]
+
+    def read(self, file_path: Union[str, Path]) -> bytes:
+        relative = self._relative(file_path)
+        member = self._members.get(relative)
+        if member is None:
+            raise FileNotFoundError(f"{relative} is not in {self.path}")
+        if isinstance(member, bytes):
+            return member
+        if isinstance(member, tarfile.TarInfo):
+            return self._tar.extractfile(member).read()
+        return self._zip.read(member)
+
+    def close(self):
+        for handle in (self._zip, self._tar):
+            if handle is not None:
+                handle.close()
+
+    def _index_folders(self):
+        for relative in sorted(self._members):
+            folder, _, name = relative.rpartition('/')
+            self._folders.setdefault(folder, []).append(name)
+
+    def _relative(self, file_path: Union[str, Path]) -> str:
+        return Path(file_path).relative_to(self.path).as_posix()
+
+    @staticmethod
+    def _find_root(names: List[str]) -> Optional[str]:
+        """The member name prefix of the __core__ folder, i.e. the parent of its AutoGen folder."""
+        roots = set()
+        for name in names:
+            parts = PurePosixPath(name).parts
+            if AUTOGEN_FOLDER in parts[:-1]:
+                roots.add("/".join(parts[:parts.index(AUTOGEN_FOLDER)]))
+        if not roots:
+            return None
+        # Prefer Mods/__core__ over the AutoGen folders of other mods
+        core_roots = [root for root in roots if root.rsplit('/', 1)[-1] == CORE_FOLDER]
+        return min(core_roots or roots, key=lambda root: (root.count('/'), root))
+
+    def _add_members(self, members: Dict[str, tuple]):
+        """Keep the members (normalized name -> (member, stat)) that are inside the tree."""
+        root = self._find_root(list(members))
+        prefix = root + '/' if root else ''
+        for name, (member, stat) in members.items():
+            if name.startswith(prefix):
+                self._members[name[len(prefix):]] = member
+                self._stats[name[len(prefix):]] = stat
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return name[2:] if name.startswith('./') else name
+
+    def _index_zip(self):
+        self._zip = zipfile.ZipFile(self.path)
+        members = {}
+        for info in self._zip.infolist():
+            if not info.is_dir():
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                members[self._normalize(info.filename)] = (info.filename,
+                                                          MemberStat(info.file_size, int(mtime * 1e9)))
+        self._add_members(members)
+
+    def _index_tar(self):
+        if not self.path.name.lower().endswith(COMPRESSED_TAR_SUFFIXES):
+            # Reading the headers seeks over the member data; members are read on demand later
+            self._tar = tarfile.open(self.path, 'r:')
+            self._add_members({self._normalize(info.name): (info, MemberStat(info.size, int(info.mtime * 1e9)))
+                               for info in self._tar if info.isfile()})
+            return
+
+        # One sequential pass that keeps the contents of every .cs file, since where the tree
+        # is in the archive is only known at the end; other members are left out
+        members = {}
+        with tarfile.open(self.path, 'r|*') as stream:
+            for info in stream:
+                if info.isfile() and info.name.endswith(CS_SUFFIX):
+                    members[self._normalize(info.name)] = (stream.extractfile(info).read(),
+                                                           MemberStat(info.size, int(info.mtime * 1e9)))
+        self._add_members(members)
@@ -0,0 +1,367 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from ..models import CraftingTable, EcoDataset, Ingredient, Item, Output, Recipe, Skill
+from ..analysis import DatasetDiff, diff_datasets
+
+logger = logging.getLogger(__name__)
+
+# Stored as the database's user_version; bump whenever the schema or the fingerprints change
+SNAPSHOT_STORE_VERSION = 2
+# Version 1 fingerprinted to_dict(), which leaves out item tags and ingredient tag flags
+FINGERPRINT_UPGRADE_VERSIONS = (1,)
+
+DEFAULT_SNAPSHOT_DATABASE = "snapshots.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    name_id TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    name TEXT NOT NULL,
+    tag INTEGER NOT NULL,
+    image_file TEXT,
+    x_pos INTEGER,
+    y_pos INTEGER,
+    tags TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    name_id TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    name TEXT NOT NULL,
+    skill_name_id TEXT,
+    level INTEGER,
+    labor INTEGER,
+    crafting_table_name_id TEXT,
+    hidden INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingredients (
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id),
+    position INTEGER NOT NULL,
+    item_name_id TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    reducible INTEGER NOT NULL,
+    tag INTEGER NOT NULL,
+    PRIMARY KEY (recipe_id, position)
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id),
+    position INTEGER NOT NULL,
+    item_name_id TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    reducible INTEGER NOT NULL,
+    is_primary INTEGER NOT NULL,
+    PRIMARY KEY (recipe_id, position)
+);
+CREATE TABLE IF NOT EXISTS crafting_tables (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    name_id TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    name TEXT NOT NULL,
+    upgrade_module_tag TEXT,
+    hidden INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES versions(id),
+    name_id TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    name TEXT NOT NULL
+);
+"""
+
+# Per model table: (version, name ID, fingerprint) answers "what changed between two versions"
+# from the index alone, (name ID, version) answers "history of X"
+INDEXES = """
+CREATE INDEX IF NOT EXISTS {table}_by_version ON {table} (version_id, name_id, fingerprint);
+CREATE INDEX IF NOT EXISTS {table}_by_name_id ON {table} (name_id, version_id);
+"""
+
+# Name IDs with a row in one of the two versions that has no identical row in the other
+CHANGED_NAME_IDS = """
+SELECT a.name_id FROM {table} a WHERE a.version_id = :version AND NOT EXISTS (
+    SELECT 1 FROM {table} b WHERE b.version_id = :other AND b.name_id = a.name_id AND b.fingerprint = a.fingerprint)
+UNION
+SELECT b.name_id FROM {table} b WHERE b.version_id = :other AND NOT EXISTS (
+    SELECT 1 FROM {table} a WHERE a.version_id = :version AND a.name_id = b.name_id AND a.fingerprint = b.fingerprint)
+"""
+
+
+def _fingerprint(values: tuple) -> bytes:
+    """Hash of the values stored for a model, so that any stored difference changes it."""
+    return hashlib.sha1(json.dumps(values).encode('utf-8')).digest()
+
+
+def _fingerprinted_row(name_id: str, values: tuple) -> tuple:
+    return (name_id, _fingerprint(values)) + values
+
+
+def _item_row(item: Item) -> tuple:
+    return _fingerprinted_row(item.item_name_id, (item.name, item.tag, item.image_file, item.x_pos, item.y_pos,
+                                                  json.dumps(list(item.tags))))
+
+
+def _item_from_row(row: sqlite3.Row) -> Item:
+    return Item(name=row['name'], item_name_id=row['name_id'], tag=bool(row['tag']), image_file=row['image_file'],
+                x_pos=row['x_pos'], y_pos=row['y_pos'], tags=tuple(json.loads(row['tags'])))
+
+
+def _ingredient_values(ingredient: Ingredient) -> tuple:
+    return ingredient.item_name_id, str(ingredient.quantity), ingredient.reducible, ingredient.tag
+
+
+def _output_values(output: Output) -> tuple:
+    return output.item_name_id, str(output.quantity), output.reducible, output.primary
+
+
+def _recipe_row(recipe: Recipe) -> tuple:
+    values = (recipe.name, recipe.skill_name_id, recipe.level, recipe.labor, recipe.crafting_table_name_id,
+              recipe.hidden)
+    # The ingredient and output rows are part of what is stored for the recipe
+    parts = ([_ingredient_values(ingredient) for ingredient in recipe.ingredients],
+             [_output_values(output) for output in recipe.outputs])
+    return (recipe.name_id, _fingerprint(values + parts)) + values
+
+
+def _recipe_from_row(row: sqlite3.Row) -> Recipe:
+    return Recipe(name=row['name'], name_id=row['name_id'], skill_name_id=row['skill_name_id'], level=row['level'],
+                  labor=row['labor'], crafting_table_name_id=row['crafting_table_name_id'],
+                  hidden=bool(row['hidden']))
+
+
+def _crafting_table_row(table: CraftingTable) -> tuple:
+    return _fingerprinted_row(table.crafting_table_name_id,
+                              (table.crafting_table_name, table.upgrade_module_tag, table.hidden))
+
+
+def _crafting_table_from_row(row: sqlite3.Row) -> CraftingTable:
+    return CraftingTable(crafting_table_name=row['name'], crafting_table_name_id=row['name_id'],
+                         upgrade_module_tag=row['upgrade_module_tag'], hidden=bool(row['hidden']))
+
+
+def _skill_row(skill: Skill) -> tuple:
+    return _fingerprinted_row(skill.name_id, (skill.name,))
+
+
+def _skill_from_row(row: sqlite3.Row) -> Skill:
+    return Skill(name=row['name'], name_id=row['name_id'])
+
+
+class _Section:
+    """How the models of one dataset section map to their table."""
+
+    def __init__(self, table: str, columns: Tuple[str, ...], models: Callable[[EcoDataset], list],
+                 to_row: Callable[[object], tuple], from_row: Callable[[sqlite3.Row], object]):
+        self.table = table
+        self.columns = columns
+        self.models = models
+        self.to_row = to_row
+        self.from_row = from_row
+
+
+# Keyed like the sections of DatasetDiff.to_dict()
+SECTIONS: Dict[str, _Section] = {
+    'items': _Section('items', ('name', 'tag', 'image_file', 'x_pos', 'y_pos', 'tags'),
+                      lambda dataset: dataset.items, _item_row, _item_from_row),
+    'recipes': _Section('recipes', ('name', 'skill_name_id', 'level', 'labor', 'crafting_table_name_id', 'hidden'),
+                        lambda dataset: dataset.recipes, _recipe_row, _recipe_from_row),
+    'craftingTables': _Section('crafting_tables', ('name', 'upgrade_module_tag', 'hidden'),
+                               lambda dataset: dataset.crafting_tables, _crafting_table_row,
+                               _crafting_table_from_row),
+    'skills': _Section('skills', ('name',), lambda dataset: dataset.skills, _skill_row, _skill_from_row)
+}
+
+
+class SnapshotStore:
+    """SQLite store of parsed datasets, one snapshot per server version label.
+
+    Items, recipes (with their ingredients and outputs), crafting tables and skills
+    are stored in one table each, indexed by version and name ID, so the history of
+    one entry or the changes between two versions are read with indexed queries
+    instead of rescanning old server trees. Every row carries a fingerprint of its
+    to_dict(), which lets changes() load only the entries that differ.
+    """
+
+    def __init__(self, database: Union[str, Path] = DEFAULT_SNAPSHOT_DATABASE):
+        self.database = Path(database)
+        self.database.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.database))
+        self._connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def __enter__(self) -> 'SnapshotStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def versions(self) -> List[str]:
+        """The stored version labels in the order they were first saved; replacing a snapshot keeps its place."""
+        return [row['label'] for row in self._connection.execute("SELECT label FROM versions ORDER BY id")]
+
+    def save(self, label: str, dataset: EcoDataset):
+        """Store the dataset under label, replacing an earlier snapshot with the same label."""
+        start = time.perf_counter()
+        with self._connection:
+            version_id = self._version_id(label, required=False)
+            if version_id is not None:
+                logger.info(f"Replacing snapshot {label}")
+                self._delete_rows(version_id)
+                self._connection.execute("UPDATE versions SET created_at = ? WHERE id = ?", (time.time(), version_id))
+            else:
+                version_id = self._connection.execute("INSERT INTO versions (label, created_at) VALUES (?, ?)",
+                                                      (label, time.time())).lastrowid
+            self._insert_rows(version_id, dataset)
+        logger.info(f"Saved snapshot {label} ({len(dataset.items)} items, {len(dataset.recipes)} recipes) "
+                    f"to {self.database} in {time.perf_counter() - start:.2f}s")
+
+    def delete(self, label: str):
+        with self._connection:
+            self._delete_version(label)
+
+    def load(self, label: str) -> EcoDataset:
+        """The dataset stored under label."""
+        return self._load_dataset(self._version_id(label))
+
+    def history(self, section: str, name_id: str) -> List[Tuple[str, object]]:
+        """(version label, model) for every snapshot containing the entry, oldest first.
+
+        section is one of items, recipes, craftingTables or skills.
+        """
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown section '{section}', expected one of {', '.join(SECTIONS)}")
+        labels = dict(self._connection.execute("SELECT id, label FROM versions"))
+        return [(labels[version_id], model)
+                for version_id, model in self._read_models(section, "name_id = :name_id", {'name_id': name_id})]
+
+    def changes(self, old_label: str, new_label: str) -> DatasetDiff:
+        """The differences between two snapshots, as diff_datasets() reports them.
+
+        Only the entries whose fingerprints differ are loaded and compared.
+        """
+        old_id, new_id = self._version_id(old_label), self._version_id(new_label)
+        return diff_datasets(self._load_dataset(old_id, new_id), self._load_dataset(new_id, old_id))
+
+    def _create_schema(self):
+        user_version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if user_version not in (0, SNAPSHOT_STORE_VERSION) + FINGERPRINT_UPGRADE_VERSIONS:
+            raise ValueError(f"{self.database} is a version {user_version} snapshot store, "
+                             f"expected version {SNAPSHOT_STORE_VERSION}")
+        with self._connection:
+            self._connection.executescript(SCHEMA + "".join(INDEXES.format(table=section.table)
+                                                            for section in SECTIONS.values()))
+            if user_version in FINGERPRINT_UPGRADE_VERSIONS:
+                self._refingerprint()
+            self._connection.execute(f"PRAGMA user_version = {SNAPSHOT_STORE_VERSION}")
+
+    def _refingerprint(self):
+        """Store every snapshot again, so that all fingerprints are computed the current way."""
+        version_ids = [row['id'] for row in self._connection.execute("SELECT id FROM versions ORDER BY id")]
+        logger.info(f"Updating the fingerprints of {len(version_ids)} snapshots in {self.database}")
+        for version_id in version_ids:
+            dataset = self._load_dataset(version_id)
+            self._delete_rows(version_id)
+            self._insert_rows(version_id, dataset)
+
+    def _version_id(self, label: str, required: bool = True) -> Optional[int]:
+        row = self._connection.execute("SELECT id FROM versions WHERE label = ?", (label,)).fetchone()
+        if row is None and required:
+            raise KeyError(f"No snapshot {label!r} in {self.database}")
+        return row['id'] if row else None
+
+    def _delete_version(self, label: str):
+        version_id = self._version_id(label)
+        self._delete_rows(version_id)
+        self._connection.execute("DELETE FROM versions WHERE id = ?", (version_id,))
+
+    def _delete_rows(self, version_id: int):
+        """Delete the models stored for a version, keeping its row in versions."""
+        recipe_ids = "SELECT id FROM recipes WHERE version_id = ?"
+        self._connection.execute(f"DELETE FROM ingredients WHERE recipe_id IN ({recipe_ids})", (version_id,))
+        self._connection.execute(f"DELETE FROM outputs WHERE recipe_id IN ({recipe_ids})", (version_id,))
+        for section in SECTIONS.values():
+            self._connection.execute(f"DELETE FROM {section.table} WHERE version_id = ?", (version_id,))
+
+    def _insert_rows(self, version_id: int, dataset: EcoDataset):
+        for name, section in SECTIONS.items():
+            if name == 'recipes':
+                self._insert_recipes(version_id, section.models(dataset))
+                continue
+            self._connection.executemany(
+                f"INSERT INTO {section.table} (version_id, name_id, fingerprint, {', '.join(section.columns)}) "
+                f"VALUES ({', '.join('?' * (len(section.columns) + 3))})",
+                ((version_id,) + section.to_row(model) for model in section.models(dataset)))
+
+    def _insert_recipes(self, version_id: int, recipes: Iterable[Recipe]):
+        section = SECTIONS['recipes']
+        # Assigning the row IDs up front lets the ingredients and outputs be inserted in bulk too
+        first_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM recipes").fetchone()[0]
+        recipe_rows, ingredient_rows, output_rows = [], [], []
+        for recipe_id, recipe in enumerate(recipes, first_id):
+            recipe_rows.append((recipe_id, version_id) + section.to_row(recipe))
+            ingredient_rows.extend((recipe_id, position) + _ingredient_values(ingredient)
+                                   for position, ingredient in enumerate(recipe.ingredients))
+            output_rows.extend((recipe_id, position) + _output_values(output)
+                               for position, output in enumerate(recipe.outputs))
+
+        self._connection.executemany(
+            f"INSERT INTO recipes (id, version_id, name_id, fingerprint, {', '.join(section.columns)}) "
+            f"VALUES ({', '.join('?' * (len(section.columns) + 4))})", recipe_rows)
+        self._connection.executemany("INSERT INTO ingredients VALUES (?, ?, ?, ?, ?, ?)", ingredient_rows)
+        self._connection.executemany("INSERT INTO outputs VALUES (?, ?, ?, ?, ?, ?)", output_rows)
+
+    def _load_dataset(self, version_id: int, changed_from: Optional[int] = None) -> EcoDataset:
+        """The models of a version; with changed_from, only those of name IDs that differ from that version."""
+        parameters = {'version': version_id, 'other': changed_from}
+        models = {}
+        for name, section in SECTIONS.items():
+            where = "version_id = :version"
+            if changed_from is not None:
+                where += f" AND name_id IN ({CHANGED_NAME_IDS.format(table=section.table)})"
+            models[name] = [model for _, model in self._read_models(name, where, parameters)]
+
+        dataset = EcoDataset(items=models['items'], recipes=models['recipes'],
+                             crafting_tables=models['craftingTables'], skills=models['skills'])
+        dataset.sort()
+        return dataset
+
+    def _read_models(self, name: str, where: str, parameters: dict) -> List[Tuple[int, object]]:
+        """(version ID, model) for the rows of a section matching where, in version and insertion order."""
+        section = SECTIONS[name]
+        rows = self._connection.execute(f"SELECT * FROM {section.table} WHERE {where} ORDER BY version_id, id",
+                                        parameters).fetchall()
+        if name != 'recipes':
+            return [(row['version_id'], section.from_row(row)) for row in rows]
+
+        recipes = {row['id']: section.from_row(row) for row in rows}
+        recipe_ids = f"SELECT id FROM recipes WHERE {where}"
+        for row in self._connection.execute(
+                f"SELECT * FROM ingredients WHERE recipe_id IN ({recipe_ids}) ORDER BY recipe_id, position",
+                parameters):
+            recipes[row['recipe_id']].ingredients.append(Ingredient(
+                item_name_id=row['item_name_id'], quantity=Decimal(row['quantity']),
+                reducible=bool(row['reducible']), tag=bool(row['tag'])))
+        for row in self._connection.execute(
+                f"SELECT * FROM outputs WHERE recipe_id IN ({recipe_ids}) ORDER BY recipe_id, position",
+                parameters):
+            recipes[row['recipe_id']].outputs.append(Output(
+                item_name_id=row['item_name_id'], quantity=Decimal(row['quantity']),
+                reducible=bool(row['reducible']), primary=bool(row['is_primary'])))
+        return [(row['version_id'], recipes[row['id']]) for row in rows]
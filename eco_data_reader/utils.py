@@ -1,22 +1,312 @@
 import re
 import codecs
+import io
+import json
+from typing import Iterable, Iterator, List, Optional, TextIO
 
 
 class JsonTypeScriptProcessor:
     @staticmethod
     def process_json_to_typescript(json_str: str) -> str:
         result = json_str.replace('"', "'")
-        result = re.sub(r"'item':'(\w+)'", r"'item':getItemByNameID('\1')", result)
-        result = re.sub(r"'skill':'(\w+)'", r"'skill':getSkillByNameID('\1')", result)
-        result = re.sub(r"'craftingTable':'(\w+)'", r"'craftingTable':getCraftingTableByNameID('\1')", result)
+        result = re.sub(r"'item':(\s*)'(\w+)'", r"'item':\1getItemByNameID('\2')", result)
+        result = re.sub(r"'skill':(\s*)'(\w+)'", r"'skill':\1getSkillByNameID('\2')", result)
+        result = re.sub(r"'craftingTable':(\s*)'(\w+)'", r"'craftingTable':\1getCraftingTableByNameID('\2')", result)
         # Decode unicode escape sequences
         result = codecs.decode(result, 'unicode_escape')
         return result
 
     @staticmethod
     def process_typescript_to_json(typescript: str) -> str:
-        result = re.sub(r"'item': getItemByNameID\('(\w+)'\)", r"'item':'\1'", typescript)
-        result = re.sub(r"'skill': getSkillByNameID\('(\w+)'\)", r"'skill':'\1'", result)
-        result = re.sub(r"'craftingTable': getCraftingTableByNameID\('(\w+)'\)", r"'craftingTable':'\1'", result)
-        result = result.replace("'", '"')
-        return result
+        # Lookup calls such as getItemByNameID('IronBarItem') become their name ID
+        return json.dumps(TypeScriptReader(io.StringIO(typescript)).read_value())
+
+
+class TypeScriptWriter:
+    """Streams to_dict() data to a file as a TypeScript array literal.
+
+    The layout is that of json.dumps(data, indent=2) passed through
+    JsonTypeScriptProcessor.process_json_to_typescript, but only one top-level
+    object is held in memory at a time. Strings are single quoted with backslashes,
+    quotes and line breaks escaped, so TypeScriptReader reads them back unchanged;
+    the JSON path turned double quotes into single quotes and escaped nothing, so
+    the output differs from it for strings containing those characters. With
+    indent=None the output is minified, without any line breaks or spaces between
+    values.
+    """
+
+    LOOKUP_FUNCTIONS = {
+        'item': 'getItemByNameID',
+        'skill': 'getSkillByNameID',
+        'craftingTable': 'getCraftingTableByNameID'
+    }
+
+    # Values the JSON based processor wraps in a lookup function (\w+ on the ASCII-escaped JSON)
+    LOOKUP_VALUE_PATTERN = re.compile(r'[A-Za-z0-9_]+')
+
+    # Characters that would end or break a single quoted string
+    STRING_ESCAPES = str.maketrans({'\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r'})
+
+    def __init__(self, f: TextIO, indent: Optional[int] = 2):
+        self.f = f
+        self.indent = indent
+        self._key_separator = ": " if indent is not None else ":"
+
+    def write_array(self, objects: Iterable[dict]):
+        first = True
+        for obj in objects:
+            parts = ["[" if first else ","]
+            parts.append(self._newline(1))
+            self._append_value(parts, obj, 1)
+            self.f.write("".join(parts))
+            first = False
+
+        self.f.write("[]" if first else f"{self._newline(0)}]")
+
+    def _newline(self, level: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
+
+    def _append_value(self, parts: List[str], value, level: int):
+        if isinstance(value, dict):
+            if not value:
+                parts.append("{}")
+                return
+            parts.append("{")
+            for index, (key, item) in enumerate(value.items()):
+                if index:
+                    parts.append(",")
+                parts.append(self._newline(level + 1))
+                parts.append(f"'{key.translate(self.STRING_ESCAPES)}'{self._key_separator}")
+                function = self.LOOKUP_FUNCTIONS.get(key)
+                if function and isinstance(item, str) and self.LOOKUP_VALUE_PATTERN.fullmatch(item):
+                    parts.append(f"{function}('{item}')")
+                else:
+                    self._append_value(parts, item, level + 1)
+            parts.append(self._newline(level))
+            parts.append("}")
+        elif isinstance(value, (list, tuple)):
+            if not value:
+                parts.append("[]")
+                return
+            parts.append("[")
+            for index, item in enumerate(value):
+                if index:
+                    parts.append(",")
+                parts.append(self._newline(level + 1))
+                self._append_value(parts, item, level + 1)
+            parts.append(self._newline(level))
+            parts.append("]")
+        elif isinstance(value, str):
+            parts.append(f"'{value.translate(self.STRING_ESCAPES)}'")
+        else:
+            parts.append(json.dumps(value))
+
+
+class TypeScriptParseError(ValueError):
+    pass
+
+
+class TypeScriptReader:
+    """Streaming reader for the object literal subset of TypeScript used by EcoCraftingTool data files.
+
+    Understands objects (quoted or bare keys, trailing commas), arrays, single, double
+    and backtick quoted strings, numbers, true/false/null/undefined and comments. A call
+    such as getItemByNameID('IronBarItem') reads as its first argument, any other bare
+    identifier as its name. The value of a file is the literal that is assigned
+    (const items: Item[] = [...]), exported (export default [...]) or returned by an
+    arrow function (export default (...) => [...]), or a bare literal at its start;
+    imports and type annotations are skipped. The file is tokenized in chunks, so
+    iter_array() holds only the current element in memory.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    # Unterminated strings and comments match up to the end of the buffer, which makes
+    # the tokenizer read more before deciding what they are
+    TOKEN_PATTERN = re.compile(r"""
+        (?P<skip>\s+|//[^\n]*|/\*(?:.*?\*/|.*))
+        |(?P<string>'(?:\\.|[^'\\])*(?:'|\\)?|"(?:\\.|[^"\\])*(?:"|\\)?|`(?:\\.|[^`\\])*(?:`|\\)?)
+        |(?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d*)?)
+        |(?P<ident>[A-Za-z_$][\w$]*)
+        |(?P<punct>[^\s\w'"`])
+    """, re.DOTALL | re.VERBOSE)
+
+    ESCAPE_PATTERN = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+    ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+    CONSTANTS = {'true': True, 'false': False, 'null': None, 'undefined': None}
+    # Tokens a value literal follows; None is the start of the file
+    VALUE_PREFIXES = ('=', '=>', 'default', None)
+
+    def __init__(self, f: TextIO):
+        self._tokens = self._tokenize(f)
+        self._peeked = None
+
+    def iter_array(self, variable: Optional[str] = None) -> Iterator:
+        """Yield the elements of the first array value, or of the array assigned to variable."""
+        if self._find_value(variable, '['):
+            self._next()
+            yield from self._iter_elements()
+
+    def read_value(self, variable: Optional[str] = None):
+        """Read the first array or object value, or the one assigned to variable."""
+        if not self._find_value(variable, '[{'):
+            raise TypeScriptParseError("No array or object literal found")
+        return self._parse_value()
+
+    def _find_value(self, variable: Optional[str], openings: str) -> bool:
+        """Skip to the first value literal opening with one of openings, leaving it to be read next."""
+        declared = None
+        previous = None
+        while True:
+            kind, value = self._next()
+            if kind == 'end':
+                return False
+            if (kind, value) == ('punct', '=') and self._peek() == ('punct', '>'):
+                self._next()
+                value = '=>'
+            if kind == 'ident' and previous in ('const', 'let', 'var'):
+                declared = value
+            if (previous in self.VALUE_PREFIXES and kind == 'punct' and value in openings
+                    and (variable is None or declared == variable)):
+                self._peeked = (kind, value)
+                return True
+            if (kind, value) == ('punct', '=') and variable is not None and declared != variable:
+                self._parse_value()
+            previous = value if kind in ('punct', 'ident') else kind
+
+    def _iter_elements(self):
+        while True:
+            if self._peek() == ('punct', ']'):
+                self._next()
+                return
+            yield self._parse_value()
+            kind, value = self._next()
+            if (kind, value) == ('punct', ']'):
+                return
+            if (kind, value) != ('punct', ','):
+                raise TypeScriptParseError(f"Expected ',' or ']' but found {value!r}")
+
+    def _parse_value(self):
+        kind, value = self._next()
+        if kind == 'punct' and value == '{':
+            return self._parse_object()
+        if kind == 'punct' and value == '[':
+            return list(self._iter_elements())
+        if kind in ('string', 'number'):
+            return value
+        if kind == 'punct' and value == '-':
+            number_kind, number = self._next()
+            if number_kind != 'number':
+                raise TypeScriptParseError(f"Expected a number after '-' but found {number!r}")
+            return -number
+        if kind == 'ident':
+            if value in self.CONSTANTS:
+                return self.CONSTANTS[value]
+            if value == 'new':
+                return self._parse_value()
+            return self._parse_identifier(value)
+        if kind == 'end':
+            raise TypeScriptParseError("Unexpected end of input")
+        raise TypeScriptParseError(f"Unexpected {value!r}")
+
+    def _parse_identifier(self, name: str):
+        # Member access (Foo.Bar) and calls; a call reads as its first argument
+        while self._peek() == ('punct', '.'):
+            self._next()
+            name = f"{name}.{self._next()[1]}"
+        if self._peek() != ('punct', '('):
+            return name
+
+        self._next()
+        arguments = []
+        while self._peek() != ('punct', ')'):
+            arguments.append(self._parse_value())
+            if self._peek() == ('punct', ','):
+                self._next()
+        self._next()
+        return arguments[0] if arguments else name
+
+    def _parse_object(self) -> dict:
+        obj = {}
+        while True:
+            kind, key = self._next()
+            if (kind, key) == ('punct', '}'):
+                return obj
+            if kind not in ('ident', 'string', 'number'):
+                raise TypeScriptParseError(f"Expected a property name but found {key!r}")
+            if self._next() != ('punct', ':'):
+                raise TypeScriptParseError(f"Expected ':' after property {key!r}")
+            obj[str(key)] = self._parse_value()
+
+            kind, value = self._next()
+            if (kind, value) == ('punct', '}'):
+                return obj
+            if (kind, value) != ('punct', ','):
+                raise TypeScriptParseError(f"Expected ',' or '}}' after property {key!r} but found {value!r}")
+
+    def _peek(self):
+        if self._peeked is None:
+            self._peeked = next(self._tokens)
+        return self._peeked
+
+    def _next(self):
+        token = self._peek()
+        self._peeked = None
+        return token
+
+    def _tokenize(self, f: TextIO):
+        buffer = ""
+        position = 0
+        eof = False
+        while True:
+            match = self.TOKEN_PATTERN.match(buffer, position)
+            if not eof and (match is None or match.end() == len(buffer)):
+                # The token may continue in the next chunk
+                chunk = f.read(self.CHUNK_SIZE)
+                buffer = buffer[position:] + chunk
+                position = 0
+                eof = not chunk
+                continue
+            if match is None:
+                if position < len(buffer):
+                    raise TypeScriptParseError(f"Unexpected character {buffer[position]!r}")
+                while True:
+                    yield 'end', None
+
+            position = match.end()
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == 'skip':
+                if text.startswith('/*') and not text.endswith('*/'):
+                    raise TypeScriptParseError("Unterminated comment")
+                continue
+            if kind == 'string':
+                if len(text) < 2 or text[-1] != text[0] or self._is_escaped_end(text):
+                    raise TypeScriptParseError("Unterminated string")
+                yield kind, self.ESCAPE_PATTERN.sub(self._unescape, text[1:-1])
+            elif kind == 'number':
+                is_float = '.' in text or 'e' in text or 'E' in text
+                try:
+                    number = float(text) if is_float else int(text)
+                except ValueError:
+                    raise TypeScriptParseError(f"Invalid number {text!r}") from None
+                yield kind, number
+            else:
+                yield kind, text
+
+    @staticmethod
+    def _is_escaped_end(text: str) -> bool:
+        # 'abc\' ends with an escaped quote when an odd number of backslashes precede it
+        backslashes = len(text) - 1 - len(text[:-1].rstrip('\\'))
+        return backslashes % 2 == 1
+
+    @classmethod
+    def _unescape(cls, match) -> str:
+        escape = match.group(1)
+        if escape.startswith('u{'):
+            return chr(int(escape[2:-1], 16))
+        if len(escape) > 1:
+            return chr(int(escape[1:], 16))
+        return cls.ESCAPES.get(escape, escape)
@@ -5,16 +5,27 @@ Eco Data Reader - Python Version
 Main entry point for reading and processing Eco server game data.
 """
 
+import argparse
+import gzip
+import hashlib
+import io
 import json
 import logging
+import re
 import sys
+import time
+from collections import Counter
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
 from eco_data_reader.config import Config
-from eco_data_reader.services import EcoServerFileService
-from eco_data_reader.models import Item, Recipe
-from eco_data_reader.utils import JsonTypeScriptProcessor
+from eco_data_reader.services import (CraftingToolDataService, EcoServerFileService, IncrementalScanner,
+                                      LocalizationService, ParseCache, QueryServer, ReferenceNames,
+                                      SnapshotStore)
+from eco_data_reader.models import EcoDataset, Item, Recipe
+from eco_data_reader.analysis import diff_datasets
+from eco_data_reader.profiling import ScanProfiler, profile_phase
+from eco_data_reader.utils import TypeScriptWriter
 
 # Setup logging
 logging.basicConfig(
@@ -23,37 +34,126 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CURRENT_ITEMS_FILE = Path("src/main/resources/current-items.txt")
+CURRENT_RECIPES_FILE = Path("src/main/resources/current-recipes.txt")
+
+# Recipe field -> how it is read from a recipe, for the CHUNK_BY setting
+CHUNK_KEYS = {
+    'craftingTable': lambda recipe: recipe.crafting_table_name_id,
+    'skill': lambda recipe: recipe.skill_name_id
+}
+# Manifest key of the recipes without a crafting table or skill, written to recipes-none.ts
+NO_CHUNK_KEY = "(none)"
+# Characters a chunk key can use as they are in its file name
+CHUNK_FILE_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_-]')
+
+# Commands that can be combined in one non-interactive run, in the order they are run
+COMMANDS = ["scan", "emit", "new", "diff", "locale", "snapshot", "serve"]
+
+
+def scan_server(config: Config, use_cache: bool = True, profiler: Optional[ScanProfiler] = None) -> EcoDataset:
+    """Parse all items, recipes, crafting tables and skills from the Eco server files."""
+    eco_server_service = EcoServerFileService(config.eco_server_path, profiler, config.read_mode)
+    cache = None
+    if use_cache and config.cache_enabled:
+        cache = ParseCache(config.eco_server_path, config.cache_dir)
+    return eco_server_service.scan_all(workers=config.workers, cache=cache)
+
+
+def create_incremental_scanner(config: Config, use_cache: bool = True) -> IncrementalScanner:
+    """Create a scanner that keeps a dataset in sync with the Eco server files."""
+    cache_dir = config.cache_dir if use_cache and config.cache_enabled else None
+    cache = ParseCache(config.eco_server_path, cache_dir)
+    return IncrementalScanner(EcoServerFileService(config.eco_server_path, read_mode=config.read_mode), cache,
+                              workers=config.workers)
+
+
+def compare_items_and_recipes(dataset: Optional[EcoDataset] = None, baseline_file: Optional[Path] = None,
+                              output_dir=Path("output")):
+    """Compare current items and recipes with the latest from the Eco server.
+
+    The server data is saved as dataset.json in output_dir and compared with
+    baseline_file, by default the dataset.json of the previous run. The result is
+    written to dataset-diff.json.
+    """
+    if dataset is None:
+        logger.info("Loading items and recipes from Eco server...")
+        dataset = scan_server(Config())
+    logger.info(f"Loaded {len(dataset.recipes)} recipes")
+    logger.info(f"Loaded {len(dataset.items)} items")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    snapshot_file = output_dir / "dataset.json"
+    baseline_file = Path(baseline_file) if baseline_file else snapshot_file
+
+    if baseline_file.exists():
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = EcoDataset.from_dict(json.load(f))
+        diff = diff_datasets(baseline, dataset)
+        logger.info(f"Changes since {baseline_file}: {diff.summary()}")
+        diff.write_json(output_dir / "dataset-diff.json")
+    else:
+        logger.info(f"No baseline at {baseline_file}, saving the current data as the first snapshot")
 
-def compare_items_and_recipes():
-    """Compare current items and recipes with the latest from the Eco server."""
-    config = Config()
-    eco_server_service = EcoServerFileService(config.eco_server_path)
+    with open(snapshot_file, 'w', encoding='utf-8') as f:
+        json.dump(dataset.to_dict(), f, indent=2)
+    logger.info(f"Wrote dataset snapshot to: {snapshot_file}")
+
+
+def get_locale_json(dataset: Optional[EcoDataset] = None, languages: Optional[List[str]] = None) -> str:
+    """Generate locale data from the defaultstrings.csv file.
+
+    Only the names of the parsed items, recipes, skills and crafting tables are
+    looked up. Returns language -> English name -> translation as JSON.
+    """
+    return json.dumps(get_translations(Config(), dataset, languages), indent=2, ensure_ascii=False)
+
+
+def get_translations(config: Config, dataset: Optional[EcoDataset] = None,
+                     languages: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+    """Look up the translations of every name in the dataset in the configured languages."""
+    if not config.strings_file:
+        raise ValueError("STRINGS_FILE is not set in config.ini. "
+                         "Please set the path to the game's defaultstrings.csv.")
+    if dataset is None:
+        dataset = scan_server(config)
+
+    keys = {item.name for item in dataset.items}
+    keys.update(recipe.name for recipe in dataset.recipes)
+    keys.update(skill.name for skill in dataset.skills)
+    keys.update(table.crafting_table_name for table in dataset.crafting_tables)
+
+    localization = LocalizationService(config.strings_file, config.cache_dir if config.cache_enabled else None)
+    return localization.get_translations(keys, languages or config.languages)
 
-    logger.info("Loading recipes from Eco server...")
-    recipes = eco_server_service.get_all_recipes()
-    logger.info(f"Loaded {len(recipes)} recipes")
 
-    logger.info("Loading items from Eco server...")
-    items = eco_server_service.get_all_items()
-    logger.info(f"Loaded {len(items)} items")
+def write_locale_files(dataset: Optional[EcoDataset] = None, output_dir=Path("output")):
+    """Write the translations of the dataset names to locale/<language>.json in output_dir."""
+    translations = get_translations(Config(), dataset)
 
-    # For now, just output the data as JSON
-    # In future, implement comparison with crafting tool data
-    logger.info("Conversion complete!")
+    locale_dir = Path(output_dir) / "locale"
+    locale_dir.mkdir(parents=True, exist_ok=True)
+    for language, strings in translations.items():
+        locale_file = locale_dir / f"{language}.json"
+        with open(locale_file, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(strings.items())), f, indent=2, ensure_ascii=False)
+        logger.info(f"Wrote {len(strings)} {language} strings to: {locale_file}")
 
 
-def get_locale_json() -> str:
-    """Generate locale data from the defaultstrings.csv file."""
-    # This would need implementation similar to the Translator class
-    # For now, returning placeholder
-    logger.warning("Locale JSON generation not yet implemented")
-    return "{}"
+def save_snapshot(dataset: Optional[EcoDataset] = None, label: Optional[str] = None):
+    """Store the dataset in the snapshot database under label, by default the current date and time."""
+    config = Config()
+    if dataset is None:
+        dataset = scan_server(config)
+    with SnapshotStore(config.snapshot_database) as store:
+        store.save(label or time.strftime("%Y-%m-%d %H:%M:%S"), dataset)
 
 
-def write_items_to_file():
+def write_items_to_file(dataset: Optional[EcoDataset] = None):
     """Write current items list to file."""
     config = Config()
-    items = get_items_from_files(config)
+    items = get_items_from_files(config, dataset)
 
     output_file = Path("resources") / "newest-items.txt"
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -65,10 +165,10 @@ def write_items_to_file():
     logger.info(f"Wrote {len(items)} items to {output_file}")
 
 
-def write_recipes_to_file():
+def write_recipes_to_file(dataset: Optional[EcoDataset] = None):
     """Write current recipes list to file."""
     config = Config()
-    recipes = get_recipes_from_files(config)
+    recipes = get_recipes_from_files(config, dataset)
 
     output_file = Path("resources") / "newest-recipes.txt"
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -80,17 +180,15 @@ def write_recipes_to_file():
     logger.info(f"Wrote {len(recipes)} recipes to {output_file}")
 
 
-def generate_new_recipes_string() -> str:
+def generate_new_recipes_string(dataset: Optional[EcoDataset] = None) -> str:
     """Generate TypeScript string for new recipes."""
     config = Config()
-    new_recipes = get_recipes_from_files(config)
-
-    # Convert to JSON
-    recipes_data = [recipe.to_dict() for recipe in new_recipes]
-    recipe_json = json.dumps(recipes_data, indent=2)
+    new_recipes = get_recipes_from_files(config, dataset)
 
     # Convert to TypeScript format
-    ts_string = JsonTypeScriptProcessor.process_json_to_typescript(recipe_json)
+    ts_buffer = io.StringIO()
+    TypeScriptWriter(ts_buffer).write_array(recipe.to_dict() for recipe in new_recipes)
+    ts_string = ts_buffer.getvalue()
 
     # Remove [ ] from the ends
     ts_string = ts_string[1:-1]
@@ -99,17 +197,15 @@ def generate_new_recipes_string() -> str:
     return ts_string
 
 
-def generate_new_items_string() -> str:
+def generate_new_items_string(dataset: Optional[EcoDataset] = None) -> str:
     """Generate TypeScript string for new items."""
     config = Config()
-    new_items = get_items_from_files(config)
-
-    # Convert to JSON
-    items_data = [item.to_dict() for item in new_items]
-    item_json = json.dumps(items_data, indent=2)
+    new_items = get_items_from_files(config, dataset)
 
     # Convert to TypeScript format
-    ts_string = JsonTypeScriptProcessor.process_json_to_typescript(item_json)
+    ts_buffer = io.StringIO()
+    TypeScriptWriter(ts_buffer).write_array(item.to_dict() for item in new_items)
+    ts_string = ts_buffer.getvalue()
 
     # Remove [ ] from the ends
     ts_string = ts_string[1:-1]
@@ -118,56 +214,59 @@ def generate_new_items_string() -> str:
     return ts_string
 
 
-def get_recipes_from_files(config: Config) -> List[Recipe]:
-    """Get recipes from Eco server files that are not in current-recipes.txt."""
-    eco_server_service = EcoServerFileService(config.eco_server_path)
-    recipes = eco_server_service.get_all_recipes()
+def get_recipes_from_files(config: Config, dataset: Optional[EcoDataset] = None) -> List[Recipe]:
+    """Get recipes from Eco server files that are not in the reference recipe names.
+
+    The server is only read when no already parsed dataset is given.
+    """
+    if dataset is None:
+        recipes = EcoServerFileService(config.eco_server_path).get_all_recipes()
+    else:
+        recipes = list(dataset.recipes)
     recipes.sort(key=lambda r: r.name)
 
-    new_recipes = []
-    for recipe in recipes:
-        if matches_new_recipes(recipe):
-            new_recipes.append(recipe)
+    reference_recipes = load_reference_names(config, "recipe")
+    return [recipe for recipe in recipes if matches_new_recipes(recipe, reference_recipes)]
 
-    return new_recipes
 
+def get_items_from_files(config: Config, dataset: Optional[EcoDataset] = None) -> List[Item]:
+    """Get items from Eco server files that are not in the reference item names.
 
-def get_items_from_files(config: Config) -> List[Item]:
-    """Get items from Eco server files that are not in current-items.txt."""
-    eco_server_service = EcoServerFileService(config.eco_server_path)
-    items = eco_server_service.get_all_items()
+    The server is only read when no already parsed dataset is given.
+    """
+    if dataset is None:
+        items = EcoServerFileService(config.eco_server_path).get_all_items()
+    else:
+        items = list(dataset.items)
     items.sort(key=lambda i: i.name)
 
-    new_items = []
-    for item in items:
-        if matches_new_items(item):
-            new_items.append(item)
-
-    return new_items
-
+    reference_items = load_reference_names(config, "item")
+    return [item for item in items if matches_new_items(item, reference_items)]
 
-def matches_new_items(item: Item) -> bool:
-    """Check if item is not in current-items.txt."""
-    current_items_file = Path("src/main/resources/current-items.txt")
-    if not current_items_file.exists():
-        return True
 
-    with open(current_items_file, 'r', encoding='utf-8') as f:
-        item_names = [line.strip() for line in f if line.strip()]
+def load_reference_names(config: Config, kind: str) -> ReferenceNames:
+    """Load the known item or recipe names from current-items.txt/current-recipes.txt,
+    REFERENCE_PATHS and the EcoCraftingTool data folder."""
+    paths = [CURRENT_ITEMS_FILE if kind == "item" else CURRENT_RECIPES_FILE]
+    paths.extend(config.reference_paths)
+    reference_names = ReferenceNames.load(paths, kind)
 
-    return not any(name.lower() == item.name.lower() for name in item_names)
+    if config.eco_crafting_tool_path:
+        crafting_tool = CraftingToolDataService(config.eco_crafting_tool_path,
+                                                config.cache_dir if config.cache_enabled else None)
+        models = crafting_tool.get_items() if kind == "item" else crafting_tool.get_recipes()
+        reference_names.update(model.name for model in models)
+    return reference_names
 
 
-def matches_new_recipes(recipe: Recipe) -> bool:
-    """Check if recipe is not in current-recipes.txt."""
-    current_recipes_file = Path("src/main/resources/current-recipes.txt")
-    if not current_recipes_file.exists():
-        return True
+def matches_new_items(item: Item, reference_items: ReferenceNames) -> bool:
+    """Check if item is not in the reference item names."""
+    return item.name not in reference_items
 
-    with open(current_recipes_file, 'r', encoding='utf-8') as f:
-        recipe_names = [line.strip() for line in f if line.strip()]
 
-    return not any(name.lower() == recipe.name.lower() for name in recipe_names)
+def matches_new_recipes(recipe: Recipe, reference_recipes: ReferenceNames) -> bool:
+    """Check if recipe is not in the reference recipe names."""
+    return recipe.name not in reference_recipes
 
 
 def get_user_choice():
@@ -188,28 +287,111 @@ def get_user_choice():
         print("Invalid choice. Please enter 1, 2, or 3.")
 
 
-def generate_output_files(generate_all=True):
+def generate_output_files(generate_all=True, use_cache=True, watch_interval=None,
+                          profiler: Optional[ScanProfiler] = None, output_dir=Path("output")):
     """Generate output files based on user choice."""
-    config = Config()
-    eco_server_service = EcoServerFileService(config.eco_server_path)
-
-    # Create output directory
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
-
     logger.info("\n" + "=" * 60)
     logger.info(f"Generating {'ALL' if generate_all else 'NEW'} items and recipes...")
     logger.info("=" * 60)
 
-    # Get items and recipes
-    logger.info("\nLoading items from Eco server...")
-    all_items = eco_server_service.get_all_items()
-    all_items.sort(key=lambda i: i.name)
+    run_commands(["emit" if generate_all else "new"], use_cache, watch_interval, profiler, output_dir)
+
+
+def run_commands(commands: List[str], use_cache=True, watch_interval=None,
+                 profiler: Optional[ScanProfiler] = None, output_dir=Path("output"),
+                 baseline_file: Optional[Path] = None, snapshot_label: Optional[str] = None):
+    """Scan the server once and produce the output of every command from that dataset.
+
+    With a watch_interval the server files are polled afterwards and the commands
+    are run again on the patched dataset whenever a .cs file changes. With a
+    profiler, a timing report of the first run is written to output_dir.
+    """
+    config = Config()
+    commands = [command for command in COMMANDS if command in commands]
+    Item.add_equivalent_name_ids(config.equivalent_item_name_ids)
+
+    # Get items and recipes from a single pass over the server files
+    logger.info("\nLoading items and recipes from Eco server...")
+    if profiler:
+        profiler.start_cprofile()
+    if watch_interval is None:
+        with profile_phase(profiler, "scan"):
+            dataset = scan_server(config, use_cache, profiler)
+    else:
+        scanner = create_incremental_scanner(config, use_cache)
+        with profile_phase(profiler, "scan"):
+            scanner.refresh()
+        dataset = scanner.dataset
+    run_commands_on_dataset(commands, dataset, output_dir, profiler, baseline_file, snapshot_label)
+    if profiler:
+        profiler.stop_cprofile()
+        profiler.write_report(output_dir)
+
+    server = None
+    if "serve" in commands:
+        server = QueryServer(dataset, config.server_host, config.server_port)
+        logger.info(f"\nServing queries on {server.url} (Ctrl+C to stop)...")
+
+    if watch_interval is None:
+        if server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                logger.info("\nStopped serving.")
+            finally:
+                server.server_close()
+        return
+
+    def on_change(dataset, changes):
+        run_commands_on_dataset(commands, dataset, output_dir, baseline_file=baseline_file,
+                                snapshot_label=snapshot_label)
+        if server:
+            server.update(dataset)
+
+    if server:
+        server.start()
+    logger.info(f"\nWatching {config.eco_server_path} for changes (Ctrl+C to stop)...")
+    try:
+        scanner.watch(on_change, watch_interval)
+    except KeyboardInterrupt:
+        logger.info("\nStopped watching.")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+
+def run_commands_on_dataset(commands: List[str], dataset: EcoDataset, output_dir=Path("output"),
+                            profiler: Optional[ScanProfiler] = None, baseline_file: Optional[Path] = None,
+                            snapshot_label: Optional[str] = None):
+    """Run the given commands against an already parsed dataset."""
+    for command in commands:
+        if command == "scan":
+            write_items_to_file(dataset)
+            write_recipes_to_file(dataset)
+        elif command == "emit":
+            write_output_files(dataset, True, output_dir, profiler)
+        elif command == "new":
+            write_output_files(dataset, False, output_dir, profiler)
+        elif command == "diff":
+            compare_items_and_recipes(dataset, baseline_file, output_dir)
+        elif command == "locale":
+            write_locale_files(dataset, output_dir)
+        elif command == "snapshot":
+            save_snapshot(dataset, snapshot_label)
+
+
+def write_output_files(dataset: EcoDataset, generate_all=True, output_dir=Path("output"),
+                       profiler: Optional[ScanProfiler] = None):
+    """Write the item and recipe lists and TypeScript files for a parsed dataset."""
+    # Create output directory
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    all_items = sorted(dataset.items, key=lambda i: i.name)
     logger.info(f"Loaded {len(all_items)} items")
 
-    logger.info("\nLoading recipes from Eco server...")
-    all_recipes = eco_server_service.get_all_recipes()
-    all_recipes.sort(key=lambda r: r.name)
+    all_recipes = sorted(dataset.recipes, key=lambda r: r.name)
     logger.info(f"Loaded {len(all_recipes)} recipes")
 
     # Filter if needed
@@ -218,73 +400,220 @@ def generate_output_files(generate_all=True):
         recipes_to_generate = all_recipes
     else:
         logger.info("\nFiltering for new items only...")
-        items_to_generate = [item for item in all_items if matches_new_items(item)]
-        recipes_to_generate = [recipe for recipe in all_recipes if matches_new_recipes(recipe)]
+        with profile_phase(profiler, "filter"):
+            config = Config()
+            reference_items = load_reference_names(config, "item")
+            reference_recipes = load_reference_names(config, "recipe")
+            items_to_generate = [item for item in all_items if matches_new_items(item, reference_items)]
+            recipes_to_generate = [recipe for recipe in all_recipes
+                                   if matches_new_recipes(recipe, reference_recipes)]
         logger.info(f"Found {len(items_to_generate)} new items")
         logger.info(f"Found {len(recipes_to_generate)} new recipes")
 
+    with profile_phase(profiler, "write lists"):
+        items_list_file, recipes_list_file = write_name_lists(
+            output_dir, generate_all, items_to_generate, recipes_to_generate)
+
+    with profile_phase(profiler, "write TypeScript"):
+        items_ts_file, recipes_ts_file = write_typescript_files(
+            output_dir, generate_all, items_to_generate, recipes_to_generate)
+
+    chunk_by = Config().chunk_by
+    if chunk_by:
+        with profile_phase(profiler, "write TypeScript chunks"):
+            write_typescript_chunks(output_dir / ("all-chunks" if generate_all else "new-chunks"), chunk_by,
+                                    items_to_generate, recipes_to_generate)
+
+    logger.info("\n" + "=" * 60)
+    logger.info("GENERATION COMPLETE!")
+    logger.info("=" * 60)
+    logger.info(f"\nAll files saved to: {output_dir.absolute()}")
+    logger.info(f"\n  Items:   {len(items_to_generate)}")
+    logger.info(f"  Recipes: {len(recipes_to_generate)}")
+    logger.info("\nGenerated files:")
+    logger.info(f"  - {items_list_file.name}")
+    logger.info(f"  - {recipes_list_file.name}")
+    logger.info(f"  - {items_ts_file.name}")
+    logger.info(f"  - {recipes_ts_file.name}")
+
+
+def write_name_lists(output_dir: Path, generate_all: bool, items: List[Item], recipes: List[Recipe]):
+    """Write the item and recipe names, one per line."""
     # Write item names list
     items_list_file = output_dir / ("all-items.txt" if generate_all else "new-items.txt")
     with open(items_list_file, 'w', encoding='utf-8') as f:
-        for item in items_to_generate:
+        for item in items:
             f.write(f"{item.name}\n")
     logger.info(f"\n✓ Wrote items list to: {items_list_file}")
 
     # Write recipe names list
     recipes_list_file = output_dir / ("all-recipes.txt" if generate_all else "new-recipes.txt")
     with open(recipes_list_file, 'w', encoding='utf-8') as f:
-        for recipe in recipes_to_generate:
+        for recipe in recipes:
             f.write(f"{recipe.name}\n")
     logger.info(f"✓ Wrote recipes list to: {recipes_list_file}")
+    return items_list_file, recipes_list_file
 
-    # Generate TypeScript for items
-    items_data = [item.to_dict() for item in items_to_generate]
-    item_json = json.dumps(items_data, indent=2)
-    item_ts = JsonTypeScriptProcessor.process_json_to_typescript(item_json)
 
+def write_typescript_files(output_dir: Path, generate_all: bool, items: List[Item], recipes: List[Recipe]):
+    """Write the items and recipes as EcoCraftingTool TypeScript data files."""
+    # Generate TypeScript for items
     items_ts_file = output_dir / ("all-items.ts" if generate_all else "new-items.ts")
     with open(items_ts_file, 'w', encoding='utf-8') as f:
         f.write("// Generated by Eco Data Reader\n")
         f.write("// Items for EcoCraftingTool\n\n")
         f.write("const items = ")
-        f.write(item_ts)
+        TypeScriptWriter(f).write_array(item.to_dict() for item in items)
         f.write(";\n")
     logger.info(f"✓ Wrote items TypeScript to: {items_ts_file}")
 
     # Generate TypeScript for recipes
-    recipes_data = [recipe.to_dict() for recipe in recipes_to_generate]
-    recipe_json = json.dumps(recipes_data, indent=2)
-    recipe_ts = JsonTypeScriptProcessor.process_json_to_typescript(recipe_json)
-
     recipes_ts_file = output_dir / ("all-recipes.ts" if generate_all else "new-recipes.ts")
     with open(recipes_ts_file, 'w', encoding='utf-8') as f:
         f.write("// Generated by Eco Data Reader\n")
         f.write("// Recipes for EcoCraftingTool\n\n")
         f.write("const recipes = ")
-        f.write(recipe_ts)
+        TypeScriptWriter(f).write_array(recipe.to_dict() for recipe in recipes)
         f.write(";\n")
     logger.info(f"✓ Wrote recipes TypeScript to: {recipes_ts_file}")
+    return items_ts_file, recipes_ts_file
 
-    logger.info("\n" + "=" * 60)
-    logger.info("GENERATION COMPLETE!")
-    logger.info("=" * 60)
-    logger.info(f"\nAll files saved to: {output_dir.absolute()}")
-    logger.info(f"\n  Items:   {len(items_to_generate)}")
-    logger.info(f"  Recipes: {len(recipes_to_generate)}")
-    logger.info("\nGenerated files:")
-    logger.info(f"  - {items_list_file.name}")
-    logger.info(f"  - {recipes_list_file.name}")
-    logger.info(f"  - {items_ts_file.name}")
-    logger.info(f"  - {recipes_ts_file.name}")
 
+def write_typescript_chunks(chunks_dir: Path, chunk_by: str, items: List[Item], recipes: List[Recipe]):
+    """Write the items and recipes as minified TypeScript modules the web app can load on demand.
+
+    The recipes are split into one chunk per crafting table or skill (chunk_by) and
+    every chunk gets a gzipped .gz sibling. manifest.json lists the chunk files with
+    their entry counts, sizes and content hashes. A chunk's default export is a
+    function of getItemByNameID, getSkillByNameID and getCraftingTableByNameID that
+    returns its entries, since modules cannot see the app's lookup functions.
+    """
+    if chunk_by not in CHUNK_KEYS:
+        raise ValueError(f"Unknown CHUNK_BY '{chunk_by}', expected one of {', '.join(CHUNK_KEYS)}")
+    chunks_dir.mkdir(parents=True, exist_ok=True)
 
-def main():
+    recipe_groups: Dict[str, List[Recipe]] = {}
+    for recipe in recipes:
+        recipe_groups.setdefault(CHUNK_KEYS[chunk_by](recipe) or NO_CHUNK_KEY, []).append(recipe)
+
+    file_names = recipe_chunk_file_names(recipe_groups)
+    manifest = {'chunkBy': chunk_by, 'items': write_typescript_chunk(chunks_dir / "items.ts", items), 'recipes': {}}
+    for key, group in sorted(recipe_groups.items()):
+        manifest['recipes'][key] = write_typescript_chunk(chunks_dir / file_names[key], group)
+
+    # Chunks of tables or skills that no longer have recipes
+    written = {manifest['items']['file']} | {chunk['file'] for chunk in manifest['recipes'].values()}
+    for file_path in chunks_dir.glob("*.ts*"):
+        if file_path.name.replace(".gz", "") not in written:
+            file_path.unlink()
+
+    with open(chunks_dir / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"✓ Wrote {len(recipe_groups) + 1} TypeScript chunks and their manifest to: {chunks_dir}")
+
+
+def recipe_chunk_file_names(keys: Iterable[str]) -> Dict[str, str]:
+    """The file name of every recipe chunk key, unique even on case-insensitive file systems.
+
+    A key that is a plain file name is used as it is (recipes-AnvilObject.ts). Other keys,
+    and keys whose file names would differ only in case, get a hash of the key appended.
+    """
+    names = {key: "none" if key == NO_CHUNK_KEY else CHUNK_FILE_NAME_PATTERN.sub('_', key) for key in keys}
+    name_counts = Counter(name.lower() for name in names.values())
+    file_names = {}
+    for key, name in names.items():
+        if (name != key and key != NO_CHUNK_KEY) or name_counts[name.lower()] > 1:
+            name = f"{name}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}"
+        file_names[key] = f"recipes-{name}.ts"
+    return file_names
+
+
+def write_typescript_chunk(file_path: Path, models: list) -> dict:
+    """Write one minified chunk and its .gz sibling, returning its manifest entry."""
+    buffer = io.StringIO()
+    buffer.write("export default(getItemByNameID,getSkillByNameID,getCraftingTableByNameID)=>")
+    TypeScriptWriter(buffer, indent=None).write_array(model.to_dict() for model in models)
+    buffer.write(";\n")
+    data = buffer.getvalue().encode('utf-8')
+    compressed = gzip.compress(data, 9)
+
+    file_path.write_bytes(data)
+    file_path.with_name(file_path.name + ".gz").write_bytes(compressed)
+    return {
+        'file': file_path.name,
+        'count': len(models),
+        'bytes': len(data),
+        'gzipBytes': len(compressed),
+        'hash': hashlib.sha1(data).hexdigest()[:12]
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(
+        description="Read Eco server data and generate EcoCraftingTool files. Without a command the "
+                    "interactive menu is shown; any mix of commands is computed from a single scan.")
+    parser.add_argument('commands', nargs='*', metavar='COMMAND',
+                        help="scan: write the new item/recipe names to resources/newest-*.txt; "
+                             "emit: write all items and recipes to the output folder; "
+                             "new: write only items and recipes missing from the reference names; "
+                             "diff: save the server data as dataset.json and write the changes since the "
+                             "baseline to dataset-diff.json; "
+                             "locale: write the translations of all names from defaultstrings.csv to "
+                             "locale/<language>.json; "
+                             "snapshot: store the server data in the snapshot database (DATABASE in config.ini); "
+                             "serve: answer JSON queries about the server data over HTTP (HOST and PORT in "
+                             "config.ini) until stopped")
+    parser.add_argument('--output-dir', type=Path, default=Path("output"),
+                        help="folder for the emit/new/diff/locale output files (default: output)")
+    parser.add_argument('--baseline', type=Path, metavar='FILE',
+                        help="dataset.json to compare with for diff (default: the one in the output folder)")
+    parser.add_argument('--label', metavar='VERSION',
+                        help="version label to store the snapshot under, e.g. v0.11.0 (default: the current "
+                             "date and time); an existing snapshot with the label is replaced")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse every server file instead of reusing cached results")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="delete the parse cache before running")
+    parser.add_argument('--watch', nargs='?', type=float, const=1.0, default=None, metavar='SECONDS',
+                        help="keep polling the server files and regenerate the output when they change "
+                             "(default interval: 1 second)")
+    parser.add_argument('--profile', action='store_true',
+                        help="write a timing report (profile-report.json in the output folder) with "
+                             "per-phase, per-folder and slowest-file timings")
+    parser.add_argument('--profile-cprofile', action='store_true',
+                        help="like --profile, and also capture a cProfile of the run (profile.prof)")
+
+    args = parser.parse_args(argv)
+    # Checked here instead of with choices=, which rejects an empty list of commands
+    unknown = [command for command in args.commands if command not in COMMANDS]
+    if unknown:
+        parser.error(f"invalid command: {', '.join(unknown)} (choose from {', '.join(COMMANDS)})")
+    return args
+
+
+def main(argv=None):
     """Main entry point."""
+    args = parse_args(argv)
+
     try:
         logger.info("=" * 60)
         logger.info("Eco Data Reader - Python Version")
         logger.info("=" * 60)
 
+        if args.clear_cache:
+            ParseCache.clear(Config().cache_dir)
+
+        profiler = None
+        if args.profile or args.profile_cprofile:
+            profiler = ScanProfiler(capture_cprofile=args.profile_cprofile)
+
+        if args.commands:
+            run_commands(args.commands, use_cache=not args.no_cache, watch_interval=args.watch,
+                         profiler=profiler, output_dir=args.output_dir, baseline_file=args.baseline,
+                         snapshot_label=args.label)
+            return 0
+
         # Get user choice
         choice = get_user_choice()
 
@@ -295,7 +624,8 @@ def main():
         generate_all = (choice == '1')
 
         # Generate output files
-        generate_output_files(generate_all)
+        generate_output_files(generate_all, use_cache=not args.no_cache, watch_interval=args.watch,
+                              profiler=profiler, output_dir=args.output_dir)
 
     except FileNotFoundError as e:
         logger.error(f"\nConfiguration error: {e}")
@@ -0,0 +1,15 @@
+"""Helpers shared by the tests."""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+from generate_corpus import CorpusGenerator  # noqa: E402
+
+
+def generate_server(root: Path, file_count: int = 60, seed: int = 0) -> Path:
+    """Write a synthetic Mods/__core__ tree to root, see benchmarks/generate_corpus.py."""
+    CorpusGenerator(seed).generate(root, file_count)
+    return root
@@ -0,0 +1,52 @@
+import json
+import unittest
+from decimal import Decimal
+
+from eco_data_reader.analysis import diff_datasets
+from eco_data_reader.models import EcoDataset, Ingredient, Item, Output, Recipe
+
+
+def make_dataset(wood_tags=("Wood",), log_is_tag=True):
+    items = [Item("Log", "LogItem", tags=wood_tags), Item("Board", "BoardItem")]
+    recipe = Recipe(name="Board", name_id="Board", skill_name_id="CarpentrySkill", level=1, labor=10,
+                    crafting_table_name_id="CarpentryTableObject",
+                    ingredients=[Ingredient("Wood" if log_is_tag else "LogItem", Decimal(1), tag=log_is_tag)],
+                    outputs=[Output("BoardItem", Decimal(2), primary=True)])
+    return EcoDataset(items=items, recipes=[recipe])
+
+
+class DatasetDiffTest(unittest.TestCase):
+    def test_unchanged(self):
+        self.assertFalse(diff_datasets(make_dataset(), make_dataset()))
+
+    def test_item_tags(self):
+        diff = diff_datasets(make_dataset(), make_dataset(wood_tags=("Wood", "Burnable")))
+        self.assertEqual([entry.name_id for entry in diff.items.changed], ["LogItem"])
+        change = diff.items.changed[0].changes[0]
+        self.assertEqual((change.field, change.old, change.new), ("tags", ("Wood",), ("Burnable", "Wood")))
+
+    def test_tag_order_is_not_a_change(self):
+        self.assertFalse(diff_datasets(make_dataset(wood_tags=("Wood", "Burnable")),
+                                       make_dataset(wood_tags=("Burnable", "Wood"))))
+
+    def test_ingredient_tag_flag(self):
+        old = make_dataset()
+        new = make_dataset()
+        new.recipes[0].ingredients[0].tag = False
+        diff = diff_datasets(old, new)
+        self.assertEqual([entry.name_id for entry in diff.recipes.changed], ["Board"])
+        change = diff.recipes.changed[0].changes[0].to_dict()
+        self.assertEqual(change['field'], "ingredients")
+        self.assertTrue(change['old'][0]['tag'])
+        self.assertNotIn('tag', change['new'][0])
+
+    def test_saved_dataset_round_trip(self):
+        dataset = make_dataset()
+        saved = EcoDataset.from_dict(json.loads(json.dumps(dataset.to_dict())))
+        self.assertEqual(saved.items[1].tags, ("Wood",))
+        self.assertTrue(saved.recipes[0].ingredients[0].tag)
+        self.assertFalse(diff_datasets(saved, dataset))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from eco_data_reader.services import EcoServerFileService, IncrementalScanner, ParseCache
+from tests.support import generate_server
+
+
+class IncrementalScannerTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.server_path = str(generate_server(Path(temp_dir.name) / "server"))
+        self.cache_dir = str(Path(temp_dir.name) / "cache")
+        self.scanner = self.create_scanner()
+        self.scanner.refresh()
+
+    def create_scanner(self) -> IncrementalScanner:
+        return IncrementalScanner(EcoServerFileService(self.server_path),
+                                  ParseCache(self.server_path, self.cache_dir))
+
+    def item_files(self):
+        return sorted(Path(self.server_path).glob("AutoGen/Item/*.cs"))
+
+    def assert_matches_full_scan(self):
+        expected = EcoServerFileService(self.server_path).scan_all().to_dict()
+        self.assertEqual(self.scanner.dataset.to_dict(), expected)
+
+    def test_first_refresh_adds_every_file(self):
+        scanner = IncrementalScanner(EcoServerFileService(self.server_path), ParseCache(self.server_path, None))
+        file_count = len(list(Path(self.server_path).glob("AutoGen/*/*.cs")))
+        self.assertEqual(len(scanner.refresh().added), file_count)
+        self.assert_matches_full_scan()
+
+    def test_unchanged_files_report_no_changes(self):
+        self.assertFalse(self.scanner.refresh())
+
+    def test_added_modified_and_removed_files(self):
+        added, modified, removed = self.item_files()[:3]
+        shutil.copy(added, added.with_name("CopiedItem.cs"))
+        contents = modified.read_text(encoding='utf-8')
+        modified.write_text(contents.replace('LocDisplayName("', 'LocDisplayName("Renamed '), encoding='utf-8')
+        removed.unlink()
+
+        changes = self.scanner.refresh()
+        self.assertEqual(changes.added, [str(added.with_name("CopiedItem.cs"))])
+        self.assertEqual(changes.modified, [str(modified)])
+        self.assertEqual(changes.removed, [str(removed)])
+        self.assert_matches_full_scan()
+
+    def test_unreadable_file_is_removed(self):
+        unreadable = self.item_files()[0]
+        unreadable.write_bytes(b"\xff\xfe not UTF-8")
+
+        self.assertEqual(self.scanner.refresh().removed, [str(unreadable)])
+        self.assertNotIn(str(unreadable), ParseCache(self.server_path, self.cache_dir).paths())
+        self.assert_matches_full_scan()
+
+    def test_new_scanner_starts_from_the_saved_cache(self):
+        self.assertFalse(self.create_scanner().refresh())
+
+    def test_new_scanner_picks_up_changes_since_the_last_run(self):
+        removed = self.item_files()[0]
+        removed.unlink()
+
+        self.assertEqual(self.create_scanner().refresh().removed, [str(removed)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from eco_data_reader.services import EcoServerFileService, ParseCache
+from tests.support import generate_server
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.server_path = str(generate_server(Path(temp_dir.name) / "server"))
+        self.cache_dir = str(Path(temp_dir.name) / "cache")
+
+    def scan(self):
+        cache = ParseCache(self.server_path, self.cache_dir)
+        dataset = EcoServerFileService(self.server_path).scan_all(cache=cache)
+        return dataset, cache
+
+    def cs_files(self):
+        return sorted(str(path) for path in Path(self.server_path).glob("AutoGen/*/*.cs"))
+
+    def test_unchanged_files_come_from_the_cache(self):
+        dataset, cache = self.scan()
+        self.assertEqual(cache.misses, len(self.cs_files()))
+
+        cached_dataset, cache = self.scan()
+        self.assertEqual((cache.hits, cache.misses), (len(self.cs_files()), 0))
+        self.assertEqual(cached_dataset.to_dict(), dataset.to_dict())
+
+    def item_file(self) -> Path:
+        return sorted(Path(self.server_path).glob("AutoGen/Item/*.cs"))[0]
+
+    def test_modified_file_is_parsed_again(self):
+        self.scan()
+        file_path = self.item_file()
+        contents = file_path.read_text(encoding='utf-8')
+        file_path.write_text(contents.replace('LocDisplayName("', 'LocDisplayName("Renamed '), encoding='utf-8')
+
+        dataset, cache = self.scan()
+        self.assertEqual(cache.misses, 1)
+        self.assertTrue(any(item.name.startswith("Renamed ") for item in dataset.items))
+
+    def test_deleted_file_is_evicted(self):
+        self.scan()
+        deleted = self.cs_files()[0]
+        Path(deleted).unlink()
+
+        self.scan()
+        self.assertNotIn(deleted, ParseCache(self.server_path, self.cache_dir).paths())
+
+    def test_unreadable_file_is_evicted(self):
+        self.scan()
+        file_path = self.item_file()
+        file_path.write_bytes(b"\xff\xfe not UTF-8")
+
+        dataset, _ = self.scan()
+        self.assertNotIn(str(file_path), ParseCache(self.server_path, self.cache_dir).paths())
+        self.assertNotIn(file_path.stem + "Item", [item.item_name_id for item in dataset.items])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from decimal import Decimal
+
+from eco_data_reader.analysis import RecipeGraph, RecipeMatrix, RollupCalculator
+from eco_data_reader.models import Ingredient, Output, Recipe
+
+
+def make_recipe(name_id, ingredients, outputs, labor=10):
+    """A recipe from (item name ID, quantity) pairs; the first output is the primary one."""
+    return Recipe(
+        name=name_id, name_id=name_id, skill_name_id="MasonrySkill", level=1, labor=labor,
+        crafting_table_name_id="MasonryTableObject",
+        ingredients=[Ingredient(name_id, Decimal(quantity)) for name_id, quantity in ingredients],
+        outputs=[Output(name_id, Decimal(quantity), primary=index == 0)
+                 for index, (name_id, quantity) in enumerate(outputs)])
+
+
+RECIPES = [
+    make_recipe("AshlarBasalt", [("BasaltItem", 4)], [("AshlarBasaltItem", 1)]),
+    make_recipe("AshlarGranite", [("GraniteItem", 4)], [("AshlarGraniteItem", 1)]),
+    make_recipe("Board", [("LogItem", 1)], [("BoardItem", 2)]),
+    # Ingredients named by the other ID of an equivalent pair
+    make_recipe("Bench", [("WoodBoard", 4)], [("BenchItem", 1)]),
+    make_recipe("Pillar", [("AshlarStone", 2)], [("PillarItem", 1)]),
+]
+
+
+class RecipeGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = RecipeGraph(RECIPES)
+
+    def test_items_keep_their_own_name_id(self):
+        self.assertIn("AshlarBasaltItem", self.graph.item_name_ids)
+        self.assertIn("AshlarGraniteItem", self.graph.item_name_ids)
+        self.assertIn("WoodBoard", self.graph.item_name_ids)
+        self.assertIn("BoardItem", self.graph.item_name_ids)
+        self.assertNotEqual(self.graph.item_id("AshlarBasaltItem"), self.graph.item_id("AshlarGraniteItem"))
+
+    def test_producers_of_an_item_with_recipes_of_its_own(self):
+        self.assertEqual([recipe.name_id for recipe in self.graph.producers("AshlarGraniteItem")],
+                         ["AshlarGranite"])
+
+    def test_producers_fall_back_to_equivalent_items(self):
+        self.assertEqual([recipe.name_id for recipe in self.graph.producers("WoodBoard")], ["Board"])
+        self.assertEqual([recipe.name_id for recipe in self.graph.producers("AshlarStone")],
+                         ["AshlarBasalt", "AshlarGranite"])
+        self.assertEqual(self.graph.producers("BasaltItem"), [])
+
+    def test_consumers_match_the_exact_name_id(self):
+        self.assertEqual([recipe.name_id for recipe in self.graph.consumers("WoodBoard")], ["Bench"])
+        self.assertEqual(self.graph.consumers("BoardItem"), [])
+
+
+class RollupTest(unittest.TestCase):
+    def setUp(self):
+        self.calculator = RollupCalculator(RecipeGraph(RECIPES))
+
+    def test_rollups_are_keyed_by_item_name_id(self):
+        rollups = self.calculator.rollup_all()
+        self.assertEqual(rollups["AshlarBasaltItem"].raw_materials, {"BasaltItem": Decimal(4)})
+        self.assertEqual(rollups["AshlarGraniteItem"].raw_materials, {"GraniteItem": Decimal(4)})
+
+    def test_ingredient_made_by_an_equivalent_item(self):
+        bench = self.calculator.rollup("BenchItem")
+        self.assertEqual(bench.raw_materials, {"LogItem": Decimal(2)})
+        self.assertEqual(bench.labor, Decimal(30))
+        self.assertEqual(self.calculator.rollup("WoodBoard").recipe.name_id, "Board")
+
+    def test_default_recipe_for_an_equivalent_group(self):
+        calculator = RollupCalculator(RecipeGraph(RECIPES), default_recipes={"AshlarStone": "AshlarGranite"})
+        self.assertEqual(calculator.rollup("PillarItem").raw_materials, {"GraniteItem": Decimal(8)})
+
+    def test_cyclic_rollups_do_not_depend_on_order(self):
+        recipes = [
+            make_recipe("SmeltIron", [("IronOreItem", 2), ("FluxItem", 1)], [("IronBarItem", 1)]),
+            make_recipe("MakeFlux", [("IronBarItem", 1), ("LimestoneItem", 2)], [("FluxItem", 4)]),
+        ]
+        flux_first = RollupCalculator(RecipeGraph(recipes))
+        flux = flux_first.rollup("FluxItem")
+        iron_first = RollupCalculator(RecipeGraph(recipes))
+        iron = iron_first.rollup("IronBarItem")
+        self.assertEqual(flux_first.rollup("IronBarItem").to_dict(), iron.to_dict())
+        self.assertEqual(iron_first.rollup("FluxItem").to_dict(), flux.to_dict())
+        self.assertTrue(iron.cyclic)
+
+
+class RecipeMatrixTest(unittest.TestCase):
+    def test_rows_are_keyed_by_item_name_id(self):
+        matrix = RecipeMatrix(RECIPES, use_numpy=False)
+        supply = matrix.output_supply()
+        self.assertEqual(supply["AshlarBasaltItem"], 1.0)
+        self.assertEqual(supply["AshlarGraniteItem"], 1.0)
+        self.assertNotIn("AshlarStone", supply)
+
+
+if __name__ == '__main__':
+    unittest.main()
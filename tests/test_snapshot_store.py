@@ -0,0 +1,80 @@
+import sqlite3
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+from eco_data_reader.models import CraftingTable, EcoDataset, Ingredient, Item, Output, Recipe, Skill
+from eco_data_reader.services import SnapshotStore
+from eco_data_reader.services.snapshot_store import SNAPSHOT_STORE_VERSION
+
+
+def make_dataset(log_tags=("Wood",), tag_ingredient=True):
+    recipe = Recipe(name="Board", name_id="Board", skill_name_id="CarpentrySkill", level=1, labor=10,
+                    crafting_table_name_id="CarpentryTableObject",
+                    ingredients=[Ingredient("Wood", Decimal("1.5"), reducible=True, tag=tag_ingredient)],
+                    outputs=[Output("BoardItem", Decimal(2), primary=True), Output("BarkItem", Decimal(1))])
+    dataset = EcoDataset(items=[Item("Log", "LogItem", tags=log_tags), Item("Board", "BoardItem", x_pos=3)],
+                         recipes=[recipe],
+                         crafting_tables=[CraftingTable("Carpentry Table", "CarpentryTableObject", "BasicUpgrade")],
+                         skills=[Skill("Carpentry", "CarpentrySkill")])
+    dataset.sort()
+    return dataset
+
+
+class SnapshotStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database = Path(self.temp_dir.name) / "snapshots.sqlite"
+        self.store = SnapshotStore(self.database)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        dataset = make_dataset()
+        self.store.save("v1", dataset)
+        loaded = self.store.load("v1")
+        self.assertEqual(loaded.to_dict(), dataset.to_dict())
+        self.assertEqual(loaded.recipes[0].ingredients[0].quantity, Decimal("1.5"))
+
+    def test_no_changes(self):
+        self.store.save("v1", make_dataset())
+        self.store.save("v2", make_dataset())
+        self.assertFalse(self.store.changes("v1", "v2"))
+
+    def test_changes_in_tags(self):
+        self.store.save("v1", make_dataset())
+        self.store.save("v2", make_dataset(log_tags=("Wood", "Burnable"), tag_ingredient=False))
+        diff = self.store.changes("v1", "v2")
+        self.assertEqual([entry.name_id for entry in diff.items.changed], ["LogItem"])
+        self.assertEqual([entry.name_id for entry in diff.recipes.changed], ["Board"])
+
+    def test_replacing_a_snapshot_keeps_its_place(self):
+        self.store.save("v1", make_dataset())
+        self.store.save("v2", make_dataset())
+        self.store.save("v1", make_dataset(log_tags=()))
+        self.assertEqual(self.store.versions(), ["v1", "v2"])
+        self.assertEqual([(label, item.tags) for label, item in self.store.history("items", "LogItem")],
+                         [("v1", ()), ("v2", ("Wood",))])
+
+    def test_version_1_fingerprints_are_updated(self):
+        self.store.save("v1", make_dataset())
+        self.store.close()
+        with sqlite3.connect(str(self.database)) as connection:
+            for table in ("items", "recipes", "crafting_tables", "skills"):
+                connection.execute(f"UPDATE {table} SET fingerprint = x''")
+            connection.execute("PRAGMA user_version = 1")
+        connection.close()
+
+        self.store = SnapshotStore(self.database)
+        self.store.save("v2", make_dataset())
+        self.assertFalse(self.store.changes("v1", "v2"))
+        self.assertEqual(self.store._connection.execute("PRAGMA user_version").fetchone()[0], SNAPSHOT_STORE_VERSION)
+        self.assertEqual(self.store._connection.execute("SELECT COUNT(*) FROM items WHERE fingerprint = x''")
+                         .fetchone()[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
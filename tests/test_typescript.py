@@ -0,0 +1,135 @@
+import io
+import json
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+
+import main
+from eco_data_reader.models import Ingredient, Item, Output, Recipe
+from eco_data_reader.utils import JsonTypeScriptProcessor, TypeScriptParseError, TypeScriptReader, TypeScriptWriter
+
+TRICKY_NAMES = ["O'Brien's Stew", 'Say "Hi"', "Back\\slash", "Trailing\\", "Two\nLines", "Ünïcödé"]
+
+
+def write_typescript(objects, indent=2) -> str:
+    buffer = io.StringIO()
+    TypeScriptWriter(buffer, indent=indent).write_array(objects)
+    return buffer.getvalue()
+
+
+def read_typescript(typescript: str) -> list:
+    return list(TypeScriptReader(io.StringIO(typescript)).iter_array())
+
+
+class TypeScriptWriterTest(unittest.TestCase):
+    def test_layout(self):
+        self.assertEqual(write_typescript([{'name': 'Iron Bar', 'level': 1, 'hidden': False}]),
+                         "[\n  {\n    'name': 'Iron Bar',\n    'level': 1,\n    'hidden': false\n  }\n]")
+        self.assertEqual(write_typescript([{'name': 'Iron Bar', 'tags': []}], indent=None),
+                         "[{'name':'Iron Bar','tags':[]}]")
+        self.assertEqual(write_typescript([]), "[]")
+
+    def test_lookup_functions(self):
+        typescript = write_typescript([{'item': 'IronBarItem', 'skill': 'Smelting Skill'}], indent=None)
+        self.assertEqual(typescript, "[{'item':getItemByNameID('IronBarItem'),'skill':'Smelting Skill'}]")
+
+    def test_strings_round_trip(self):
+        objects = [{'name': name, 'nameID': f"{index}'\\"} for index, name in enumerate(TRICKY_NAMES)]
+        for indent in (2, None):
+            with self.subTest(indent=indent):
+                self.assertEqual(read_typescript(write_typescript(objects, indent)), objects)
+
+    def test_models_round_trip(self):
+        item = Item(name="O'Brien's \"Best\" Hat", item_name_id="OBriensHatItem")
+        recipe = Recipe(name="Sew O'Brien's Hat", name_id="OBriensHat", skill_name_id="TailoringSkill", level=2,
+                        labor=60, crafting_table_name_id="TailoringTableObject",
+                        ingredients=[Ingredient("FabricItem", Decimal(4), reducible=True),
+                                     Ingredient("Wood", Decimal("0.5"), tag=True)],
+                        outputs=[Output("OBriensHatItem", Decimal(1), primary=True)])
+        for model in (item, recipe):
+            with self.subTest(model=type(model).__name__):
+                self.assertEqual(read_typescript(write_typescript([model.to_dict()])),
+                                 [model.to_dict()])
+
+
+ITEMS = [Item(name="O'Brien's Hat", item_name_id="OBriensHatItem"), Item(name="Iron Bar", item_name_id="IronBarItem")]
+RECIPES = [Recipe(name="Smelt Iron", name_id="SmeltIron", skill_name_id="SmeltingSkill", level=1, labor=30,
+                  crafting_table_name_id="BlastFurnaceObject",
+                  ingredients=[Ingredient("IronOreItem", Decimal(2)), Ingredient("Wood", Decimal("0.5"), tag=True)],
+                  outputs=[Output("IronBarItem", Decimal(1), primary=True)])]
+
+
+class TypeScriptReaderTest(unittest.TestCase):
+    def read_value(self, typescript: str, variable=None):
+        return TypeScriptReader(io.StringIO(typescript)).read_value(variable)
+
+    def test_emitted_files_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            items_file, recipes_file = main.write_typescript_files(Path(temp_dir), True, ITEMS, RECIPES)
+            for file_path, models in ((items_file, ITEMS), (recipes_file, RECIPES)):
+                with self.subTest(file=file_path.name):
+                    typescript = file_path.read_text(encoding='utf-8')
+                    expected = [model.to_dict() for model in models]
+                    self.assertEqual(read_typescript(typescript), expected)
+                    self.assertEqual(self.read_value(typescript), expected)
+                    self.assertEqual(json.loads(JsonTypeScriptProcessor.process_typescript_to_json(typescript)),
+                                     expected)
+
+    def test_emitted_chunk_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chunk_file = Path(temp_dir) / "recipes-BlastFurnaceObject.ts"
+            main.write_typescript_chunk(chunk_file, RECIPES)
+            typescript = chunk_file.read_text(encoding='utf-8')
+        self.assertEqual(read_typescript(typescript), [recipe.to_dict() for recipe in RECIPES])
+        self.assertEqual(self.read_value(typescript), [recipe.to_dict() for recipe in RECIPES])
+
+    def test_exported_value_after_imports_and_type_annotation(self):
+        items = [item.to_dict() for item in ITEMS]
+        typescript = ("import {Item, Recipe} from './types';\n"
+                      "import { getItemByNameID } from './lookup';\n\n"
+                      f"export const items: Item[] = {write_typescript(items)};\n")
+        self.assertEqual(self.read_value(typescript), items)
+        self.assertEqual(read_typescript(typescript), items)
+        self.assertEqual(json.loads(JsonTypeScriptProcessor.process_typescript_to_json(typescript)), items)
+
+    def test_value_of_a_variable(self):
+        typescript = ("const version: {major: number} = {major: 11};\n"
+                      "export const recipes: Recipe[] = [{'nameID': 'SmeltIron'}];\n"
+                      "export default recipes;\n")
+        self.assertEqual(self.read_value(typescript), {'major': 11})
+        self.assertEqual(self.read_value(typescript, 'recipes'), [{'nameID': 'SmeltIron'}])
+        self.assertEqual(list(TypeScriptReader(io.StringIO(typescript)).iter_array('recipes')),
+                         [{'nameID': 'SmeltIron'}])
+
+    def test_no_value(self):
+        with self.assertRaises(TypeScriptParseError):
+            self.read_value("import {Item} from './types';\nexport type Items = Item[];\n")
+
+
+class TypeScriptChunksTest(unittest.TestCase):
+    def test_file_names_are_unique(self):
+        keys = ["AnvilObject", "Kiln.Object", "Kiln_Object", "ForgeObject", "forgeobject", "none", main.NO_CHUNK_KEY]
+        file_names = main.recipe_chunk_file_names(keys)
+        self.assertEqual(file_names["AnvilObject"], "recipes-AnvilObject.ts")
+        self.assertEqual(len({name.lower() for name in file_names.values()}), len(keys))
+        self.assertEqual(main.recipe_chunk_file_names([main.NO_CHUNK_KEY]), {main.NO_CHUNK_KEY: "recipes-none.ts"})
+        self.assertEqual(main.recipe_chunk_file_names(["Kiln.Object"]), {"Kiln.Object": file_names["Kiln.Object"]})
+
+    def test_chunks_and_manifest(self):
+        recipes = [Recipe(name=name, name_id=name, skill_name_id="SmeltingSkill", level=1, labor=10,
+                          crafting_table_name_id=table)
+                   for name, table in (("A", "Kiln.Object"), ("B", "Kiln_Object"), ("C", ""), ("D", "Kiln.Object"))]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chunks_dir = Path(temp_dir)
+            main.write_typescript_chunks(chunks_dir, "craftingTable", ITEMS, recipes)
+            manifest = json.loads((chunks_dir / "manifest.json").read_text(encoding='utf-8'))
+            self.assertEqual(sorted(manifest['recipes']), [main.NO_CHUNK_KEY, "Kiln.Object", "Kiln_Object"])
+            self.assertEqual(manifest['recipes'][main.NO_CHUNK_KEY]['file'], "recipes-none.ts")
+            for key, expected in ((main.NO_CHUNK_KEY, ["C"]), ("Kiln.Object", ["A", "D"]), ("Kiln_Object", ["B"])):
+                typescript = (chunks_dir / manifest['recipes'][key]['file']).read_text(encoding='utf-8')
+                self.assertEqual([recipe['nameID'] for recipe in read_typescript(typescript)], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()